@@ -4,6 +4,8 @@ import logging
 from fastapi import Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from datagateway_api.datagateway_api.icat.session_cache import session_metadata_cache
+
 log = logging.getLogger()
 
 
@@ -15,6 +17,9 @@ class SessionBearer(HTTPBearer):
         Authorization: Bearer <session_id>
 
     A session ID is obtained by sending a POST request to /sessions.
+
+    If the session's metadata is already cached, it's attached to the request (as
+    `request.state.session_metadata`) without contacting ICAT.
     """
 
     def __init__(self, auto_error: bool = True) -> None:
@@ -37,5 +42,8 @@ class SessionBearer(HTTPBearer):
         credentials: HTTPAuthorizationCredentials = await super().__call__(request)
 
         request.state.token = credentials.credentials
+        request.state.session_metadata = session_metadata_cache.get(credentials.credentials)
+        if request.state.session_metadata is not None:
+            log.debug("Request made by user: %s", request.state.session_metadata.username)
 
         return credentials.credentials
@@ -51,12 +51,75 @@ class UseReaderForPerformance(BaseModel):
     reader_username: StrictStr
     reader_password: SecretStr
     maxsize: int = Field(
-        default=128,
-        description="Each cacheable function will store up to this many results in memory.",
+        default=100000,
+        description=(
+            "Maximum number of permission check results (e.g. whether a user can see an investigation) kept in"
+            " memory, shared by every kind of check."
+        ),
+    )
+    max_bytes: Optional[StrictInt] = Field(
+        default=None,
+        description=(
+            "If set, the permission cache is bounded by the estimated size of its entries in bytes rather than by"
+            " `maxsize`."
+        ),
     )
     ttl: float = Field(
         default=600,
-        description="Time-to-live for each of the cacheable functions in seconds.",
+        description="Time-to-live of each cached permission check result in seconds.",
+    )
+    pool_size: StrictInt = Field(
+        default=4,
+        description="Maximum number of clients logged in as the reader account, i.e. concurrent reader queries.",
+    )
+    refresh_interval: float = Field(
+        default=1800,
+        description=(
+            "Number of seconds between background refreshes of the reader session, which should be less than ICAT's"
+            " session lifetime."
+        ),
+    )
+    entity_filter_fields: dict[StrictStr, StrictStr] = Field(
+        default={"Datafile": "dataset.id", "Dataset": "investigation.id"},
+        description=(
+            "Entity types whose listings can be executed as the reader account, mapped to the where filter field on"
+            " the ID of the parent the user must be able to see (e.g. `DatafileParameter: datafile.dataset.id`)."
+        ),
+    )
+    parent_relations: dict[StrictStr, StrictStr] = Field(
+        default={"Datafile": "dataset"},
+        description=(
+            "Relation from an entity type to its parent, used to resolve parents given by `entity_filter_fields` up"
+            " to the Dataset or Investigation whose visibility is checked (e.g. `Sample: investigation`)."
+        ),
+    )
+
+
+class ResponseCaching(BaseModel):
+    enabled: StrictBool
+    ttl: float = Field(
+        default=30,
+        description="Number of seconds a response is cached for.",
+    )
+    max_bytes: StrictInt = Field(
+        default=50_000_000,
+        description="Maximum total size (of the JSON) of the cached responses.",
+    )
+
+
+class CountCaching(BaseModel):
+    enabled: StrictBool
+    maxsize: StrictInt = Field(
+        default=10000,
+        description="Maximum number of counts cached.",
+    )
+    soft_ttl: float = Field(
+        default=30,
+        description="Number of seconds after which a cached count is refreshed in the background.",
+    )
+    hard_ttl: float = Field(
+        default=300,
+        description="Number of seconds after which a cached count is no longer served.",
     )
 
 
@@ -66,13 +129,68 @@ class DataGatewayAPI(BaseModel):
     validation of the DataGatewayAPI config data using Python type annotations.
     """
 
-    client_cache_size: StrictInt
     client_pool_init_size: StrictInt
     client_pool_max_size: StrictInt
     extension: DataGatewayAPIExtension
     icat_check_cert: StrictBool
     icat_url: StrictStr
     use_reader_for_performance: Optional[UseReaderForPerformance] = None
+    response_cache: Optional[ResponseCaching] = None
+    count_cache: Optional[CountCaching] = None
+    client_lease_timeout: float = Field(
+        default=30,
+        description="Number of seconds a request waits for a client before a 503 is returned.",
+    )
+    session_cache_maxsize: StrictInt = Field(
+        default=1000,
+        description="Maximum number of sessions whose username and expiry are cached.",
+    )
+    session_cache_ttl: StrictInt = Field(
+        default=60,
+        description="Number of seconds a session's cached username and expiry are used for.",
+    )
+    max_query_results: StrictInt = Field(
+        default=50000,
+        description="Maximum number of results returned when a query is executed in pages of maxEntities.",
+    )
+    query_plan_cache_size: StrictInt = Field(
+        default=256,
+        description="Maximum number of compiled query plans cached, 0 disables the cache.",
+    )
+    write_batch_size: StrictInt = Field(
+        default=500,
+        description="Number of entities created or deleted in each createMany/deleteMany call to ICAT.",
+    )
+    delete_where_max_entities: StrictInt = Field(
+        default=1000,
+        description="Maximum number of entities a DELETE request using where filters can delete.",
+    )
+    stream_chunk_size: StrictInt = Field(
+        default=1000,
+        description="Number of results fetched from ICAT at a time when streaming NDJSON responses.",
+    )
+    max_concurrent_streams: StrictInt = Field(
+        default=2,
+        description=(
+            "Maximum number of NDJSON responses streamed at once. Each stream holds its own ICAT client until it"
+            " ends, separately from the client_pool_max_size clients leased to other requests."
+        ),
+    )
+    cursor_signing_key: Optional[SecretStr] = Field(
+        default=None,
+        description=(
+            "If set, pagination cursors are signed with this key (using HMAC-SHA256) and cursors that have been"
+            " tampered with are rejected. Every instance of the API behind a load balancer needs the same key."
+        ),
+    )
+    executor_max_workers: Optional[StrictInt] = Field(
+        default=None,
+        description="Number of threads executing ICAT calls, defaults to client_pool_max_size.",
+    )
+    executor_max_queue_size: StrictInt = Field(
+        default=100,
+        description="Number of ICAT calls that can wait for a thread before requests are rejected.",
+    )
 
     def __getitem__(self, item):
         return getattr(self, item)
@@ -99,6 +217,15 @@ class SearchAPI(BaseModel):
     username: StrictStr
     password: StrictStr
     search_scoring: SearchScoring
+    count_cache: Optional[CountCaching] = None
+    executor_max_workers: StrictInt = Field(
+        default=8,
+        description="Number of threads executing ICAT calls.",
+    )
+    executor_max_queue_size: StrictInt = Field(
+        default=100,
+        description="Number of ICAT calls that can wait for a thread before requests are rejected.",
+    )
 
     def __getitem__(self, item):
         return getattr(self, item)
@@ -138,6 +265,10 @@ class APIConfig(BaseModel):
     test_mechanism: Optional[StrictStr] = None
     url_prefix: DataGatewayAPIExtension
     test_user_credentials: Optional[TestUserCredentials] = None
+    icat_properties_refresh_interval: StrictInt = Field(
+        default=3600,
+        description="Seconds between background refreshes of the cached ICAT server properties.",
+    )
 
     def __getitem__(self, item):
         return getattr(self, item)
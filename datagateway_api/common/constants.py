@@ -7,3 +7,5 @@ class Constants:
     PYTHON_ICAT_DISTNCT_CONDITION = "!= null"
     TEST_MOD_CREATE_DATETIME = datetime(2000, 1, 1, tzinfo=tzlocal())
     PING_OK_RESPONSE = "DataGateway API OK"
+    # Query parameters that change how a response is returned, rather than being filters
+    NON_FILTER_QUERY_PARAMETERS = ("stream", "cursor")
@@ -0,0 +1,167 @@
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+import time
+from typing import NamedTuple
+
+from cachetools import TTLCache
+
+log = logging.getLogger()
+
+
+class CachedCount(NamedTuple):
+    count: int
+    # Entity types the count was made from, writes to any of these make it stale
+    dependencies: frozenset
+    # Monotonic time the count was requested from ICAT
+    fetched_at: float
+
+
+class CountCache:
+    """
+    Bounded cache of the results of `/count` endpoints which serves stale counts while
+    they're refreshed in the background
+
+    Frontends request the count of a table alongside every page of it, while only the
+    order, skip and limit of the page change. A count fetched less than `soft_ttl`
+    seconds ago is served as it is. Once it's older than that, it's still served
+    straight away but a refresh is started in the background (only one per cached count
+    at a time), so the next request gets the refreshed count. Counts that haven't been
+    refreshed within `hard_ttl` seconds are removed and the next request for them waits
+    for ICAT.
+
+    Counts can be invalidated by entity type (see `invalidate()`). A refresh that was
+    started before an invalidation doesn't store its result, as the count may have been
+    made before the write that caused the invalidation.
+    """
+
+    def __init__(self, name, maxsize, soft_ttl, hard_ttl, refresh_workers=2):
+        """
+        :param name: Name of the cache, used as the prefix of its refresh thread names
+        :type name: :class:`str`
+        :param maxsize: Maximum number of counts kept in the cache
+        :type maxsize: :class:`int`
+        :param soft_ttl: Number of seconds after which a cached count is refreshed in
+            the background
+        :type soft_ttl: :class:`float`
+        :param hard_ttl: Number of seconds after which a cached count is no longer
+            served
+        :type hard_ttl: :class:`float`
+        :param refresh_workers: Number of counts that can be refreshed at the same time
+        :type refresh_workers: :class:`int`
+        """
+        self.name = name
+        self.soft_ttl = soft_ttl
+        self._cache = TTLCache(maxsize=maxsize, ttl=hard_ttl)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        # Incremented on every invalidation, so refreshes started before it can be
+        # identified
+        self._generation = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=refresh_workers,
+            thread_name_prefix=f"{name}_count_refresh",
+        )
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.failed_refreshes = 0
+
+    def get_or_count(self, key, count, refresh=None, dependencies=frozenset()):
+        """
+        Get a cached count, fetching (and caching) it if it's not cached and starting a
+        background refresh if it's stale
+
+        :param key: Hashable key identifying the count e.g. containing the user,
+            entity type and filters of the request
+        :type key: :class:`tuple`
+        :param count: Function that fetches the count during the request
+        :type count: :class:`function`
+        :param refresh: Function that fetches the count outside of the request (i.e.
+            without using any resources that are released when the request ends).
+            Defaults to `count`
+        :type refresh: :class:`function`
+        :param dependencies: Entity types the count is made from
+        :type dependencies: :class:`frozenset`
+        :return: The count
+        """
+        start_refresh = False
+        with self._lock:
+            entry = self._cache.get(key)
+            generation = self._generation
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                if time.monotonic() - entry.fetched_at >= self.soft_ttl:
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        start_refresh = True
+
+        if entry is None:
+            log.debug("Count cache miss in %s cache", self.name)
+            fetched_at = time.monotonic()
+            result = count()
+            self._store(key, CachedCount(result, frozenset(dependencies), fetched_at), generation)
+            return result
+
+        if start_refresh:
+            log.debug("Serving stale count from %s cache, refreshing in the background", self.name)
+            self._executor.submit(self._refresh, key, refresh or count, entry.dependencies, generation)
+
+        return entry.count
+
+    def _refresh(self, key, refresh, dependencies, generation):
+        try:
+            fetched_at = time.monotonic()
+            result = refresh()
+        except Exception:
+            # The stale count continues to be served until it expires
+            log.exception("Unable to refresh count in %s cache", self.name)
+            with self._lock:
+                self.failed_refreshes += 1
+        else:
+            self._store(key, CachedCount(result, dependencies, fetched_at), generation)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key, entry, generation):
+        with self._lock:
+            if generation != self._generation:
+                log.debug("Cache invalidated while count was fetched, not caching count")
+                return
+            self._cache[key] = entry
+
+    def invalidate(self, entity_types):
+        """
+        Remove the cached counts that depend on any of `entity_types`
+
+        :param entity_types: Entity types that have been written to
+        :type entity_types: :class:`set`
+        """
+        with self._lock:
+            self._generation += 1
+            stale_keys = [key for key, entry in self._cache.items() if entry.dependencies & entity_types]
+            for key in stale_keys:
+                del self._cache[key]
+
+        log.debug("Invalidated %d cached counts in %s cache", len(stale_keys), self.name)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "max_size": self._cache.maxsize,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshing": len(self._refreshing),
+                "failed_refreshes": self.failed_refreshes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
@@ -1,4 +1,5 @@
-from dateutil.parser import parse
+from datetime import datetime
+
 from icat import helper
 
 from datagateway_api.common.exceptions import BadRequestError
@@ -11,16 +12,22 @@ class DateHandler:
     likely to be a date.
     """
 
+    # Types ICAT's entity info gives to attributes containing dates
+    icat_date_types = frozenset(["Date", "Timestamp"])
+
     @staticmethod
     def is_str_a_date(potential_date):
         """
-        This function identifies if a string contains a date. This function doesn't
-        detect which format the date is, just if there's a date or not. An additional
+        This function identifies if a string contains an ISO 8601 date (the format
+        Python ICAT, and therefore DataGateway API, outputs dates in). An additional
         check is performed to ensure purely numeric strings (e.g. "5", "20200101") are
         not incorrectly treated as dates.
 
+        This should only be used where the type of a value can't be determined from
+        ICAT's schema (see `is_icat_date_type()`) e.g. parameter values, which can be
+        stored as a number, string or date
 
-        :param potential_date: String data that could contain a date of any format
+        :param potential_date: String data that could contain a date
         :type potential_date: :class:`str`
         :return: Boolean to signify whether `potential_date` is a date or not
         """
@@ -32,25 +39,32 @@ class DateHandler:
             return False
 
         try:
-            # Disabled fuzzy to avoid picking up dates in things like descriptions etc.
-            parse(potential_date, fuzzy=False)
+            datetime.fromisoformat(text)
             return True
         except ValueError:
             return False
 
+    @staticmethod
+    def is_icat_date_type(attribute_type):
+        """
+        Determine whether an attribute contains dates, using the attribute's type from
+        ICAT's entity info
+
+        :param attribute_type: Type of the attribute e.g. `Date`, `String`
+        :type attribute_type: :class:`str`
+        :return: Boolean to signify whether the attribute contains dates
+        """
+        return attribute_type in DateHandler.icat_date_types
+
     @staticmethod
     def str_to_datetime_object(data):
         """
         Convert a string to a `datetime.datetime` object.
 
-        Python 3.7+ has support for `datetime.fromisoformat()` which would be a more
-        elegant solution to this conversion operation since dates are converted into ISO
-        format within this file, however, the production instance of this API is
-        typically built on Python 3.6, and it doesn't seem of enough value to mandate
-        3.7 for a single line of code. Instead, a helper function from `python-icat` is
-        used which does the conversion using `suds`. This will convert inputs in the ISO
-        format (i.e. the format which Python ICAT, and therefore DataGateway API outputs
-        data) but also allows for conversion of other "sensible" formats.
+        Dates in ISO 8601 format (i.e. the format which Python ICAT, and therefore
+        DataGateway API outputs data) are converted using `datetime.fromisoformat()`.
+        Other "sensible" formats fall back to a helper function from `python-icat`,
+        which does the conversion using `suds`.
 
         :param data: Single data value from the request body
         :type data: Data type of the data as per user's request body, :class:`str` is
@@ -59,6 +73,11 @@ class DateHandler:
         :raises BadRequestError: If there is an issue with the date format
         """
 
+        try:
+            return datetime.fromisoformat(data)
+        except (TypeError, ValueError):
+            pass
+
         try:
             datetime_obj = helper.parse_attr_string(data, "Date")
         except ValueError as e:
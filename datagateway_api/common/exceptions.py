@@ -74,3 +74,10 @@ class ScoringAPIError(ApiError):
 
     def __init__(self, msg="Scoring API error", *args):
         super().__init__(msg, *args)
+
+
+class ServiceUnavailableError(ApiError):
+    status_code = 503
+
+    def __init__(self, msg="Service unavailable, too many requests are queued", *args):
+        super().__init__(msg, *args)
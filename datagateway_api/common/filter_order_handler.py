@@ -1,17 +1,17 @@
 import logging
 
+from icat.query import Query
+
 from datagateway_api.common.config import Config
 from datagateway_api.datagateway_api.icat.filters import (
     PythonICATIncludeFilter,
     PythonICATLimitFilter,
-    PythonICATOrderFilter,
     PythonICATSkipFilter,
 )
 
-if Config.config.search_api:
-    from datagateway_api.search_api.filters import SearchAPIIncludeFilter
-    from datagateway_api.search_api.panosc_mappings import mappings
-    from datagateway_api.search_api.query import SearchAPIQuery
+# The Search API modules are imported where they're used, as importing them creates
+# the Search API's client pool (which connects to ICAT). Importing them here would mean
+# DataGateway API modules (and their unit tests) couldn't be imported without ICAT
 
 
 log = logging.getLogger()
@@ -56,9 +56,13 @@ class FilterOrderHandler(object):
             if (
                 Config.config.search_api
                 and type(query_filter) is PythonICATIncludeFilter
-                and isinstance(query, SearchAPIQuery)
+                and not isinstance(query, Query)
             ):
-                query = query.icat_query.query
+                # Only Search API queries wrap a Python ICAT query
+                from datagateway_api.search_api.query import SearchAPIQuery
+
+                if isinstance(query, SearchAPIQuery):
+                    query = query.icat_query.query
             query_filter.apply_filter(query)
 
     def add_icat_relations_for_non_related_fields_of_panosc_related_entities(
@@ -85,6 +89,9 @@ class FilterOrderHandler(object):
         :type panosc_entity_name: :class:`str`
         """
 
+        from datagateway_api.search_api.filters import SearchAPIIncludeFilter
+        from datagateway_api.search_api.panosc_mappings import mappings
+
         python_icat_include_filter = None
         icat_relations = []
         for filter_ in self.filters:
@@ -125,6 +132,7 @@ class FilterOrderHandler(object):
         :param panosc_entity_name: A PaNOSC entity name e.g. "Dataset"
         :type panosc_entity_name: :class:`str`
         """
+        from datagateway_api.search_api.panosc_mappings import mappings
 
         icat_relations = mappings.get_icat_relations_for_panosc_non_related_fields(
             panosc_entity_name,
@@ -158,20 +166,6 @@ class FilterOrderHandler(object):
             self.remove_filter(skip_filter)
             log.debug("Filters: %s", self.filters)
 
-    def clear_python_icat_order_filters(self):
-        """
-        Checks if any order filters have been added to the request and resets the
-        variable used to manage which attribute(s) to use for sorting results.
-
-        A reset is required because Python ICAT overwrites (as opposed to appending to
-        it) the query's order list every time one is added to the query.
-        """
-        log.debug("Resetting result order for the order filter")
-
-        if any(isinstance(icat_filter, PythonICATOrderFilter) for icat_filter in self.filters):
-            PythonICATOrderFilter.result_order = []
-            PythonICATOrderFilter.join_specs = {}
-
     def manage_icat_filters(self, filters, query):
         """
         Utility function to call other functions in this class, used to manage filters
@@ -187,5 +181,4 @@ class FilterOrderHandler(object):
 
         self.add_filters(filters)
         self.merge_python_icat_limit_skip_filters()
-        self.clear_python_icat_order_filters()
         self.apply_filters(query)
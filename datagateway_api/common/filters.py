@@ -69,6 +69,15 @@ class SkipFilter(QueryFilter):
             raise FilterError("The value of the skip filter must be positive")
 
 
+class CursorFilter(QueryFilter):
+    # Applied after order filters, as the cursor depends on the query's order
+    precedence = 3
+
+    def __init__(self, cursor):
+        # No cursor is given for the first page
+        self.cursor = cursor or None
+
+
 class LimitFilter(QueryFilter):
     precedence = 4
 
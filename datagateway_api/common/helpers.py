@@ -1,13 +1,14 @@
 from datetime import datetime
 from functools import wraps
+import inspect
 import json
 import logging
 
 from fastapi import Request
 from pydantic import ValidationError
-import requests
 
 
+from datagateway_api.common.constants import Constants
 from datagateway_api.common.date_handler import DateHandler
 from datagateway_api.common.exceptions import (
     ApiError,
@@ -16,13 +17,15 @@ from datagateway_api.common.exceptions import (
     FilterError,
     MissingCredentialsError,
 )
+from datagateway_api.common.icat_properties import icat_properties_cache
 
 log = logging.getLogger()
 
 
 def queries_records(method):
     """
-    Decorator for endpoint resources that search for a record in a table
+    Decorator for endpoint resources that search for a record in a table. Generator
+    methods (used to stream results) are also supported
     :param method: The method for the endpoint
     :return: Will return a 404, "No such record" if a MissingRecordError is caught
     :return: Will return a 400, "Error message" if other expected errors are caught
@@ -32,22 +35,36 @@ def queries_records(method):
     def wrapper_gets_records(*args, **kwargs):
         try:
             return method(*args, **kwargs)
-        except ApiError as e:
-            log.exception(msg=e.args)
-            raise e
-        except ValueError as e:
-            log.exception(msg=e.args)
-            raise BadRequestError() from e
-        except TypeError as e:
-            log.exception(e.args)
-            raise BadRequestError() from e
-        except ValidationError as e:
-            log.exception(e.args)
-            raise BadRequestError() from e
+        except Exception as e:
+            raise_records_error(e)
 
+    @wraps(method)
+    def generator_wrapper_gets_records(*args, **kwargs):
+        try:
+            yield from method(*args, **kwargs)
+        except Exception as e:
+            raise_records_error(e)
+
+    if inspect.isgeneratorfunction(method):
+        return generator_wrapper_gets_records
     return wrapper_gets_records
 
 
+def raise_records_error(e):
+    """
+    Log an exception raised by a method decorated with `queries_records` and re-raise
+    it, converting expected errors into a `BadRequestError`
+    """
+    if isinstance(e, ApiError):
+        log.exception(msg=e.args)
+        raise e
+    elif isinstance(e, (ValueError, TypeError, ValidationError)):
+        log.exception(msg=e.args)
+        raise BadRequestError() from e
+    else:
+        raise e
+
+
 def get_session_id_from_auth_header(request: Request):
     """
     Gets the sessionID from the Authorization header of a request
@@ -119,6 +136,8 @@ def get_filters_from_query_string(request: Request, api_type, entity_name=None):
     try:
         filters = []
         for arg in request.query_params:
+            if arg in Constants.NON_FILTER_QUERY_PARAMETERS:
+                continue
             for value in request.query_params.getlist(arg):
                 filters.extend(
                     QueryFilterFactory.get_query_filter(
@@ -133,15 +152,11 @@ def get_filters_from_query_string(request: Request, api_type, entity_name=None):
 
 def get_icat_properties(icat_url, icat_check_cert):
     """
-    ICAT properties can be retrieved using Python ICAT's client object, however this
-    requires the client object to be authenticated which may not always be the case
-    when requesting these properties, hence a HTTP request is sent as an alternative
+    Get the properties of an ICAT server. These are served from a process-wide cache
+    (see `ICATPropertiesCache`) so ICAT is only contacted the first time the properties
+    of a given ICAT URL are requested, rather than on every request
     """
-    properties_url = f"{icat_url}/icat/properties"
-    r = requests.request("GET", properties_url, verify=icat_check_cert)
-    icat_properties = r.json()
-
-    return icat_properties
+    return icat_properties_cache.get(icat_url, icat_check_cert)
 
 
 def map_distinct_attributes_to_results(distinct_attributes, query_result):
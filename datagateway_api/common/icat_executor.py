@@ -0,0 +1,109 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from functools import partial
+import logging
+import threading
+
+from datagateway_api.common.config import Config
+from datagateway_api.common.exceptions import ServiceUnavailableError
+
+log = logging.getLogger()
+
+
+class ICATExecutor:
+    """
+    Thread pool dedicated to blocking work that talks to ICAT (i.e. suds/Python ICAT
+    calls), allowing the API's endpoints to be `async` without blocking the event loop
+
+    Each API has its own executor so they can be sized independently; DataGateway API's
+    executor defaults to the size of the ICAT client pool so there aren't more threads
+    than there are clients for them to use. Work that cannot start immediately is queued
+    up to `max_queue_size`, after which requests are rejected with a 503 rather than
+    waiting indefinitely.
+    """
+
+    def __init__(self, name, max_workers, max_queue_size):
+        """
+        :param name: Name of the executor, used as the prefix of its thread names
+        :type name: :class:`str`
+        :param max_workers: Number of threads that can execute work concurrently
+        :type max_workers: :class:`int`
+        :param max_queue_size: Number of calls that can wait for a free thread
+        :type max_queue_size: :class:`int`
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=name,
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue_size)
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Execute `func` on one of the executor's threads and wait for its result without
+        blocking the event loop. Context variables of the caller are visible to `func`
+
+        :param func: The (blocking) function to execute
+        :type func: :class:`callable`
+        :return: The return value of `func`
+        :raises ServiceUnavailableError: If the executor's queue is full
+        """
+        if not self._slots.acquire(blocking=False):
+            log.warning("Queue of executor '%s' is full, rejecting request", self.name)
+            raise ServiceUnavailableError()
+
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(context.run, partial(func, *args, **kwargs))
+        except RuntimeError:
+            self._slots.release()
+            raise
+
+        # The slot is released when the work has actually finished (rather than when
+        # the awaiting coroutine finishes) so cancelled requests still count towards the
+        # queue depth while their thread is busy
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_icat_executor(api_type="datagateway_api"):
+    """
+    Get the executor for the given API, creating it from the config if this is the first
+    time it's been requested
+
+    :param api_type: Type of API the executor is used for i.e. DataGateway API or
+        Search API
+    :type api_type: :class:`str`
+    :return: The API's :class:`ICATExecutor`
+    """
+    executor = _executors.get(api_type)
+    if executor is not None:
+        return executor
+
+    with _executors_lock:
+        if api_type not in _executors:
+            if api_type == "datagateway_api":
+                api_config = Config.config.datagateway_api
+                max_workers = api_config.executor_max_workers or api_config.client_pool_max_size
+            else:
+                api_config = Config.config.search_api
+                max_workers = api_config.executor_max_workers
+
+            log.info("Creating ICAT executor for %s with %d workers", api_type, max_workers)
+            _executors[api_type] = ICATExecutor(
+                api_type,
+                max_workers,
+                api_config.executor_max_queue_size,
+            )
+
+    return _executors[api_type]
@@ -0,0 +1,127 @@
+import logging
+import threading
+
+import requests
+
+from datagateway_api.common.config import Config
+
+log = logging.getLogger()
+
+
+class ICATPropertiesCache:
+    """
+    Process-wide cache of ICAT server properties (e.g. `maxEntities`), keyed by ICAT
+    URL
+
+    ICAT properties can be retrieved using Python ICAT's client object, however this
+    requires the client object to be authenticated which may not always be the case
+    when requesting these properties, hence a HTTP request is sent as an alternative.
+    The properties of each ICAT URL are fetched once (using a pooled HTTP session) and
+    are then refreshed by a background thread, so requests never have to wait on an
+    extra round trip to ICAT. If a refresh fails, the previously fetched properties are
+    kept and the refresh is retried at the next interval.
+    """
+
+    def __init__(self, refresh_interval):
+        """
+        :param refresh_interval: Number of seconds between background refreshes of the
+            cached properties
+        :type refresh_interval: :class:`int`
+        """
+        self.refresh_interval = refresh_interval
+        self._properties = {}
+        self._check_certs = {}
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._refresh_thread = None
+        self._stop_event = threading.Event()
+
+    def get(self, icat_url, icat_check_cert):
+        """
+        Get the properties of the given ICAT server, only contacting ICAT if they
+        haven't been fetched before
+
+        :param icat_url: URL of the ICAT server
+        :type icat_url: :class:`str`
+        :param icat_check_cert: Whether the certificate of the ICAT server is verified
+        :type icat_check_cert: :class:`bool`
+        :return: ICAT properties (of type :class:`dict`)
+        """
+        properties = self._properties.get(icat_url)
+        if properties is not None:
+            return properties
+
+        with self._lock:
+            # Another thread may have fetched the properties while waiting on the lock
+            properties = self._properties.get(icat_url)
+            if properties is None:
+                properties = self._fetch(icat_url, icat_check_cert)
+                self._properties[icat_url] = properties
+                self._check_certs[icat_url] = icat_check_cert
+                self._start_background_refresh()
+
+        return properties
+
+    def clear(self):
+        """
+        Remove all cached properties, forcing them to be fetched on next use
+        """
+        with self._lock:
+            self._properties.clear()
+            self._check_certs.clear()
+
+    def _fetch(self, icat_url, icat_check_cert):
+        properties_url = f"{icat_url}/icat/properties"
+        log.info("Fetching ICAT properties from: %s", properties_url)
+        r = self._session.get(properties_url, verify=icat_check_cert)
+        r.raise_for_status()
+        return r.json()
+
+    def _start_background_refresh(self):
+        if self._refresh_thread is not None or self.refresh_interval <= 0:
+            return
+
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop,
+            name="icat-properties-refresh",
+            daemon=True,
+        )
+        self._refresh_thread.start()
+
+    def _refresh_loop(self):
+        while not self._stop_event.wait(self.refresh_interval):
+            self.refresh()
+
+    def refresh(self):
+        """
+        Re-fetch the properties of every ICAT server currently in the cache
+        """
+        with self._lock:
+            check_certs = dict(self._check_certs)
+
+        for icat_url, icat_check_cert in check_certs.items():
+            try:
+                properties = self._fetch(icat_url, icat_check_cert)
+            except (requests.RequestException, ValueError) as e:
+                log.warning("Unable to refresh ICAT properties of %s: %s", icat_url, e)
+                continue
+
+            with self._lock:
+                self._properties[icat_url] = properties
+
+
+icat_properties_cache = ICATPropertiesCache(Config.config.icat_properties_refresh_interval)
+
+
+def get_icat_max_entities(api_type="datagateway_api"):
+    """
+    Get ICAT's `maxEntities` property (the maximum number of entities ICAT will return
+    from a single query) for the ICAT server used by the given API
+
+    :param api_type: Type of API the ICAT server is configured for i.e. DataGateway API
+        or Search API
+    :type api_type: :class:`str`
+    :return: ICAT's `maxEntities` property
+    """
+    api_config = Config.config.datagateway_api if api_type == "datagateway_api" else Config.config.search_api
+    return icat_properties_cache.get(api_config.icat_url, api_config.icat_check_cert)["maxEntities"]
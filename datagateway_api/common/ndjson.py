@@ -0,0 +1,270 @@
+import asyncio
+import json
+import logging
+import threading
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
+
+from datagateway_api.common.exceptions import ApiError, BadRequestError, MissingRecordError, PythonICATError
+
+log = logging.getLogger()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Lines of an NDJSON request body longer than this are rejected rather than buffered,
+# so a body without line breaks can't use an unbounded amount of memory
+MAX_NDJSON_LINE_BYTES = 16 * 1024 * 1024
+
+
+def is_ndjson_requested(request: Request, stream=False):
+    """
+    Determine whether a response should be streamed as NDJSON (newline delimited JSON),
+    either because the `stream` query parameter is true or the request's `Accept` header
+    contains `application/x-ndjson`
+
+    :request Request: FastAPI Request object containing the incoming headers
+    :param stream: Value of the request's `stream` query parameter
+    :type stream: :class:`bool`
+    :return: Boolean of whether the response should be streamed
+    """
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("Accept", "")
+
+
+def encode_ndjson_chunk(chunk):
+    """
+    Encode a list of JSON formattable objects into NDJSON, one object per line
+
+    :param chunk: Objects to encode
+    :type chunk: :class:`list`
+    :return: NDJSON encoded objects
+    """
+    return "".join(f"{json.dumps(item, default=str)}\n" for item in chunk)
+
+
+async def create_ndjson_response(icat_executor, chunks):
+    """
+    Create a response that streams the chunks yielded by a (blocking) generator as
+    NDJSON. Each chunk is fetched on `icat_executor` so the event loop isn't blocked and
+    is written to the response as soon as it's available
+
+    The first chunk is fetched before the response is created, so errors raised at the
+    start of the generator (e.g. an invalid session ID or filter) still result in the
+    appropriate status code. Errors raised after that point end the stream early
+
+    :param icat_executor: Executor used to run the generator
+    :type icat_executor: :class:`ICATExecutor`
+    :param chunks: Generator yielding lists of JSON formattable objects
+    :type chunks: :class:`generator`
+    :return: FastAPI StreamingResponse
+    """
+    # The generator may be closed while a chunk is still being fetched (e.g. if the
+    # client disconnects), so access to it is serialised
+    chunks_lock = threading.Lock()
+
+    def get_next_chunk():
+        with chunks_lock:
+            return next(chunks, None)
+
+    def close_chunks():
+        with chunks_lock:
+            chunks.close()
+
+    try:
+        first_chunk = await icat_executor.run(get_next_chunk)
+    except BaseException:
+        await icat_executor.run(close_chunks)
+        raise
+
+    async def stream_chunks():
+        chunk = first_chunk
+        try:
+            while chunk is not None:
+                yield encode_ndjson_chunk(chunk)
+                chunk = await icat_executor.run(get_next_chunk)
+        finally:
+            # Closing the generator releases any resources it holds (e.g. a leased ICAT
+            # client). This is submitted to the executor before the await, so it's
+            # still run if this coroutine has been cancelled
+            log.debug("Closing NDJSON stream")
+            await icat_executor.run(close_chunks)
+
+    return StreamingResponse(stream_chunks(), media_type=NDJSON_MEDIA_TYPE)
+
+
+class NDJSONIngestResponse(StreamingResponse):
+    """
+    Streaming response that can be sent while the request body is still being read
+
+    `StreamingResponse` listens for the client disconnecting while the response is sent
+    (on servers using ASGI spec versions before 2.4) by receiving messages from the
+    client, which would consume the request body that's still being ingested. This
+    response doesn't, a disconnect is detected when the request body is read instead
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.stream_response(send)
+        except OSError as e:
+            raise ClientDisconnect() from e
+
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_ndjson_lines(byte_chunks, max_line_bytes=MAX_NDJSON_LINE_BYTES):
+    """
+    Split an NDJSON request body into lines as it's received, so the whole body is
+    never held in memory. Blank lines are skipped
+
+    :param byte_chunks: Async iterator of the request body's bytes e.g.
+        `Request.stream()`
+    :type byte_chunks: :class:`collections.abc.AsyncIterator`
+    :param max_line_bytes: Maximum length of a line
+    :type max_line_bytes: :class:`int`
+    :return: Async generator yielding the (1-based) number and bytes of each line
+    :raises BadRequestError: If a line is longer than `max_line_bytes`
+    """
+    buffer = b""
+    line_number = 0
+    async for byte_chunk in byte_chunks:
+        *lines, buffer = (buffer + byte_chunk).split(b"\n")
+        for line in lines:
+            line_number += 1
+            if len(line) > max_line_bytes:
+                raise BadRequestError(f"Line {line_number} of the request body is longer than {max_line_bytes} bytes")
+            if line.strip():
+                yield line_number, line
+
+        if len(buffer) > max_line_bytes:
+            raise BadRequestError(f"Line {line_number + 1} of the request body is longer than {max_line_bytes} bytes")
+
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+async def ingest_ndjson_records(icat_executor, byte_chunks, parse_record, create_batch, batch_size):
+    """
+    Create the records of an NDJSON request body in batches as the body is received
+
+    Each line is parsed into a record using `parse_record()` and the records are grouped
+    into batches of `batch_size`, each created by a call to `create_batch()` on
+    `icat_executor`. While a batch is being created, the next one is read from the
+    request body, so at most two batches are held in memory and ICAT receives work
+    while the body is still being uploaded.
+
+    A result is yielded for each batch, containing the numbers of its first and last
+    lines and either the IDs of the created records or the error that stopped the batch
+    from being created. A result containing an error is also yielded for each line that
+    can't be parsed, those lines aren't included in a batch. Other errors (e.g. an
+    invalid session ID or ICAT being unavailable) are raised if no result has been
+    yielded yet, so the response can still be given their status code; after that, they
+    are reported as the result of the batch they stopped
+
+    :param icat_executor: Executor used to create the batches
+    :type icat_executor: :class:`ICATExecutor`
+    :param byte_chunks: Async iterator of the request body's bytes
+    :type byte_chunks: :class:`collections.abc.AsyncIterator`
+    :param parse_record: Function that validates a decoded line, returning the record
+        to create
+    :type parse_record: :class:`function`
+    :param create_batch: (Blocking) function that creates a list of records, returning
+        their IDs
+    :type create_batch: :class:`function`
+    :param batch_size: Number of records in each batch
+    :type batch_size: :class:`int`
+    :return: Async generator yielding the result of each batch
+    """
+
+    def start_batch(records, line_numbers):
+        task = asyncio.ensure_future(icat_executor.run(create_batch, records))
+        return line_numbers[0], line_numbers[-1], task
+
+    results_yielded = False
+
+    async def finish_batch(first_line, last_line, task):
+        nonlocal results_yielded
+        result = {"first_line": first_line, "last_line": last_line}
+        try:
+            result["ids"] = await task
+        except (BadRequestError, MissingRecordError, PythonICATError) as e:
+            log.warning("Unable to create records from lines %d-%d: %s", first_line, last_line, e)
+            result["error"] = str(e)
+        except ApiError as e:
+            if not results_yielded:
+                raise
+            # The response's status code has already been sent, so the error can only
+            # be reported in the stream
+            log.warning("Unable to create records from lines %d-%d: %s", first_line, last_line, e)
+            result["error"] = str(e)
+        results_yielded = True
+        return result
+
+    records = []
+    line_numbers = []
+    pending_batch = None
+    try:
+        async for line_number, line in iter_ndjson_lines(byte_chunks):
+            try:
+                records.append(parse_record(json.loads(line)))
+            except (ValueError, ValidationError) as e:
+                results_yielded = True
+                yield {"first_line": line_number, "last_line": line_number, "error": f"Invalid record: {e}"}
+                continue
+            line_numbers.append(line_number)
+
+            if len(records) == batch_size:
+                if pending_batch is not None:
+                    yield await finish_batch(*pending_batch)
+                pending_batch = start_batch(records, line_numbers)
+                records = []
+                line_numbers = []
+
+        if records:
+            if pending_batch is not None:
+                yield await finish_batch(*pending_batch)
+            pending_batch = start_batch(records, line_numbers)
+
+        if pending_batch is not None:
+            batch = pending_batch
+            pending_batch = None
+            yield await finish_batch(*batch)
+    finally:
+        # A batch still being created when the ingest ends early (e.g. the client
+        # disconnected) is left to finish, its result is discarded
+        if pending_batch is not None:
+            pending_batch[2].cancel()
+
+
+async def create_ndjson_ingest_response(results):
+    """
+    Create a response that streams the results of an NDJSON ingest (see
+    `ingest_ndjson_records()`) as NDJSON, each result being written as soon as its
+    batch has been created
+
+    The first result is awaited before the response is created, so errors raised while
+    creating the first batch (e.g. an invalid session ID) still result in the
+    appropriate status code. Errors raised after that point end the stream early
+
+    :param results: Async generator yielding JSON formattable results
+    :type results: :class:`collections.abc.AsyncGenerator`
+    :return: :class:`NDJSONIngestResponse`
+    """
+    try:
+        first_result = await anext(results, None)
+    except BaseException:
+        await results.aclose()
+        raise
+
+    async def stream_results():
+        result = first_result
+        try:
+            while result is not None:
+                yield encode_ndjson_chunk([result])
+                result = await anext(results, None)
+        finally:
+            log.debug("Closing NDJSON ingest stream")
+            await results.aclose()
+
+    return NDJSONIngestResponse(stream_results(), media_type=NDJSON_MEDIA_TYPE)
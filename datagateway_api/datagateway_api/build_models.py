@@ -6,7 +6,7 @@ from icat.exception import ICATError
 from pydantic import AwareDatetime, BaseModel, create_model, Field
 
 from datagateway_api.common.exceptions import PythonICATError
-from datagateway_api.datagateway_api.icat.helpers import get_cached_client
+from datagateway_api.datagateway_api.icat.client_lease import client_lease_manager
 
 log = logging.getLogger()
 
@@ -84,8 +84,8 @@ def build_datagateway_api_model(**kwargs):
     ----------
     **kwargs :
         Optional configuration parameters. Expected keys:
-        - `client_pool`: A pool or cache of ICAT clients, passed into
-          `get_cached_client`.
+        - `client_pool`: A pool of ICAT clients, used to lease a client via
+          `client_lease_manager`.
 
     Returns
     -------
@@ -115,60 +115,60 @@ def build_datagateway_api_model(**kwargs):
     datagateway_api_models = {}
 
     client_pool = kwargs.get("client_pool")
-    client = get_cached_client(None, client_pool)
-
-    try:
-        entity_names = client.getEntityNames()
-    except ICATError as e:
-        raise PythonICATError(e) from e
-
-    for name in entity_names:
-        info = client.getEntityInfo(name)
-        fields = {}
-        post_fields = {}
-        post_name = f"{name}Post"
-        patch_name = f"{name}Patch"
-        for field in info.fields:
-
-            if field.name in SYSTEM_FIELDS:
-                continue
-
-            if field.relType == "ATTRIBUTE":
-                field_type = TYPE_MAP.get(field.type, str)
-                optional_field_type = Optional[field_type]
-
-                description = getattr(field, "comment", None)
-                field_metadata = Field(description=description)
-                optional_annotated_type = Annotated[optional_field_type, field_metadata]
-
-                fields[field.name] = (optional_annotated_type, None)
-                post_fields[field.name] = (optional_annotated_type, None)
-
-            else:
-                rel_model_name = field.type
-                if field.relType == "MANY":
-                    rel_type_str = f"List[{rel_model_name!r}]"
-                    post_type = f"List['{rel_model_name}Post']"  # noqa: B907
+
+    with client_lease_manager.lease(client_pool) as client:
+        try:
+            entity_names = client.getEntityNames()
+        except ICATError as e:
+            raise PythonICATError(e) from e
+
+        for name in entity_names:
+            info = client.getEntityInfo(name)
+            fields = {}
+            post_fields = {}
+            post_name = f"{name}Post"
+            patch_name = f"{name}Patch"
+            for field in info.fields:
+
+                if field.name in SYSTEM_FIELDS:
+                    continue
+
+                if field.relType == "ATTRIBUTE":
+                    field_type = TYPE_MAP.get(field.type, str)
+                    optional_field_type = Optional[field_type]
+
+                    description = getattr(field, "comment", None)
+                    field_metadata = Field(description=description)
+                    optional_annotated_type = Annotated[optional_field_type, field_metadata]
+
+                    fields[field.name] = (optional_annotated_type, None)
+                    post_fields[field.name] = (optional_annotated_type, None)
+
                 else:
-                    rel_type_str = f"{rel_model_name!r}"
-                    post_type = int
-
-                optional_type = Optional[post_type]
-                rel_type_str = f"Optional[{rel_type_str}]"
-
-                description = getattr(field, "comment", None)
-                field_metadata = Field(description=description)
-                annotated_type = Annotated[rel_type_str, field_metadata]
-                optional_annotated_type = Annotated[optional_type, field_metadata]
-                fields[field.name] = (annotated_type, None)
-                post_fields[field.name] = (optional_annotated_type, None)
-
-        model = create_model(name, __base__=ICATBaseEntity, **fields)
-        post_model = create_model(post_name, **post_fields)
-        patch_model = create_model(patch_name, __base__=ICATId, **post_fields)
-        datagateway_api_models[name] = model
-        datagateway_api_models[post_name] = post_model
-        datagateway_api_models[patch_name] = patch_model
+                    rel_model_name = field.type
+                    if field.relType == "MANY":
+                        rel_type_str = f"List[{rel_model_name!r}]"
+                        post_type = f"List['{rel_model_name}Post']"  # noqa: B907
+                    else:
+                        rel_type_str = f"{rel_model_name!r}"
+                        post_type = int
+
+                    optional_type = Optional[post_type]
+                    rel_type_str = f"Optional[{rel_type_str}]"
+
+                    description = getattr(field, "comment", None)
+                    field_metadata = Field(description=description)
+                    annotated_type = Annotated[rel_type_str, field_metadata]
+                    optional_annotated_type = Annotated[optional_type, field_metadata]
+                    fields[field.name] = (annotated_type, None)
+                    post_fields[field.name] = (optional_annotated_type, None)
+
+            model = create_model(name, __base__=ICATBaseEntity, **fields)
+            post_model = create_model(post_name, **post_fields)
+            patch_model = create_model(patch_name, __base__=ICATId, **post_fields)
+            datagateway_api_models[name] = model
+            datagateway_api_models[post_name] = post_model
+            datagateway_api_models[patch_name] = patch_model
 
     for model in datagateway_api_models.values():
         types_namespace = {
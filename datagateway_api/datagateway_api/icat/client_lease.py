@@ -0,0 +1,121 @@
+from contextlib import contextmanager
+import logging
+import threading
+import time
+
+from datagateway_api.common.config import Config
+from datagateway_api.common.exceptions import ServiceUnavailableError
+
+log = logging.getLogger()
+
+
+class ClientLeaseManager:
+    """
+    Lends client objects from the client pool to requests, so each request has
+    exclusive use of a client for its duration
+
+    A client is checked out of the pool when a request starts, the request's session ID
+    is attached to it, and the client is flushed and returned to the pool when the
+    request ends. This means no two requests ever use the same client at the same time
+    (even if they use the same session ID) and the number of clients in use scales with
+    the number of concurrent requests, rather than the number of distinct sessions.
+
+    The number of leases is capped at the pool's maximum size. If no client becomes
+    available within `lease_timeout` seconds, a 503 is returned instead of the request
+    waiting indefinitely.
+    """
+
+    def __init__(self, max_leases, lease_timeout):
+        """
+        :param max_leases: Maximum number of clients that can be leased at once
+        :type max_leases: :class:`int`
+        :param lease_timeout: Number of seconds to wait for a client to become
+            available
+        :type lease_timeout: :class:`float`
+        """
+        self.max_leases = max_leases
+        self.lease_timeout = lease_timeout
+        self._available_leases = threading.BoundedSemaphore(max_leases)
+        self._lock = threading.Lock()
+        self._leases = {}
+        self.total_leases = 0
+
+    @contextmanager
+    def lease(self, client_pool, session_id=None):
+        """
+        Context manager that checks a client out of `client_pool` for the duration of
+        the `with` block
+
+        :param client_pool: Client object pool used to fetch an unused client
+        :type client_pool: :class:`ObjectPool`
+        :param session_id: The user's session ID, None if the client doesn't need to be
+            authenticated (e.g. for login)
+        :type session_id: :class:`str`
+        :return: ICAT client with `session_id` attached
+        :raises ServiceUnavailableError: If no client becomes available before the lease
+            timeout
+        """
+        if not self._available_leases.acquire(timeout=self.lease_timeout):
+            log.warning("Timed out waiting %s seconds for an ICAT client", self.lease_timeout)
+            raise ServiceUnavailableError("Timed out waiting for an available ICAT client")
+
+        try:
+            client, stats = self._checkout(client_pool)
+        except Exception:
+            self._available_leases.release()
+            raise
+
+        client.sessionId = session_id
+        with self._lock:
+            self._leases[id(client)] = time.monotonic()
+            self.total_leases += 1
+
+        try:
+            yield client
+        finally:
+            # Flushing session ID so the next request to lease this client doesn't use
+            # (or log out) this request's session
+            client.sessionId = None
+            with self._lock:
+                lease_start = self._leases.pop(id(client))
+            log.debug("ICAT client leased for %.3f seconds", time.monotonic() - lease_start)
+
+            # Resource stats aren't used in the API, but are needed by the pool
+            client_pool._queue_resource(client, stats)
+            self._available_leases.release()
+
+    def _checkout(self, client_pool):
+        # The pool's size check and fetch aren't atomic, so they're locked to prevent a
+        # thread blocking on an empty queue. New clients (which can take several seconds
+        # to create) are created outside the lock so other requests aren't held up
+        with self._lock:
+            if client_pool.get_pool_size() > 0:
+                return client_pool._get_resource()
+
+        log.info("Client pool is empty, creating a new client")
+        return client_pool.klass(), client_pool._get_default_stats()
+
+    def get_stats(self):
+        """
+        :return: Dictionary containing the number of leases currently active, the
+            maximum number of concurrent leases and the number of leases since startup
+        """
+        with self._lock:
+            return {
+                "active_leases": len(self._leases),
+                "max_leases": self.max_leases,
+                "total_leases": self.total_leases,
+            }
+
+
+client_lease_manager = ClientLeaseManager(
+    Config.config.datagateway_api.client_pool_max_size,
+    Config.config.datagateway_api.client_lease_timeout,
+)
+# Streamed responses hold their client until the stream ends, which could be a long
+# time for a slow consumer, so they have their own leases. Otherwise a few slow streams
+# could hold every lease and other requests would be rejected
+stream_lease_manager = ClientLeaseManager(
+    Config.config.datagateway_api.max_concurrent_streams,
+    Config.config.datagateway_api.client_lease_timeout,
+)
@@ -1,8 +1,15 @@
+import base64
+import hashlib
+import hmac
+import json
 import logging
+import math
 
 from datagateway_api.common.config import Config
-from datagateway_api.common.exceptions import FilterError
+from datagateway_api.common.date_handler import DateHandler
+from datagateway_api.common.exceptions import BadRequestError, FilterError
 from datagateway_api.common.filters import (
+    CursorFilter,
     DistinctFieldFilter,
     IncludeFilter,
     LimitFilter,
@@ -10,7 +17,7 @@ from datagateway_api.common.filters import (
     SkipFilter,
     WhereFilter,
 )
-from datagateway_api.common.helpers import get_icat_properties
+from datagateway_api.common.icat_properties import get_icat_max_entities
 
 log = logging.getLogger()
 
@@ -181,9 +188,9 @@ class PythonICATDistinctFieldFilter(DistinctFieldFilter):
                 # execution (more info:
                 # https://github.com/icatproject/python-icat/issues/76). This appears to
                 # be a JPQL limitation, something that cannot be fixed in Python ICAT.
-                # As a result, the API will get the distinct results and manually
-                # perform `len()` on the list, using `manual_count` as a flag to
-                # recognise this situation
+                # As a result, `manual_count` is used as a flag so the query is counted
+                # by `ICATQuery.execute_distinct_count()` once all filters (including
+                # limit/skip) have been applied
                 query.setAggregate("DISTINCT")
                 log.debug("Manual count flag enabled")
                 query.manual_count = True
@@ -197,23 +204,20 @@ class PythonICATDistinctFieldFilter(DistinctFieldFilter):
 
 
 class PythonICATOrderFilter(OrderFilter):
-    # Used to append the order tuples across all filters in a single request
-    result_order = []
-    # When 1-many relationships occur, entities should be joined using a LEFT JOIN to
-    # prevent disappearing results when sorting on DataGateway's table view
-    join_specs = {}
-
     def __init__(self, field, direction):
         # Python ICAT doesn't automatically uppercase the direction, errors otherwise
         super().__init__(field, direction.upper())
 
     def apply_filter(self, query):
-        PythonICATOrderFilter.result_order.append((self.field, self.direction))
-        log.debug("Result Order: %s", PythonICATOrderFilter.result_order)
+        # Python ICAT overwrites (as opposed to appending to) the query's order each
+        # time it's set, so the order of all order filters applied to this query is
+        # kept on the query itself (see `ICATQuery`)
+        query.result_order.append((self.field, self.direction))
+        log.debug("Result Order: %s", query.result_order)
 
         try:
             log.info("Adding order filter (for %s)", self.field)
-            query.setOrder(PythonICATOrderFilter.result_order)
+            query.setOrder(query.result_order)
         except ValueError as e:
             # Typically invalid attribute(s)
             raise FilterError(e) from e
@@ -223,19 +227,20 @@ class PythonICATOrderFilter(OrderFilter):
             # Looking for plural entities but not field names
             # This is to avoid adding JOINs to field names such as job's argument field
             if split_fields[field_pointer].endswith("s") and split_fields[field_pointer] != split_fields[-1]:
+                # When 1-many relationships occur, entities should be joined using a
+                # LEFT JOIN to prevent disappearing results when sorting on
+                # DataGateway's table view
+                join_specs = dict(query.join_specs)
                 # Length minus 1 is used to omit field names, same reason as above
                 for join_field_pointer in range(field_pointer, len(split_fields) - 1):
                     join_field_list = split_fields[field_pointer : join_field_pointer + 1]
                     join_field_str = ".".join(join_field_list)
 
-                    PythonICATOrderFilter.join_specs[join_field_str] = "LEFT JOIN"
+                    join_specs[join_field_str] = "LEFT JOIN"
 
-                log.debug(
-                    "Setting query join specs: %s",
-                    PythonICATOrderFilter.join_specs,
-                )
+                log.debug("Setting query join specs: %s", join_specs)
                 try:
-                    query.setJoinSpecs(PythonICATOrderFilter.join_specs)
+                    query.setJoinSpecs(join_specs)
                 except (TypeError, ValueError) as e:
                     raise FilterError(e) from e
 
@@ -248,17 +253,199 @@ class PythonICATSkipFilter(SkipFilter):
         self.filter_use = filter_use
 
     def apply_filter(self, query):
-        if self.filter_use == "datagateway_api":
-            icat_properties = get_icat_properties(
-                Config.config.datagateway_api.icat_url,
-                Config.config.datagateway_api.icat_check_cert,
+        icat_set_limit(query, self.skip_value, get_icat_max_entities(self.filter_use))
+        # ICAT requires a count alongside a skip, so `maxEntities` is used. This flag
+        # lets `ICATQuery` know the count wasn't requested by the user, so the query
+        # can be paged if there are more results than `maxEntities`
+        query.open_ended_limit = True
+
+
+class PythonICATCursorFilter(CursorFilter):
+    """
+    Keyset pagination for a query: rather than skipping a number of results (which the
+    database does by reading them all), results after the last result of the previous
+    page are selected using a WHERE condition on the query's order key(s)
+
+    The cursor is an opaque token that encodes the order of the query and the order
+    key values (plus the ID) of the last result of a page. `id` is always added to the
+    order (if it isn't already part of it) so the order is unique. Only attributes of
+    the entity (i.e. not related entities) can be used to order a cursor paginated query
+    """
+
+    def __init__(self, cursor):
+        super().__init__(cursor)
+        self.order = None
+
+    def apply_filter(self, query):
+        if query.attributes:
+            raise FilterError("A cursor cannot be used with a distinct filter")
+
+        self.order = [(attr, "DESC" if "DESC" in direction else "ASC") for attr, direction in query.order.items()]
+        if any("." in attr or "(" in attr for attr, _ in self.order):
+            raise FilterError(
+                "A cursor can only be used when ordering by attributes of the entity, not related entities",
             )
-        else:
-            icat_properties = get_icat_properties(
-                Config.config.search_api.icat_url,
-                Config.config.search_api.icat_check_cert,
+        if "id" not in (attr for attr, _ in self.order):
+            self.order.append(("id", "ASC"))
+            query.setOrder(self.order)
+
+        if self.cursor is None:
+            log.info("First page of cursor paginated query, no condition to add")
+            return
+
+        cursor_order, cursor_values = self.decode_cursor(self.cursor)
+        if cursor_order != self.order:
+            raise FilterError("The cursor given doesn't match the order of the request")
+
+        log.info("Adding cursor condition to query")
+        query.addConditions(self.create_keyset_condition(query, cursor_values))
+
+    def create_keyset_condition(self, query, cursor_values):
+        """
+        Create the condition that selects results that come after `cursor_values` in
+        the query's order, in the form taken by Python ICAT's `Query.addConditions()`
+        e.g. `{"name": ">= 'a' AND ((o.name > 'a') OR (o.name = 'a' AND o.id > 5))"}`
+
+        Python ICAT builds each condition as `o.<attribute> <condition>` and joins them
+        all with ANDs, so the ORs of a keyset condition (which spans every order key)
+        can't be given as separate conditions. Instead, the condition is given on the
+        leading order key: every result after the cursor has a leading order key at
+        least (or, for a descending order, at most) the cursor's, so that bound is the
+        condition on the attribute and the full keyset condition is ANDed to it. The
+        keyset condition refers to the attributes using Python ICAT's `o` alias for the
+        queried entity
+
+        :param query: ICAT Query object the condition will be added to
+        :type query: :class:`icat.query.Query`
+        :param cursor_values: Values of the order key(s) of the last result of the
+            previous page
+        :type cursor_values: :class:`list`
+        :return: The keyset condition, keyed by the leading order key
+        """
+        literals = [
+            self.create_literal(query, attr, value) for (attr, _), value in zip(self.order, cursor_values, strict=True)
+        ]
+
+        keyset_terms = []
+        for order_pointer, (attr, direction) in enumerate(self.order):
+            operator = ">" if direction == "ASC" else "<"
+            term = [f"o.{self.order[i][0]} = {literals[i]}" for i in range(order_pointer)]
+            term.append(f"o.{attr} {operator} {literals[order_pointer]}")
+            keyset_terms.append(f"({' AND '.join(term)})")
+
+        leading_attr, leading_direction = self.order[0]
+        leading_operator = ">=" if leading_direction == "ASC" else "<="
+        return {leading_attr: f"{leading_operator} {literals[0]} AND ({' OR '.join(keyset_terms)})"}
+
+    @staticmethod
+    def create_literal(query, attr, value):
+        """
+        Convert a value from a cursor into a JPQL literal, using the type of the
+        attribute from ICAT's entity info (which Python ICAT caches on the client). The
+        cursor comes from the client, so the value is validated against the type rather
+        than trusted to be a value from a result
+
+        :raises FilterError: If the value isn't valid for the attribute's type, or the
+            attribute's type can't be used in a cursor
+        """
+        attr_type = query.entity.getAttrInfo(query.client, attr).type
+        try:
+            if DateHandler.is_icat_date_type(attr_type):
+                if not isinstance(value, str):
+                    raise TypeError(f"{value!r} is not a date")
+                date = DateHandler.str_to_datetime_object(value).replace(tzinfo=None)
+                return f"{{ts {date.isoformat(' ')}}}"
+            elif attr_type == "String":
+                if not isinstance(value, str):
+                    raise TypeError(f"{value!r} is not a string")
+                escaped_value = value.replace("'", "''")
+                return f"'{escaped_value}'"  # noqa: B907
+            elif attr_type == "boolean":
+                if not isinstance(value, bool):
+                    raise TypeError(f"{value!r} is not a boolean")
+                return "TRUE" if value else "FALSE"
+            elif attr_type in ("Integer", "Long"):
+                if isinstance(value, bool):
+                    raise TypeError(f"{value!r} is not an integer")
+                return str(int(value))
+            elif attr_type == "Double":
+                if isinstance(value, bool):
+                    raise TypeError(f"{value!r} is not a number")
+                number = float(value)
+                if not math.isfinite(number):
+                    raise ValueError(f"{value!r} is not a finite number")
+                return repr(number)
+        except (TypeError, ValueError) as e:
+            raise FilterError(f"The cursor given is invalid, bad value for {attr}: {e}") from e
+
+        raise FilterError(f"A cursor cannot be used when ordering by {attr} (of type {attr_type})")
+
+    def get_next_cursor(self, results, limit):
+        """
+        Create the cursor for the page after `results`
+
+        :param results: Results of the query, in a JSON format
+        :type results: :class:`list`
+        :param limit: The value of the request's limit filter
+        :type limit: :class:`int`
+        :return: The next cursor, or None if there are no more results
+        :raises BadRequestError: If one of the order keys of the last result is null,
+            as there's no way to select the results that come after it
+        """
+        if limit is None or len(results) < limit or not results:
+            return None
+
+        cursor_values = [results[-1][attr] for attr, _ in self.order]
+        if None in cursor_values:
+            raise BadRequestError(
+                "A cursor cannot be created as the last result has a null value for a field in the order filter",
             )
-        icat_set_limit(query, self.skip_value, icat_properties["maxEntities"])
+
+        return self.encode_cursor(self.order, cursor_values)
+
+    @staticmethod
+    def sign_cursor(cursor_data):
+        """
+        Create the signature of a cursor's (base64 encoded) data using the configured
+        `cursor_signing_key`, or None if no key is configured
+        """
+        signing_key = Config.config.datagateway_api.cursor_signing_key
+        if signing_key is None:
+            return None
+
+        signature = hmac.new(signing_key.get_secret_value().encode(), cursor_data.encode(), hashlib.sha256)
+        return base64.urlsafe_b64encode(signature.digest()).decode()
+
+    @staticmethod
+    def encode_cursor(order, cursor_values):
+        cursor_data = json.dumps({"order": order, "values": cursor_values}, separators=(",", ":"))
+        cursor = base64.urlsafe_b64encode(cursor_data.encode()).decode()
+        signature = PythonICATCursorFilter.sign_cursor(cursor)
+        return cursor if signature is None else f"{cursor}.{signature}"
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        :return: Tuple of the order and order key values encoded in the cursor
+        :raises FilterError: If the cursor isn't valid, or its signature doesn't match
+            its data (when a `cursor_signing_key` is configured)
+        """
+        cursor, _, signature = cursor.partition(".")
+        expected_signature = PythonICATCursorFilter.sign_cursor(cursor)
+        if expected_signature is not None and not hmac.compare_digest(signature, expected_signature):
+            raise FilterError("The cursor given is invalid")
+
+        try:
+            cursor_data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            order = [tuple(order_key) for order_key in cursor_data["order"]]
+            cursor_values = cursor_data["values"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise FilterError("The cursor given is invalid") from e
+
+        if len(order) != len(cursor_values):
+            raise FilterError("The cursor given is invalid")
+
+        return order, cursor_values
 
 
 class PythonICATLimitFilter(LimitFilter):
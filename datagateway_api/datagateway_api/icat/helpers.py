@@ -1,12 +1,11 @@
-from datetime import datetime, timedelta
+from copy import deepcopy
 from functools import wraps
+import inspect
 import logging
 
-from cachetools import cached
-from dateutil.tz import tzlocal
 from icat.exception import (
+    ICATError,
     ICATInternalError,
-    ICATNoObjectError,
     ICATObjectExistsError,
     ICATParameterError,
     ICATSessionError,
@@ -21,16 +20,21 @@ from datagateway_api.common.exceptions import (
     MissingRecordError,
     PythonICATError,
 )
-from datagateway_api.common.filter_order_handler import FilterOrderHandler
+from datagateway_api.common.icat_properties import get_icat_max_entities
+from datagateway_api.datagateway_api.icat.client_lease import client_lease_manager, stream_lease_manager
 from datagateway_api.datagateway_api.icat.filters import (
+    PythonICATDistinctFieldFilter,
     PythonICATLimitFilter,
     PythonICATWhereFilter,
 )
-from datagateway_api.datagateway_api.icat.lru_cache import ExtendedLRUCache
 from datagateway_api.datagateway_api.icat.query import ICATQuery
+from datagateway_api.datagateway_api.icat.query_plan import query_plan_cache
+from datagateway_api.datagateway_api.icat.reader_client_pool import reader_client_pool
 from datagateway_api.datagateway_api.icat.reader_query_handler import (
     ReaderQueryHandler,
 )
+from datagateway_api.datagateway_api.icat.response_cache import invalidates_cached_responses
+from datagateway_api.datagateway_api.icat.session_cache import session_metadata_cache
 
 log = logging.getLogger()
 
@@ -46,6 +50,14 @@ def requires_session_id(method):
     have a valid session ID (be it created from this API, or from an alternative such as
     scigateway-auth).
 
+    A client is leased from the client pool for the duration of the method call (see
+    `ClientLeaseManager`), so the client is never shared with another request. The
+    session's expiry is checked using `session_metadata_cache` so ICAT is only asked
+    for it when the session isn't cached.
+
+    Generator methods (used to stream results) are also supported, where the client is
+    leased until the generator is exhausted or closed.
+
     This assumes the session ID is the second argument of the function where this
     decorator is applied, which is reasonable to assume considering the current method
     signatures of all the endpoints.
@@ -54,57 +66,48 @@ def requires_session_id(method):
     :raises AuthenticationError: If a valid session_id is not provided with the request
     """
 
+    def check_session(client):
+        # Find out if session has expired, only asking ICAT if the session's metadata
+        # isn't cached
+        session_metadata = session_metadata_cache.get_or_fetch(client)
+        log.info("Session expiry: %s", session_metadata.expiry)
+        if session_metadata.is_expired():
+            raise AuthenticationError("Forbidden")
+
     @wraps(method)
     def wrapper_requires_session(*args, **kwargs):
         try:
             client_pool = kwargs.get("client_pool")
 
-            client = get_cached_client(args[1], client_pool)
-            client.sessionId = args[1]
-            # Client object put into kwargs so it can be accessed by
-            # python ICAT functions
-            kwargs["client"] = client
-
-            # Find out if session has expired
-            session_time = client.getRemainingMinutes()
-            log.info("Session time: %d", session_time)
-            if session_time < 0:
-                raise AuthenticationError("Forbidden")
-            else:
+            with client_lease_manager.lease(client_pool, args[1]) as client:
+                # Client object put into kwargs so it can be accessed by
+                # python ICAT functions
+                kwargs["client"] = client
+                check_session(client)
                 return method(*args, **kwargs)
         except ICATSessionError as e:
+            # Session may have been logged out elsewhere since it was cached
+            session_metadata_cache.invalidate(args[1])
             raise AuthenticationError(e) from e
 
-    return wrapper_requires_session
-
-
-@cached(cache=ExtendedLRUCache())
-def get_cached_client(session_id, client_pool):
-    """
-    Get a client from cache using session ID as the cache parameter (client_pool will
-    always be given the same object, so won't impact on argument hashing)
-
-    An available client is fetched from the object pool, given a session ID, and kept
-    around in this cache until it becomes 'least recently used'. At this point, the
-    session ID is flushed and the client is returned to the pool. More details about
-    client handling can be found in the README
-
-    :param session_id: The user's session ID
-    :type session_id: :class:`str`
-    :param client_pool: Client object pool used to fetch an unused client
-    :type client_pool: :class:`ObjectPool`
-    """
-
-    # Get a client from the pool
-    client, stats = client_pool._get_resource()
+    @wraps(method)
+    def generator_wrapper_requires_session(*args, **kwargs):
+        # The lease is held until the generator has been exhausted or closed, so it's
+        # taken from the stream leases rather than those of other requests
+        try:
+            client_pool = kwargs.get("client_pool")
 
-    # `session_id` of None suggests this function is being called from an endpoint that
-    # doesn't use the `requires_session_id` decorator (e.g. POST /sessions)
-    log.info("Caching, session ID: %s", session_id)
-    if session_id:
-        client.sessionId = session_id
+            with stream_lease_manager.lease(client_pool, args[1]) as client:
+                kwargs["client"] = client
+                check_session(client)
+                yield from method(*args, **kwargs)
+        except ICATSessionError as e:
+            session_metadata_cache.invalidate(args[1])
+            raise AuthenticationError(e) from e
 
-    return client
+    if inspect.isgeneratorfunction(method):
+        return generator_wrapper_requires_session
+    return wrapper_requires_session
 
 
 def get_session_details_helper(client):
@@ -116,14 +119,12 @@ def get_session_details_helper(client):
     :return: Details of the user's session, ready to be converted into a JSON response
         body
     """
-    session_time_remaining = client.getRemainingMinutes()
-    session_expiry_time = (datetime.now(tzlocal()) + timedelta(minutes=session_time_remaining)).replace(microsecond=0)
-    username = client.getUserName()
+    session_metadata = session_metadata_cache.get_or_fetch(client)
 
     return {
         "id": client.sessionId,
-        "expireDateTime": DateHandler.datetime_object_to_str(session_expiry_time),
-        "username": username,
+        "expireDateTime": DateHandler.datetime_object_to_str(session_metadata.expiry.replace(microsecond=0)),
+        "username": session_metadata.username,
     }
 
 
@@ -134,6 +135,7 @@ def logout_icat_client(client):
     :param client: ICAT client containing an authenticated user
     :type client: :class:`icat.client.Client`
     """
+    session_metadata_cache.invalidate(client.sessionId)
     client.logout()
 
 
@@ -145,9 +147,11 @@ def refresh_client_session(client):
     :type client: :class:`icat.client.Client`
     """
     client.refresh()
+    # Expiry has changed so it'll be fetched again on the next request
+    session_metadata_cache.invalidate(client.sessionId)
 
 
-def update_attributes(old_entity, new_entity):
+def update_attributes(old_entity, new_entity, resolver=None):
     """
     Updates the attribute(s) of a given object which is a record of an entity from
     Python ICAT
@@ -157,19 +161,25 @@ def update_attributes(old_entity, new_entity):
         :class:`icat.entity.Entity`)
     :param new_entity: Dictionary containing the new data to be modified
     :type new_entity: :class:`dict`
+    :param resolver: Resolver of the request's related entities. If one is given, the
+        related entities are only set once the caller calls its `resolve()`, so they can
+        be fetched alongside those of other entities in the request
+    :type resolver: :class:`RelatedEntityResolver`
     :raises BadRequestError: If the attribute cannot be found, or if it cannot be edited
         - typically if Python ICAT doesn't allow an attribute to be edited (e.g. modId &
         modTime)
     """
+    resolve_related_entities = resolver is None
+    if resolver is None:
+        resolver = RelatedEntityResolver(old_entity.client)
+
     entity_non_null_fields = {k: v for k, v in new_entity.items() if v is not None}
 
     log.debug("Updating entity attributes: %s", list(entity_non_null_fields.keys()))
 
     for key, value in entity_non_null_fields.items():
         try:
-            original_data_attribute = getattr(old_entity, key)
-            if isinstance(original_data_attribute, datetime):
-                new_entity[key] = DateHandler.str_to_datetime_object(new_entity[key])
+            getattr(old_entity, key)
         except AttributeError as e:
             raise BadRequestError(
                 f"Bad request made, cannot find attribute `{key}` within the {old_entity.BeanName} entity",
@@ -180,23 +190,48 @@ def update_attributes(old_entity, new_entity):
             related_object = new_entity[key]
             if key != "id":
                 entity_info = old_entity.getAttrInfo(old_entity.client, key)
-                if entity_info.relType.lower() == "many":
+                if entity_info.relType.lower() == "attribute":
+                    related_object = convert_attribute_value(entity_info, value)
+                elif entity_info.relType.lower() == "many":
                     related_object = build_related_entities(
                         old_entity.client,
                         entity_info.type,
                         value,
                         parent_entity_type=old_entity.BeanName,
+                        resolver=resolver,
                     )
                 elif entity_info.relType.lower() == "one":
-                    related_object = old_entity.client.get(entity_info.type, value)
+                    resolver.set_related_entity(old_entity, key, entity_info.type, value)
+                    continue
             setattr(old_entity, key, related_object)
         except AttributeError as e:
             raise BadRequestError(
                 f"Bad request made, cannot modify attribute `{key}` within the {old_entity.BeanName} entity",
             ) from e
+
+    if resolve_related_entities:
+        resolver.resolve()
     return old_entity
 
 
+def convert_attribute_value(entity_field, value):
+    """
+    Convert a value from a request body into the type ICAT expects for an attribute.
+    The attribute's type is taken from ICAT's entity info, so only strings given for
+    date attributes are converted (into :class:`datetime` objects), rather than
+    converting any string which looks like a date
+
+    :param entity_field: The attribute's field from ICAT's entity info
+    :type entity_field: ICAT `entityField`
+    :param value: The value given for the attribute
+    :return: The converted value
+    :raises BadRequestError: If a date attribute is given a string that isn't a date
+    """
+    if isinstance(value, str) and DateHandler.is_icat_date_type(entity_field.type):
+        return DateHandler.str_to_datetime_object(value)
+    return value
+
+
 def push_data_updates_to_icat(entity):
     try:
         entity.update()
@@ -257,6 +292,174 @@ def get_entity_by_id(
         return entity_by_id_data[0]
 
 
+def get_entities_by_ids(
+    client,
+    entity_type,
+    ids,
+    return_json_formattable_data=True,
+    return_related_entities=False,
+):
+    """
+    Gets the records of the given IDs from the specified entity. Rather than a query
+    per ID, the IDs are fetched using `id IN (...)` queries, each containing up to
+    ICAT's `maxEntities` IDs
+
+    :param client: ICAT client containing an authenticated user
+    :type client: :class:`icat.client.Client`
+    :param entity_type: The type of entity requested to manipulate data with
+    :type entity_type: :class:`str`
+    :param ids: ID numbers of the entities to retrieve
+    :type ids: :class:`list` of :class:`int`
+    :param return_json_formattable_data: Flag to determine whether the data should be
+        returned ready to be converted straight to JSON or left in a Python ICAT format
+        (see `get_entity_by_id()`)
+    :type return_json_formattable_data: :class:`bool`
+    :param return_related_entities: Flag to determine whether related entities should
+        automatically be returned or not (see `get_entity_by_id()`)
+    :type return_related_entities: :class:`bool`
+    :return: Dictionary mapping the ID of each record found to the record. IDs with no
+        record (or that the user can't see) are left out
+    """
+    unique_ids = list(dict.fromkeys(int(id_) for id_ in ids))
+    log.info("Getting %d %s records by ID", len(unique_ids), entity_type)
+
+    chunk_size = get_icat_max_entities()
+    includes_value = "1" if return_related_entities else None
+    records = {}
+    for chunk_start in range(0, len(unique_ids), chunk_size):
+        id_chunk = unique_ids[chunk_start : chunk_start + chunk_size]
+        id_condition = PythonICATWhereFilter.create_condition(
+            "id",
+            "in",
+            f"({', '.join(str(id_) for id_ in id_chunk)})",
+        )
+        id_query = ICATQuery(
+            client,
+            entity_type,
+            conditions=id_condition,
+            includes=includes_value,
+        )
+        for record in id_query.execute_query(client, return_json_formattable_data):
+            records[record["id"] if return_json_formattable_data else record.id] = record
+
+    return records
+
+
+def get_batch_by_ids(client, entity_type, ids):
+    """
+    Gets the records of the given IDs from the specified entity, in the order the IDs
+    were first given, along with the IDs that couldn't be found. IDs given more than
+    once are only returned once
+
+    :param client: ICAT client containing an authenticated user
+    :type client: :class:`icat.client.Client`
+    :param entity_type: The type of entity requested to manipulate data with
+    :type entity_type: :class:`str`
+    :param ids: ID numbers of the entities to retrieve
+    :type ids: :class:`list` of :class:`int`
+    :return: Dictionary containing the records found (`results`) and the IDs which
+        couldn't be found (`missing`)
+    :raises BadRequestError: If more IDs are given than `max_query_results`
+    """
+    max_results = Config.config.datagateway_api.max_query_results
+    if len(ids) > max_results:
+        raise BadRequestError(f"No more than {max_results} IDs can be requested at once")
+
+    records = get_entities_by_ids(client, entity_type, ids)
+    unique_ids = dict.fromkeys(ids)
+    return {
+        "results": [records[id_] for id_ in unique_ids if id_ in records],
+        "missing": [id_ for id_ in unique_ids if id_ not in records],
+    }
+
+
+class RelatedEntityResolver:
+    """
+    Resolves the related entities referenced by ID in the data of a write request
+
+    Rather than fetching each related entity as it's found in the request (e.g. the
+    dataset of every datafile in a POST of 500 datafiles), the entities to set are
+    collected using `set_related_entity()` and fetched by `resolve()` using one
+    `id IN (...)` query per entity type (see `get_entities_by_ids()`), so each related
+    entity is only fetched once. The fields of each entity type are also kept, so
+    nested data doesn't search ICAT's entity info for every item.
+
+    A resolver should only be used for a single request, as the fetched entities aren't
+    kept up to date
+    """
+
+    def __init__(self, client):
+        """
+        :param client: ICAT client containing an authenticated user
+        :type client: :class:`icat.client.Client`
+        """
+        self.client = client
+        self._entity_fields = {}
+        self._pending_related_entities = []
+
+    def get_entity_fields(self, entity_type):
+        """
+        Get the fields of an entity type, keyed by their name
+
+        :param entity_type: The type of entity
+        :type entity_type: :class:`str`
+        :return: :class:`dict` mapping field names to ICAT's `entityField` objects
+        """
+        if entity_type not in self._entity_fields:
+            self._entity_fields[entity_type] = {
+                field.name: field for field in self.client.getEntityInfo(entity_type).fields
+            }
+        return self._entity_fields[entity_type]
+
+    def set_related_entity(self, entity, attribute_name, entity_type, id_):
+        """
+        Set a many-to-one relationship of an entity once `resolve()` is called
+
+        :param entity: The entity to set the relationship of
+        :type entity: :class:`icat.entity.Entity`
+        :param attribute_name: Name of the relationship
+        :type attribute_name: :class:`str`
+        :param entity_type: The type of entity the relationship is to
+        :type entity_type: :class:`str`
+        :param id_: ID of the related entity
+        :type id_: :class:`int`
+        :raises BadRequestError: If the ID isn't an integer
+        """
+        try:
+            id_ = int(id_)
+        except (TypeError, ValueError) as e:
+            raise BadRequestError(f"`{attribute_name}` must be the ID of a {entity_type}, not: {id_}") from e
+
+        self._pending_related_entities.append((entity, attribute_name, entity_type, id_))
+
+    def resolve(self):
+        """
+        Fetch the related entities given to `set_related_entity()`, using one query per
+        entity type, and set them on their entities
+
+        :raises BadRequestError: If a related entity can't be found
+        """
+        ids_by_entity_type = {}
+        for _, _, entity_type, id_ in self._pending_related_entities:
+            ids_by_entity_type.setdefault(entity_type, []).append(id_)
+
+        log.debug("Resolving related entities of types: %s", list(ids_by_entity_type.keys()))
+        related_entities = {
+            entity_type: get_entities_by_ids(self.client, entity_type, ids, False)
+            for entity_type, ids in ids_by_entity_type.items()
+        }
+
+        for entity, attribute_name, entity_type, id_ in self._pending_related_entities:
+            try:
+                related_entity = related_entities[entity_type][id_]
+            except KeyError as e:
+                raise BadRequestError(f"No {entity_type} found with the ID {id_}") from e
+            setattr(entity, attribute_name, related_entity)
+
+        self._pending_related_entities = []
+
+
+@invalidates_cached_responses
 def delete_entity_by_id(client, entity_type, id_):
     """
     Deletes a record of a given ID of the specified entity
@@ -273,9 +476,16 @@ def delete_entity_by_id(client, entity_type, id_):
     client.delete(entity_id_data)
 
 
+@invalidates_cached_responses
 def update_entity_by_id(client, entity_type, id_, new_data):
     """
-    Gets a record of a given ID of the specified entity
+    Updates a record of a given ID of the specified entity
+
+    This makes three calls to ICAT: the entity is fetched with its many-to-one
+    relationships (ICAT's update replaces the whole entity, setting any relationship
+    that isn't given to null), the update is pushed and the updated record is read back
+    in the form returned to the user. Related entities referenced in `new_data` are
+    fetched alongside these (see `RelatedEntityResolver`)
 
     :param client: ICAT client containing an authenticated user
     :type client: :class:`icat.client.Client`
@@ -285,7 +495,8 @@ def update_entity_by_id(client, entity_type, id_, new_data):
     :type id_: :class:`int`
     :param new_data: JSON from request body providing new data to update the record with
         the specified ID
-    :return: The updated record of the specified ID from the given entity
+    :return: The updated record of the specified ID from the given entity, ready to be
+        converted to JSON
     """
     log.info("Updating %s of ID %s", entity_type, id_)
 
@@ -324,6 +535,52 @@ def get_entity_with_filters(client, entity_type, filters):
     return get_data_with_filters(client, entity_type, filters)
 
 
+def stream_entity_with_filters(client, entity_type, filters):
+    """
+    Gets all the records of a given entity, based on the filters provided in the
+    request, yielding them in chunks as they're fetched from ICAT rather than returning
+    them all at once. Like `get_data_with_filters()`, the reader account is used for
+    eligible queries if the reader performance functionality is enabled
+
+    :param client: ICAT client containing an authenticated user
+    :type client: :class:`icat.client.Client`
+    :param entity_type: The type of entity requested to manipulate data with
+    :type entity_type: :class:`str`
+    :param filters: The list of filters to be applied to the request
+    :type filters: List of specific implementations :class:`QueryFilter`
+    :return: Generator yielding lists of records of the given entity, ready to be
+        converted to JSON
+    """
+    log.info("Streaming entity using request's filters")
+
+    if is_use_reader_for_performance_enabled():
+        reader_query = ReaderQueryHandler(entity_type, filters)
+        if reader_query.is_query_eligible_for_reader_performance() and reader_query.is_user_authorised_to_see_entity_id(
+            client,
+        ):
+            log.info("Query to be streamed as reader account")
+            # The stream's own client is used with the reader session, rather than
+            # checking a client out of the reader pool for as long as the stream lasts
+            user_session_id = client.sessionId
+            client.sessionId = reader_client_pool.get_session_id()
+            try:
+                query = query_plan_cache.get_query(client, entity_type, filters)
+                yield from query.iter_query_chunks(
+                    client,
+                    Config.config.datagateway_api.stream_chunk_size,
+                )
+            finally:
+                client.sessionId = user_session_id
+            return
+
+    query = query_plan_cache.get_query(client, entity_type, filters)
+
+    yield from query.iter_query_chunks(
+        client,
+        Config.config.datagateway_api.stream_chunk_size,
+    )
+
+
 def get_count_with_filters(client, entity_type, filters):
     """
     Get the number of results of a given entity, based on the filters provided in the
@@ -368,48 +625,48 @@ def get_data_with_filters(client, entity_type, filters, aggregate=None):
         if reader_query.is_query_eligible_for_reader_performance():
             log.info("Query is eligible to be passed as reader acount")
             if reader_query.is_user_authorised_to_see_entity_id(client):
-                reader_client = ReaderQueryHandler.reader_client
                 log.info("Query to be executed as reader account")
-                try:
-                    return execute_entity_query(
+                # If the reader session has expired, the pool logs in again and the
+                # query is retried. Building a query changes its filters (e.g. ilike
+                # fields become `UPPER(field)`), so each attempt gets its own copy
+                return reader_client_pool.run(
+                    lambda reader_client: execute_entity_query(
                         reader_client,
                         entity_type,
-                        filters,
+                        deepcopy(filters),
                         aggregate=aggregate,
-                    )
-                except ICATSessionError:
-                    # re-login as reader and try the query again
-                    reader_client = reader_query.create_reader_client()
-                    return execute_entity_query(
-                        reader_client,
-                        entity_type,
-                        filters,
-                        aggregate=aggregate,
-                    )
+                    ),
+                )
 
     # We may still be able to get results, as we may be a root user who does not need direct association with the data
-    log.info("Query to be executed as user from request: %s", client.getUserName())
+    log.info(
+        "Query to be executed as user from request: %s",
+        session_metadata_cache.get_or_fetch(client).username,
+    )
     return execute_entity_query(client, entity_type, filters, aggregate=aggregate)
 
 
 def execute_entity_query(client, entity_type, filters, aggregate=None):
     """
-    Assemble a query object with the user's query filters and execute the query by
-    passing it to ICAT, returning them in this function
+    Assemble a query object with the user's query filters (using a cached query plan
+    where possible) and execute the query by passing it to ICAT, returning them in this
+    function. Queries that could return more than ICAT's `maxEntities` are executed in
+    pages, up to `max_query_results` results
     """
 
-    query = ICATQuery(client, entity_type, aggregate=aggregate)
-
-    filter_handler = FilterOrderHandler()
-    filter_handler.manage_icat_filters(filters, query.query)
+    query = query_plan_cache.get_query(client, entity_type, filters, aggregate=aggregate)
 
     log.debug(
         "Query on entity '%s' (aggregate: %s), executed as user: %s",
         entity_type,
         aggregate,
-        client.getUserName(),
+        session_metadata_cache.get_or_fetch(client).username,
+    )
+    return query.execute_query(
+        client,
+        True,
+        max_results=Config.config.datagateway_api.max_query_results,
     )
-    return query.execute_query(client, True)
 
 
 def is_use_reader_for_performance_enabled() -> bool:
@@ -461,11 +718,18 @@ def get_first_result_with_filters(client, entity_type, filters):
         return entity_data[0]
 
 
+@invalidates_cached_responses
 def update_entities(client, entity_type, data_to_update):
     """
     Update one or more results for the given entity using the JSON provided in
     `data_to_update`
 
+    The entities are fetched using `id IN (...)` queries (see `get_entities_by_ids()`)
+    rather than one query per entity, and the updated records are read back in the same
+    way. Each entity is fetched with its many-to-one relationships, as ICAT's update
+    sets any that aren't given to null. ICAT has no bulk update call, so each updated
+    entity is still pushed using its own `update()`.
+
     If an exception occurs while sending data to icatdb, an attempt will be made to
     restore a backup of the data made before making the update.
 
@@ -476,37 +740,32 @@ def update_entities(client, entity_type, data_to_update):
     :param data_to_update: The data that to be updated in ICAT
     :type data_to_update: :class:`list` or :class:`dict`
     :return: The updated record(s) of the given entity
+    :raises MissingRecordError: If any of the entities can't be found
     """
     log.info("Updating certain results in %s", entity_type)
 
-    updated_data = []
-
     if not isinstance(data_to_update, list):
         data_to_update = [data_to_update]
 
-    icat_data_backup = []
-    updated_icat_data = []
+    try:
+        ids = [entity_request["id"] for entity_request in data_to_update]
+    except KeyError as e:
+        raise BadRequestError(
+            "The new data in the request body must contain the ID (using the key: 'id') of the entity you wish to update",
+        ) from e
+
+    icat_data = get_entities_by_ids(client, entity_type, ids, False, return_related_entities=True)
+    if len(icat_data) != len(set(ids)):
+        raise MissingRecordError("No result found")
 
+    icat_data_backup = [entity_data.copy() for entity_data in icat_data.values()]
+    resolver = RelatedEntityResolver(client)
     for entity_request in data_to_update:
-        try:
-            entity_data = get_entity_by_id(
-                client,
-                entity_type,
-                entity_request["id"],
-                False,
-                return_related_entities=True,
-            )
-            icat_data_backup.append(entity_data.copy())
-
-            updated_entity_data = update_attributes(entity_data, entity_request)
-            updated_icat_data.append(updated_entity_data)
-        except KeyError as e:
-            raise BadRequestError(
-                "The new data in the request body must contain the ID (using the key: 'id') of the entity you wish to update",
-            ) from e
+        update_attributes(icat_data[entity_request["id"]], entity_request, resolver)
+    resolver.resolve()
 
     # This separates the local data updates from pushing these updates to icatdb
-    for updated_icat_entity in updated_icat_data:
+    for updated_icat_entity in icat_data.values():
         try:
             updated_icat_entity.update()
         except (ICATValidationError, ICATInternalError) as e:
@@ -522,23 +781,24 @@ def update_entities(client, entity_type, data_to_update):
 
             raise PythonICATError(e) from e
 
-        updated_data.append(
-            get_entity_by_id(client, entity_type, updated_icat_entity.id, True),
-        )
-
-    return updated_data
+    updated_data = get_entities_by_ids(client, entity_type, ids)
+    return [updated_data[id_] for id_ in ids if id_ in updated_data]
 
 
-def create_entities(client, entity_type, data):  # noqa: C901
+@invalidates_cached_responses
+def create_entities(client, entity_type, data):
     """
     Add one or more results for the given entity using the JSON provided in `data`
 
     `created_icat_data` is data of `icat.entity.Entity` type that is collated to be
     pushed to ICAT at the end of the function - this avoids confusion over which data
-    has/hasn't been created if the request returns an error. When pushing the data to
-    ICAT, there is still risk an exception might be caught, so any entities already
-    pushed to ICAT will be deleted. Python ICAT doesn't support a database rollback (or
-    the concept of transactions) so this is a good alternative.
+    has/hasn't been created if the request returns an error. The data is pushed to ICAT
+    in batches of `write_batch_size` entities using `createMany()`, where ICAT creates
+    either all or none of a batch. There is still risk an exception might be caught, so
+    any batches already pushed to ICAT will be deleted. Python ICAT doesn't support a
+    database rollback across calls (or the concept of transactions) so this is a good
+    alternative. The created records are read back using `id IN (...)` queries (see
+    `get_entities_by_ids()`)
 
     :param client: ICAT client containing an authenticated user
     :type client: :class:`icat.client.Client`
@@ -550,12 +810,56 @@ def create_entities(client, entity_type, data):  # noqa: C901
     """
     log.info("Creating ICAT data for %s", entity_type)
 
-    created_data = []
-    created_icat_data = []
-
     if not isinstance(data, list):
         data = [data]
 
+    created_icat_data = build_entities(client, entity_type, data)
+
+    batch_size = Config.config.datagateway_api.write_batch_size
+    created_ids = []
+    for batch_start in range(0, len(created_icat_data), batch_size):
+        batch = created_icat_data[batch_start : batch_start + batch_size]
+        try:
+            # ICAT creates all of the entities in a batch or none of them
+            batch_ids = client.createMany(batch)
+        except ICATInternalError as e:
+            # Delete any data that has been pushed to ICAT before the exception
+            delete_entities_by_ids(client, entity_type, created_ids, batch_size)
+            raise PythonICATError(e) from e
+        except (ICATObjectExistsError, ICATParameterError, ICATValidationError) as e:
+            delete_entities_by_ids(client, entity_type, created_ids, batch_size)
+            raise BadRequestError(e) from e
+
+        for entity, id_ in zip(batch, batch_ids, strict=True):
+            entity.id = id_
+        created_ids.extend(batch_ids)
+
+    created_records = get_entities_by_ids(client, entity_type, created_ids)
+    if len(created_records) != len(created_ids):
+        raise MissingRecordError("No result found")
+
+    return [created_records[id_] for id_ in created_ids]
+
+
+def build_entities(client, entity_type, data):
+    """
+    Build (but don't create) new entities of the given type from the JSON provided in
+    `data`, setting the related entities referenced in it (see
+    `RelatedEntityResolver`)
+
+    :param client: ICAT client containing an authenticated user
+    :type client: :class:`icat.client.Client`
+    :param entity_type: The type of entity requested to manipulate data with
+    :type entity_type: :class:`str`
+    :param data: The data of each entity to build
+    :type data: :class:`list` of :class:`dict`
+    :return: List of the built entities
+    :raises BadRequestError: If the data contains an unknown attribute or a related
+        entity can't be found
+    """
+    created_icat_data = []
+    resolver = RelatedEntityResolver(client)
+
     for result in data:
 
         new_entity = client.new(entity_type.lower())
@@ -568,54 +872,150 @@ def create_entities(client, entity_type, data):  # noqa: C901
             try:
                 entity_info = new_entity.getAttrInfo(client, attribute_name)
                 if entity_info.relType.lower() == "attribute":
-                    # Short circuiting ensures is_str_date() will only be executed if
-                    # value is a string
-                    if isinstance(value, str) and DateHandler.is_str_a_date(value):
-                        value = DateHandler.str_to_datetime_object(value)
-
-                    setattr(new_entity, attribute_name, value)
+                    setattr(new_entity, attribute_name, convert_attribute_value(entity_info, value))
                 else:
                     # This means the attribute has a relationship with another object
-                    try:
-
-                        related_object = []
-                        if entity_info.relType.lower() == "many":
-                            related_object = build_related_entities(
-                                client,
-                                entity_info.type,
-                                value,
-                                parent_entity_type=entity_type,
-                            )
-                        else:
-                            related_object = client.get(entity_info.type, value)
-
-                    except ICATNoObjectError as e:
-                        raise BadRequestError(e) from e
-                    setattr(new_entity, attribute_name, related_object)
+                    if entity_info.relType.lower() == "many":
+                        related_object = build_related_entities(
+                            client,
+                            entity_info.type,
+                            value,
+                            parent_entity_type=entity_type,
+                            resolver=resolver,
+                        )
+                        setattr(new_entity, attribute_name, related_object)
+                    else:
+                        resolver.set_related_entity(new_entity, attribute_name, entity_info.type, value)
 
             except ValueError as e:
                 raise BadRequestError(e) from e
 
         created_icat_data.append(new_entity)
 
-    for entity in created_icat_data:
+    # Fetches each related entity referenced in the request once
+    resolver.resolve()
+    return created_icat_data
+
+
+@invalidates_cached_responses
+def create_entity_batch(client, entity_type, data):
+    """
+    Create a batch of entities of the given type using a single `createMany()` call,
+    with ICAT creating either all or none of them. Unlike `create_entities()`, the
+    created records aren't read back, which is left to the user
+
+    :param client: ICAT client containing an authenticated user
+    :type client: :class:`icat.client.Client`
+    :param entity_type: The type of entity requested to manipulate data with
+    :type entity_type: :class:`str`
+    :param data: The data of each entity to create
+    :type data: :class:`list` of :class:`dict`
+    :return: The IDs of the created entities, in the order of `data`
+    """
+    log.info("Creating batch of %d %s records", len(data), entity_type)
+
+    try:
+        return client.createMany(build_entities(client, entity_type, data))
+    except ICATInternalError as e:
+        raise PythonICATError(e) from e
+    except (ICATObjectExistsError, ICATParameterError, ICATValidationError) as e:
+        raise BadRequestError(e) from e
+
+
+@invalidates_cached_responses
+def delete_entities(client, entity_type, ids):
+    """
+    Deletes the records of the given IDs from the specified entity, in chunks of
+    `write_batch_size` IDs (see `delete_entities_by_ids()`). ICAT deletes either all or
+    none of the entities in a chunk, so a chunk failing (e.g. because one of its IDs
+    doesn't exist) doesn't stop the other chunks from being deleted
+
+    :param client: ICAT client containing an authenticated user
+    :type client: :class:`icat.client.Client`
+    :param entity_type: The type of entity requested to manipulate data with
+    :type entity_type: :class:`str`
+    :param ids: ID numbers of the entities to delete
+    :type ids: :class:`list` of :class:`int`
+    :return: List of dictionaries containing the IDs of each chunk, whether they were
+        deleted and the error if they weren't
+    :raises BadRequestError: If more IDs are given than `max_query_results`
+    """
+    max_ids = Config.config.datagateway_api.max_query_results
+    if len(ids) > max_ids:
+        raise BadRequestError(f"No more than {max_ids} IDs can be deleted at once")
+
+    batch_size = Config.config.datagateway_api.write_batch_size
+    unique_ids = list(dict.fromkeys(ids))
+
+    chunk_results = []
+    for chunk_start in range(0, len(unique_ids), batch_size):
+        id_chunk = unique_ids[chunk_start : chunk_start + batch_size]
         try:
-            entity.create()
-        except ICATInternalError as e:
-            for entity_json in created_data:
-                # Delete any data that has been pushed to ICAT before the exception
-                delete_entity_by_id(client, entity_type, entity_json["id"])
+            delete_entities_by_ids(client, entity_type, id_chunk, batch_size)
+        except ICATSessionError:
+            raise
+        except ICATError as e:
+            log.warning("Unable to delete chunk of %d %s records: %s", len(id_chunk), entity_type, e)
+            chunk_results.append({"ids": id_chunk, "deleted": False, "error": str(e)})
+        else:
+            chunk_results.append({"ids": id_chunk, "deleted": True})
 
-            raise PythonICATError(e) from e
-        except (ICATObjectExistsError, ICATParameterError, ICATValidationError) as e:
-            for entity_json in created_data:
-                delete_entity_by_id(client, entity_type, entity_json["id"])
+    return chunk_results
 
-            raise BadRequestError(e) from e
 
-        created_data.append(get_entity_by_id(client, entity_type, entity.id, True))
+def delete_entities_with_filters(client, entity_type, filters):
+    """
+    Deletes the records of the specified entity which match the where filters given in
+    the request. As a safety measure, nothing is deleted if more than
+    `delete_where_max_entities` records match the filters
+
+    :param client: ICAT client containing an authenticated user
+    :type client: :class:`icat.client.Client`
+    :param entity_type: The type of entity requested to manipulate data with
+    :type entity_type: :class:`str`
+    :param filters: The where filters of the request
+    :type filters: List of :class:`PythonICATWhereFilter`
+    :return: The result of each chunk of the delete (see `delete_entities()`)
+    :raises BadRequestError: If filters other than where filters are given, or too many
+        records match the filters
+    """
+    if not all(isinstance(query_filter, PythonICATWhereFilter) for query_filter in filters):
+        raise BadRequestError("Only where filters can be used to select the entities to delete")
+
+    max_entities = Config.config.datagateway_api.delete_where_max_entities
+    # One more ID than the cap is requested so too many matches can be detected
+    id_filters = [*filters, PythonICATDistinctFieldFilter(["id"]), PythonICATLimitFilter(max_entities + 1)]
+    ids = [result["id"] for result in execute_entity_query(client, entity_type, id_filters)]
+    if len(ids) > max_entities:
+        raise BadRequestError(
+            f"More than {max_entities} {entity_type} records match the where filters, refine the filters or delete"
+            " them by ID",
+        )
+
+    log.info("Deleting %d %s records matching the request's where filters", len(ids), entity_type)
+    return delete_entities(client, entity_type, ids)
 
-    return created_data
+
+def delete_entities_by_ids(client, entity_type, ids, batch_size):
+    """
+    Deletes the records of the given IDs from the specified entity using `deleteMany()`,
+    without fetching the records first
+
+    :param client: ICAT client containing an authenticated user
+    :type client: :class:`icat.client.Client`
+    :param entity_type: The type of entity requested to manipulate data with
+    :type entity_type: :class:`str`
+    :param ids: ID numbers of the entities to delete
+    :type ids: :class:`list` of :class:`int`
+    :param batch_size: Number of entities deleted in each call to ICAT
+    :type batch_size: :class:`int`
+    """
+    log.info("Deleting %d %s records by ID", len(ids), entity_type)
+    for batch_start in range(0, len(ids), batch_size):
+        # ICAT only needs the ID of an entity to delete it
+        client.deleteMany(
+            [client.new(entity_type.lower(), id=id_) for id_ in ids[batch_start : batch_start + batch_size]],
+        )
 
 
 def initobj(obj, attrs):
@@ -630,20 +1030,29 @@ def build_related_entities(
     entity_type: str,
     value: list | None,
     parent_entity_type: str | None = None,
+    resolver=None,
 ):
     """
     Build related ICAT entities recursively, preserving cascade logic.
+
+    Many-to-one relationships of the built entities are set using `resolver`, so are
+    only set once its `resolve()` is called. If no resolver is given, one is created and
+    resolved before returning.
     """
 
     if not value:
         return []
     related_objects = []
 
-    entity_info = client.getEntityInfo(entity_type)
+    resolve_related_entities = resolver is None
+    if resolver is None:
+        resolver = RelatedEntityResolver(client)
+
+    entity_fields = resolver.get_entity_fields(entity_type)
     for val in value:
         new_entity = client.new(entity_type)
 
-        for field in entity_info.fields:
+        for field in entity_fields.values():
             if field.name not in val:
                 continue
 
@@ -651,7 +1060,7 @@ def build_related_entities(
 
             # ---- ATTRIBUTE ----
             if field.relType.lower() == "attribute":
-                setattr(new_entity, field.name, field_value)
+                setattr(new_entity, field.name, convert_attribute_value(field, field_value))
 
             # ---- ONE (STOP) ----
             elif field.relType.lower() == "one":
@@ -659,11 +1068,7 @@ def build_related_entities(
                     # SQL cascade case
                     del val[field.name]
                 else:
-                    setattr(
-                        new_entity,
-                        field.name,
-                        client.get(field.type, field_value),
-                    )
+                    resolver.set_related_entity(new_entity, field.name, field.type, field_value)
 
             # ---- MANY (RECURSE) ----
             elif field.relType.lower() == "many":
@@ -672,9 +1077,12 @@ def build_related_entities(
                     field.type,
                     field_value,
                     parent_entity_type=entity_type,
+                    resolver=resolver,
                 )
                 setattr(new_entity, field.name, nested)
 
         related_objects.append(new_entity)
 
+    if resolve_related_entities:
+        resolver.resolve()
     return related_objects
@@ -24,10 +24,11 @@ class ICATClient(Client):
         # When clients are cleaned up, sessions won't be logged out
         self.autoLogout = False
 
-    def clean_up(self):
+    def clean_up(self, **kwargs):
         """
         Allows object pool to cleanup the client's resources, using the existing Python
-        ICAT functionality
+        ICAT functionality. The pool passes the resource's stats as keyword arguments,
+        these aren't needed by the API
         """
         super().cleanup()
 
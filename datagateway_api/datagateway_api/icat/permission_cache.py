@@ -0,0 +1,191 @@
+from collections import Counter
+import logging
+import sys
+import threading
+from typing import NamedTuple
+
+from cachetools import TTLCache
+
+from datagateway_api.common.config import Config
+from datagateway_api.common.exceptions import MissingRecordError
+
+log = logging.getLogger()
+
+
+class MissingRecord(NamedTuple):
+    """
+    Cached in place of a value when ICAT has no record for the key, so the lookup isn't
+    repeated for every request
+    """
+
+    message: str
+
+
+class PermissionCache:
+    """
+    Bounded, TTL based cache of the results of the permission checks made by
+    `ReaderQueryHandler`, shared by every reader performance query
+
+    Entries are grouped into namespaces, one for each kind of check e.g. the parent
+    investigation of a dataset (keyed by dataset ID) or whether a user is allowed to see
+    an investigation (keyed by user name and investigation ID). Negative results are
+    cached too: a user not being allowed to see an investigation is cached like any
+    other result, and a record that doesn't exist is cached as a `MissingRecord` so
+    the `MissingRecordError` can be raised again without asking ICAT.
+
+    The cache is bounded by its number of entries or, if `max_bytes` is given, by the
+    estimated size of its entries in bytes. Hits and misses are counted per namespace.
+    """
+
+    def __init__(self, maxsize, ttl, max_bytes=None):
+        """
+        :param maxsize: Maximum number of entries kept in the cache, used when
+            `max_bytes` isn't given
+        :type maxsize: :class:`int`
+        :param ttl: Number of seconds an entry is kept for
+        :type ttl: :class:`float`
+        :param max_bytes: Maximum estimated size of the entries kept in the cache
+        :type max_bytes: :class:`int`
+        """
+        if max_bytes is not None:
+            self._cache = TTLCache(maxsize=max_bytes, ttl=ttl, getsizeof=self.get_entry_size)
+        else:
+            self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    @staticmethod
+    def get_entry_size(entry):
+        """
+        Estimate the size of an entry in bytes, including the size of its key as keys
+        make up most of the cache's memory
+        """
+        key, value = entry
+        return sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key) + sys.getsizeof(value)
+
+    def get(self, namespace, key):
+        """
+        Get a cached result, if there is one
+
+        :param namespace: Kind of check the result is for
+        :type namespace: :class:`str`
+        :param key: Hashable key identifying the result within the namespace
+        :return: Tuple of whether the result was cached and the result (which may be a
+            `MissingRecord`)
+        """
+        with self._lock:
+            entry = self._cache.get((namespace, key))
+            if entry is None:
+                self.misses[namespace] += 1
+                return False, None
+
+            self.hits[namespace] += 1
+            return True, entry[1]
+
+    def store(self, namespace, key, value):
+        """
+        Cache the result of a check
+
+        :param namespace: Kind of check the result is for
+        :type namespace: :class:`str`
+        :param key: Hashable key identifying the result within the namespace
+        :param value: The result of the check
+        """
+        cache_key = (namespace, key)
+        entry = (cache_key, value)
+        with self._lock:
+            try:
+                self._cache[cache_key] = entry
+            except ValueError:
+                # The entry is larger than the whole cache
+                log.debug("Permission check result too large to be cached in %s", namespace)
+
+    def get_or_fetch(self, namespace, key, fetch):
+        """
+        Get a cached result, fetching (and caching) it if it's not cached. If fetching
+        raises a `MissingRecordError`, this is cached and raised again when the result
+        is next requested
+
+        :param namespace: Kind of check the result is for
+        :type namespace: :class:`str`
+        :param key: Hashable key identifying the result within the namespace
+        :param fetch: Function that makes the check
+        :type fetch: :class:`function`
+        :return: The result of the check
+        :raises MissingRecordError: If the check is for a record that doesn't exist
+        """
+        is_cached, value = self.get(namespace, key)
+        if not is_cached:
+            try:
+                value = fetch()
+            except MissingRecordError as e:
+                value = MissingRecord(str(e))
+            self.store(namespace, key, value)
+
+        if isinstance(value, MissingRecord):
+            raise MissingRecordError(value.message)
+        return value
+
+    def get_many_or_fetch(self, namespace, keys, fetch_many):
+        """
+        Get the cached results of many checks of the same kind, fetching the results
+        that aren't cached using a single call to `fetch_many()` (so they can be made
+        using one query to ICAT)
+
+        :param namespace: Kind of check the results are for
+        :type namespace: :class:`str`
+        :param keys: Hashable keys identifying the results within the namespace
+        :type keys: :class:`list`
+        :param fetch_many: Function that makes the checks for a list of keys, returning
+            a dictionary containing the result of each one (a `MissingRecord` for a
+            record that doesn't exist)
+        :type fetch_many: :class:`function`
+        :return: Dictionary mapping each key to its result
+        """
+        results = {}
+        uncached_keys = []
+        for key in dict.fromkeys(keys):
+            is_cached, value = self.get(namespace, key)
+            if is_cached:
+                results[key] = value
+            else:
+                uncached_keys.append(key)
+
+        if uncached_keys:
+            fetched_results = fetch_many(uncached_keys)
+            for key in uncached_keys:
+                self.store(namespace, key, fetched_results[key])
+                results[key] = fetched_results[key]
+
+        return results
+
+    def get_stats(self):
+        with self._lock:
+            namespaces = set(self.hits) | set(self.misses)
+            return {
+                "entries": len(self._cache),
+                "size": self._cache.currsize,
+                "max_size": self._cache.maxsize,
+                "namespaces": {
+                    namespace: {
+                        "hits": self.hits[namespace],
+                        "misses": self.misses[namespace],
+                        "hit_rate": self.hits[namespace] / (self.hits[namespace] + self.misses[namespace]),
+                    }
+                    for namespace in sorted(namespaces)
+                },
+            }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+reader_config = Config.config.datagateway_api.use_reader_for_performance
+# The cache is only used when the reader performance queries are configured
+permission_cache = (
+    PermissionCache(reader_config.maxsize, reader_config.ttl, reader_config.max_bytes)
+    if reader_config is not None
+    else None
+)
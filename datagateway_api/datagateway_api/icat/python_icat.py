@@ -5,10 +5,14 @@ from icat.exception import ICATError, ICATSessionError
 from datagateway_api.common.constants import Constants
 from datagateway_api.common.exceptions import AuthenticationError, PythonICATError
 from datagateway_api.common.helpers import queries_records
+from datagateway_api.datagateway_api.icat.client_lease import client_lease_manager
 from datagateway_api.datagateway_api.icat.helpers import (
     create_entities,
+    create_entity_batch,
+    delete_entities,
+    delete_entities_with_filters,
     delete_entity_by_id,
-    get_cached_client,
+    get_batch_by_ids,
     get_count_with_filters,
     get_entity_by_id,
     get_entity_with_filters,
@@ -17,9 +21,11 @@ from datagateway_api.datagateway_api.icat.helpers import (
     logout_icat_client,
     refresh_client_session,
     requires_session_id,
+    stream_entity_with_filters,
     update_entities,
     update_entity_by_id,
 )
+from datagateway_api.datagateway_api.icat.response_cache import caches_count, caches_response
 
 log = logging.getLogger()
 
@@ -38,13 +44,13 @@ class PythonICAT:
         log.info("Pinging ICAT to ensure API is alive and well")
 
         client_pool = kwargs.get("client_pool")
-        client = get_cached_client(None, client_pool)
 
-        try:
-            entity_names = client.getEntityNames()
-            log.debug("Entity names on ping: %s", entity_names)
-        except ICATError as e:
-            raise PythonICATError(e) from e
+        with client_lease_manager.lease(client_pool) as client:
+            try:
+                entity_names = client.getEntityNames()
+                log.debug("Entity names on ping: %s", entity_names)
+            except ICATError as e:
+                raise PythonICATError(e) from e
 
         return Constants.PING_OK_RESPONSE
 
@@ -59,25 +65,21 @@ class PythonICAT:
         log.info("Logging in to get session ID")
         client_pool = kwargs.get("client_pool")
 
-        # There is no session ID required for this endpoint, a client object will be
-        # fetched from cache with a blank `sessionId` attribute
-        client = get_cached_client(None, client_pool)
-
         # Syntax for Python ICAT
         login_details = {
             "username": credentials["username"],
             "password": credentials["password"],
         }
-        try:
-            session_id = client.login(credentials["mechanism"], login_details)
-            # Flushing client's session ID so the session ID returned in this request
-            # won't be logged out next time `client.login()` is used in this function.
-            # `login()` calls `self.logout()` if `sessionId` is set
-            client.sessionId = None
 
-            return session_id
-        except ICATSessionError as e:
-            raise AuthenticationError("User credentials are incorrect") from e
+        # There is no session ID required for this endpoint, a client object will be
+        # leased with a blank `sessionId` attribute. The session ID is flushed when the
+        # lease ends so it won't be logged out the next time `client.login()` is used on
+        # this client (`login()` calls `self.logout()` if `sessionId` is set)
+        with client_lease_manager.lease(client_pool) as client:
+            try:
+                return client.login(credentials["mechanism"], login_details)
+            except ICATSessionError as e:
+                raise AuthenticationError("User credentials are incorrect") from e
 
     @requires_session_id
     def get_session_details(self, session_id, **kwargs):
@@ -110,6 +112,7 @@ class PythonICAT:
         return logout_icat_client(kwargs.get("client"))
 
     @requires_session_id
+    @caches_response
     @queries_records
     def get_with_filters(self, session_id, entity_type, filters, **kwargs):
         """
@@ -122,6 +125,20 @@ class PythonICAT:
         """
         return get_entity_with_filters(kwargs.get("client"), entity_type, filters)
 
+    @requires_session_id
+    @queries_records
+    def stream_with_filters(self, session_id, entity_type, filters, **kwargs):
+        """
+        Given a list of filters supplied in JSON format, yields chunks of entities that
+        match the filters for the given entity type. The client used for the request is
+        leased until the generator is exhausted or closed.
+        :param session_id: The session ID of the requesting user.
+        :param entity_type: The type of entity.
+        :param filters: The list of filters to be applied.
+        :return: A generator of lists of the matching entities in JSON format.
+        """
+        yield from stream_entity_with_filters(kwargs.get("client"), entity_type, filters)
+
     @requires_session_id
     @queries_records
     def create(self, session_id, entity_type, data, **kwargs):
@@ -135,6 +152,19 @@ class PythonICAT:
         """
         return create_entities(kwargs.get("client"), entity_type, data)
 
+    @requires_session_id
+    @queries_records
+    def create_batch(self, session_id, entity_type, data, **kwargs):
+        """
+        Create a batch of entities using a single call to ICAT, without reading them
+        back. Each entity must not contain its ID.
+        :param session_id: The session ID of the requesting user.
+        :param entity_type: The type of entity.
+        :param data: The entities to be created.
+        :return: The IDs of the created entities.
+        """
+        return create_entity_batch(kwargs.get("client"), entity_type, data)
+
     @requires_session_id
     @queries_records
     def update(self, session_id, entity_type, data, **kwargs):
@@ -149,6 +179,7 @@ class PythonICAT:
         return update_entities(kwargs.get("client"), entity_type, data)
 
     @requires_session_id
+    @caches_response
     @queries_records
     def get_one_with_filters(self, session_id, entity_type, filters, **kwargs):
         """
@@ -161,6 +192,7 @@ class PythonICAT:
         return get_first_result_with_filters(kwargs.get("client"), entity_type, filters)
 
     @requires_session_id
+    @caches_count
     @queries_records
     def count_with_filters(self, session_id, entity_type, filters, **kwargs):
         """
@@ -174,6 +206,7 @@ class PythonICAT:
         return get_count_with_filters(kwargs.get("client"), entity_type, filters)
 
     @requires_session_id
+    @caches_response
     @queries_records
     def get_with_id(self, session_id, entity_type, id_, **kwargs):
         """
@@ -185,6 +218,42 @@ class PythonICAT:
         """
         return get_entity_by_id(kwargs.get("client"), entity_type, id_, True)
 
+    @requires_session_id
+    @queries_records
+    def get_with_ids(self, session_id, entity_type, ids, **kwargs):
+        """
+        Gets the entities matching the given IDs for the given entity type.
+        :param session_id: The session ID of the requesting user.
+        :param entity_type: The type of entity.
+        :param ids: The IDs of the records to find.
+        :return: The entities retrieved (in the order of `ids`) and the IDs not found.
+        """
+        return get_batch_by_ids(kwargs.get("client"), entity_type, ids)
+
+    @requires_session_id
+    @queries_records
+    def delete_with_ids(self, session_id, entity_type, ids, **kwargs):
+        """
+        Deletes the rows matching the given IDs for the given entity type.
+        :param session_id: The session ID of the requesting user.
+        :param entity_type: The type of entity.
+        :param ids: The IDs of the records to delete.
+        :return: The result of deleting each chunk of IDs.
+        """
+        return delete_entities(kwargs.get("client"), entity_type, ids)
+
+    @requires_session_id
+    @queries_records
+    def delete_with_filters(self, session_id, entity_type, filters, **kwargs):
+        """
+        Deletes the rows matching the given where filters for the given entity type.
+        :param session_id: The session ID of the requesting user.
+        :param entity_type: The type of entity.
+        :param filters: The where filters selecting the records to delete.
+        :return: The result of deleting each chunk of matching records.
+        """
+        return delete_entities_with_filters(kwargs.get("client"), entity_type, filters)
+
     @requires_session_id
     @queries_records
     def delete_with_id(self, session_id, entity_type, id_, **kwargs):
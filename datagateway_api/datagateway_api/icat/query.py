@@ -1,4 +1,5 @@
 from datetime import datetime
+from itertools import islice
 import logging
 
 from icat.entity import Entity, EntityList
@@ -6,8 +7,9 @@ from icat.exception import ICATInternalError, ICATValidationError
 from icat.query import Query
 
 from datagateway_api.common.date_handler import DateHandler
-from datagateway_api.common.exceptions import PythonICATError
+from datagateway_api.common.exceptions import BadRequestError, PythonICATError
 from datagateway_api.common.helpers import map_distinct_attributes_to_results
+from datagateway_api.common.icat_properties import get_icat_max_entities
 
 log = logging.getLogger()
 
@@ -53,12 +55,32 @@ class ICATQuery:
             )
             # Initialising flag for distinct filter on count endpoints
             self.query.manual_count = False
+            # Initialising flag for skip filters given without a limit filter
+            self.query.open_ended_limit = False
+            # Order of the query's order filters, kept per query (rather than on
+            # `PythonICATOrderFilter`) so concurrent requests can't affect each other
+            self.query.result_order = []
         except ValueError as e:
             raise PythonICATError(
                 "An issue has occurred while creating a Python ICAT Query object, suggesting an invalid argument",
             ) from e
 
-    def execute_query(self, client, return_json_formattable=False):
+    @classmethod
+    def from_query(cls, query):
+        """
+        Wrap an existing Python ICAT Query object (e.g. one created from a cached query
+        plan) so it can be executed like a query created by `ICATQuery()`
+
+        :param query: Query object with the `manual_count`, `open_ended_limit` and
+            `result_order` attributes set
+        :type query: :class:`icat.query.Query`
+        :return: :class:`ICATQuery` containing `query`
+        """
+        icat_query = cls.__new__(cls)
+        icat_query.query = query
+        return icat_query
+
+    def execute_query(self, client, return_json_formattable=False, max_results=None):
         """
         Execute the ICAT Query object and return in the format specified by the
         return_json_formattable flag
@@ -71,13 +93,22 @@ class ICATQuery:
             whether to leave the data in a Python ICAT format (i.e. if it's going to be
             manipulated at some point)
         :type return_json_formattable_data: :class:`bool`
+        :param max_results: If given, queries that could return more than ICAT's
+            `maxEntities` are executed in pages (see `execute_paged_search()`), returning
+            up to this number of results
+        :type max_results: :class:`int`
         :return: Data (of type list) from the executed query
         :raises PythonICATError: If an error occurs during query execution
         """
 
         try:
-            log.debug("Executing ICAT query: %s", self.query)
-            query_result = client.search(self.query)
+            if self.query.manual_count:
+                return [self.execute_distinct_count(client)]
+            if max_results is not None and self.is_paging_required():
+                query_result = self.execute_paged_search(client, max_results)
+            else:
+                log.debug("Executing ICAT query: %s", self.query)
+                query_result = client.search(self.query)
         except (ICATValidationError, ICATInternalError) as e:
             raise PythonICATError(e) from e
 
@@ -91,9 +122,8 @@ class ICATQuery:
                 count_query = True
                 log.debug("This ICATQuery is used for COUNT purposes")
 
-        distinct_query = False
-        if self.query.aggregate == "DISTINCT" and not count_query and not self.query.manual_count:
-            distinct_query = True
+        distinct_attributes = None
+        if self.query.aggregate == "DISTINCT" and not count_query:
             log.info("Extracting the distinct fields from query's conditions")
             # Check query's conditions for the ones created by the distinct filter
             distinct_attributes = self.get_distinct_attributes()
@@ -102,36 +132,212 @@ class ICATQuery:
             log.info("Query results will be returned in a JSON format")
             data = []
 
-            if self.query.manual_count:
-                # Manually count the number of results
-                data.append(len(query_result))
-                return data
-
             for result in query_result:
-                if distinct_query:
-                    # When multiple attributes are given in a distinct filter, Python
-                    # ICAT returns the results in a nested list. This doesn't happen
-                    # when a single attribute is given, so the result is encased in a
-                    # list as `map_distinct_attributes_to_results()` assumes a list as
-                    # input
-                    if not isinstance(result, tuple):
-                        result = [result]
-
-                    # Map distinct attributes and result
-                    data.append(
-                        map_distinct_attributes_to_results(distinct_attributes, result),
-                    )
-                elif not count_query:
-                    dict_result = self.entity_to_dict(result, flat_query_includes)
-                    data.append(dict_result)
-                else:
+                if count_query:
                     data.append(result)
+                else:
+                    data.append(self.format_result(result, flat_query_includes, distinct_attributes))
 
             return data
         else:
             log.info("Query results will be returned as ICAT entities")
             return query_result
 
+    def is_paging_required(self):
+        """
+        Determine whether the query could return more results than ICAT's `maxEntities`
+        property allows in a single search. This is the case when the query has no
+        limit, its limit was only set because a skip filter was given (see
+        `PythonICATSkipFilter`) or its limit is larger than `maxEntities`. COUNT queries
+        only ever return a single result so are never paged
+
+        :return: Boolean of whether the query needs to be executed in pages
+        """
+        if self.query.aggregate is not None and "COUNT" in self.query.aggregate:
+            return False
+        if self.query.limit is None or self.query.open_ended_limit:
+            return True
+
+        return self.query.limit[1] > get_icat_max_entities()
+
+    def execute_paged_search(self, client, max_results):
+        """
+        Execute the query as a sequence of searches, each limited to ICAT's
+        `maxEntities` results, merging the results of each page. The ID (or the distinct
+        attributes) is added to the end of the query's order so the pages are stable
+        (see `add_order_tie_breakers()`)
+
+        :param client: ICAT client containing an authenticated user
+        :type client: :class:`icat.client.Client`
+        :param max_results: Maximum number of results that can be returned. If the
+            query has more results than this (and the user hasn't limited the query to
+            this number or fewer), a `BadRequestError` is raised rather than returning
+            incomplete results
+        :type max_results: :class:`int`
+        :return: List of results from all pages of the query
+        :raises BadRequestError: If the query has more than `max_results` results
+        """
+        page_size = get_icat_max_entities()
+        skip, count = self.query.limit or (0, None)
+        if self.query.open_ended_limit:
+            count = None
+        self.add_order_tie_breakers()
+
+        results = []
+        while count is None or len(results) < count:
+            # One more result than the cap is requested so an oversized query is
+            # detected without fetching another page
+            remaining = max_results + 1 - len(results) if count is None else count - len(results)
+            page_limit = min(page_size, remaining)
+            self.query.setLimit((skip + len(results), page_limit))
+            log.debug("Executing page of ICAT query: %s", self.query)
+            page = client.search(self.query)
+            results.extend(page)
+
+            if len(results) > max_results:
+                raise BadRequestError(
+                    f"Query matches more than {max_results} results, use limit and skip filters or stream the"
+                    " results instead",
+                )
+            if len(page) < page_limit:
+                break
+
+        log.info("Paged ICAT query returned %d results", len(results))
+        return results
+
+    def add_order_tie_breakers(self):
+        """
+        Append the ID (or the distinct attributes) to the query's order, ascending, if
+        they're not already part of it. Without a unique tie-breaker, ICAT can return
+        results with equal values of the ordered fields in a different order each time
+        the query is executed, so results could be repeated or skipped between pages
+        """
+        tie_breakers = [(field, "ASC") for field in self.query.attributes or ["id"] if field not in self.query.order]
+        if not tie_breakers:
+            return
+
+        # The order filters' order is kept in `result_order` as Python ICAT overwrites
+        # the order each time it's set (see `PythonICATOrderFilter`)
+        order = list(getattr(self.query, "result_order", [])) + tie_breakers
+        log.debug("Adding tie-breakers to order of ICAT query: %s", tie_breakers)
+        self.query.setOrder(order)
+
+    def execute_distinct_count(self, client):
+        """
+        Count the results of a query with a distinct filter applied on a count endpoint
+        (see `PythonICATDistinctFieldFilter`), without fetching all of the distinct
+        results at once
+
+        A single distinct attribute is counted by ICAT using `COUNT(DISTINCT ...)`, with
+        any limit/skip applied to the count afterwards. JPQL can't count distinct tuples
+        of multiple attributes, so those results are fetched in chunks of ICAT's
+        `maxEntities` and counted as they arrive, so only one chunk is held in memory
+        and the query never exceeds `maxEntities`
+
+        :param client: ICAT client containing an authenticated user
+        :type client: :class:`icat.client.Client`
+        :return: The number of distinct results of the query
+        """
+        skip, count = self.query.limit or (0, None)
+        if self.query.open_ended_limit:
+            count = None
+        self.query.setLimit(None)
+
+        if len(self.query.attributes) == 1:
+            self.query.setAggregate("COUNT:DISTINCT")
+            log.debug("Executing distinct count ICAT query: %s", self.query)
+            distinct_count = max(client.search(self.query)[0] - skip, 0)
+            return distinct_count if count is None else min(distinct_count, count)
+
+        # Chunks are fetched with separate queries, so they're ordered to keep them
+        # stable
+        self.add_order_tie_breakers()
+        log.debug("Counting results of ICAT query in chunks: %s", self.query)
+        query_results = client.searchChunked(
+            self.query,
+            skip=skip,
+            count=count,
+            chunksize=get_icat_max_entities(),
+        )
+        return sum(1 for _ in query_results)
+
+    def iter_query_chunks(self, client, chunk_size):
+        """
+        Execute the ICAT Query object in chunks of `chunk_size` results (using Python
+        ICAT's `searchChunked()`), yielding each chunk in a JSON format as soon as it's
+        been fetched. This means the full result set is never held in memory at once
+
+        Any limit/skip applied to the query is respected. Each chunk is fetched with a
+        separate query, so the ID (or the distinct attributes) is added to the end of the
+        query's order to keep the chunks stable (see `add_order_tie_breakers()`)
+
+        :param client: ICAT client containing an authenticated user
+        :type client: :class:`icat.client.Client`
+        :param chunk_size: Number of results fetched from ICAT in each search call
+        :type chunk_size: :class:`int`
+        :return: Generator yielding lists of results ready to be converted to JSON
+        :raises PythonICATError: If an error occurs during query execution
+        """
+        skip, count = self.query.limit or (0, None)
+        if self.query.open_ended_limit:
+            count = None
+        # `searchChunked()` adds its own LIMIT clause to the query
+        self.query.setLimit(None)
+        self.add_order_tie_breakers()
+
+        flat_query_includes = self.flatten_query_included_fields(self.query.includes)
+        distinct_attributes = None
+        if self.query.aggregate == "DISTINCT":
+            distinct_attributes = self.get_distinct_attributes()
+
+        log.debug("Executing ICAT query in chunks of %d: %s", chunk_size, self.query)
+        query_results = client.searchChunked(
+            self.query,
+            skip=skip,
+            count=count,
+            chunksize=chunk_size,
+        )
+        try:
+            while True:
+                chunk = [
+                    self.format_result(result, flat_query_includes, distinct_attributes)
+                    for result in islice(query_results, chunk_size)
+                ]
+                if not chunk:
+                    return
+                yield chunk
+        except (ICATValidationError, ICATInternalError) as e:
+            raise PythonICATError(e) from e
+
+    def format_result(self, result, flat_query_includes, distinct_attributes=None):
+        """
+        Convert a single (non-count) result of the query into a JSON formattable
+        dictionary
+
+        :param result: A result from the executed query
+        :type result: :class:`icat.entity.Entity`, or a :class:`tuple` (or single value)
+            of attribute values for distinct queries
+        :param flat_query_includes: Flattened list of fields included in the query (see
+            `flatten_query_included_fields()`)
+        :type flat_query_includes: :class:`list`
+        :param distinct_attributes: Attributes of the distinct filter, None if the query
+            isn't a distinct query
+        :type distinct_attributes: :class:`list`
+        :return: Dictionary of the result, ready to be serialised to JSON
+        """
+        if distinct_attributes is not None:
+            # When multiple attributes are given in a distinct filter, Python ICAT
+            # returns the results in a nested list. This doesn't happen when a single
+            # attribute is given, so the result is encased in a list as
+            # `map_distinct_attributes_to_results()` assumes a list as input
+            if not isinstance(result, tuple):
+                result = [result]
+
+            # Map distinct attributes and result
+            return map_distinct_attributes_to_results(distinct_attributes, result)
+
+        return self.entity_to_dict(result, flat_query_includes)
+
     def get_distinct_attributes(self):
         return self.query.attributes
 
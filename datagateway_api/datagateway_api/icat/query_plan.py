@@ -0,0 +1,306 @@
+import logging
+import threading
+
+from cachetools import LRUCache
+
+from datagateway_api.common.config import Config
+from datagateway_api.common.filter_order_handler import FilterOrderHandler
+from datagateway_api.common.filters import WhereFilter
+from datagateway_api.common.icat_properties import get_icat_max_entities
+from datagateway_api.datagateway_api.icat.filters import (
+    icat_set_limit,
+    PythonICATDistinctFieldFilter,
+    PythonICATIncludeFilter,
+    PythonICATLimitFilter,
+    PythonICATOrderFilter,
+    PythonICATSkipFilter,
+    PythonICATWhereFilter,
+)
+from datagateway_api.datagateway_api.icat.query import ICATQuery
+
+log = logging.getLogger()
+
+
+class PythonICATParameterFilter(WhereFilter):
+    """
+    Where filter used when compiling a query plan. The right hand side of the condition
+    is a placeholder token which is replaced with the request's value when the plan is
+    bound to a request (see `QueryPlan.bind()`)
+    """
+
+    def __init__(self, field, token):
+        super().__init__(field, token, "eq")
+        self.field = field
+
+    def apply_filter(self, query):
+        query.addConditions({self.field: self.value})
+
+
+class QueryPlan:
+    """
+    A Python ICAT Query compiled from a request's filters, where the values of the
+    where filters and limit/skip are left as parameters. The query's joins, conditions,
+    order, includes and distinct attributes have already been validated and applied, so
+    binding the plan to a request only copies the query and fills in the parameters
+    """
+
+    def __init__(self, query, parameter_positions):
+        """
+        :param query: Compiled query, with placeholder tokens in its conditions and no
+            limit
+        :type query: :class:`icat.query.Query`
+        :param parameter_positions: Location (condition attribute and index) of each
+            placeholder token in the query's conditions, in the order of the plan's
+            parameters
+        :type parameter_positions: :class:`list` of :class:`tuple`
+        """
+        self.query = query
+        self.parameter_positions = parameter_positions
+
+    @classmethod
+    def from_filters(cls, client, entity_type, filters, aggregate=None):
+        """
+        Compile a plan from a request's filters. Where filters are replaced with
+        placeholder conditions and limit/skip filters are left out of the plan
+
+        :param client: ICAT client containing an authenticated user
+        :type client: :class:`icat.client.Client`
+        :param entity_type: The type of entity requested to manipulate data with
+        :type entity_type: :class:`str`
+        :param filters: The list of filters to be applied to the request, with each
+            where filter replaced by its `(field, token)` pair
+        :type filters: List of specific implementations :class:`QueryFilter` or
+            :class:`tuple`
+        :param aggregate: Name of the aggregate function to apply to the query
+        :type aggregate: :class:`str`
+        :return: The compiled :class:`QueryPlan`
+        """
+        plan_filters = []
+        tokens = []
+        for query_filter in filters:
+            if isinstance(query_filter, tuple):
+                field, token = query_filter
+                plan_filters.append(PythonICATParameterFilter(field, token))
+                tokens.append(token)
+            elif type(query_filter) not in (PythonICATLimitFilter, PythonICATSkipFilter):
+                plan_filters.append(query_filter)
+
+        query = ICATQuery(client, entity_type, aggregate=aggregate)
+        filter_handler = FilterOrderHandler()
+        filter_handler.manage_icat_filters(plan_filters, query.query)
+
+        token_positions = {}
+        for attr, conditions in query.query.conditions.items():
+            for condition_pointer, condition in enumerate(conditions):
+                for token in tokens:
+                    if token in condition:
+                        token_positions[token] = (attr, condition_pointer)
+
+        return cls(query.query, [(*token_positions[token], token) for token in tokens])
+
+    def bind(self, client, parameters, limit):
+        """
+        Create a query from the plan using the values of a request
+
+        :param client: ICAT client containing an authenticated user
+        :type client: :class:`icat.client.Client`
+        :param parameters: Right hand side of each of the request's where conditions, in
+            the order of the plan's parameters
+        :type parameters: :class:`list` of :class:`str`
+        :param limit: Tuple of the skip and limit values of the request, and whether the
+            limit was only set because of a skip filter. None if the request has neither
+        :type limit: :class:`tuple`
+        :return: :class:`ICATQuery` ready to be executed
+        """
+        query = self.query.copy()
+        query.client = client
+        query.manual_count = self.query.manual_count
+        query.result_order = list(self.query.result_order)
+        query.open_ended_limit = False
+
+        for (attr, condition_pointer, token), value in zip(self.parameter_positions, parameters, strict=True):
+            # Python ICAT escapes % signs in conditions as they're formatted with the
+            # attribute's alias when the query is converted to a string
+            condition = query.conditions[attr][condition_pointer]
+            query.conditions[attr][condition_pointer] = condition.replace(token, value.replace("%", "%%"))
+
+        if limit is not None:
+            skip, count, open_ended_limit = limit
+            icat_set_limit(query, skip, count)
+            query.open_ended_limit = open_ended_limit
+
+        return ICATQuery.from_query(query)
+
+
+class QueryPlanCache:
+    """
+    Bounded LRU cache of query plans, keyed by the entity, aggregate and the structure
+    of a request's filters (i.e. excluding the values given to where, skip and limit
+    filters)
+
+    DataGateway's frontends send the same few filter structures repeatedly with
+    different values (e.g. a table being paged through or filtered on a different
+    value). Without the cache, each request validates and applies every filter to a
+    new Python ICAT Query, which involves resolving each attribute path against the
+    entity schema. With it, a request whose filter structure has been seen before only
+    copies the cached query and fills in its own values.
+
+    Requests containing filters whose effect on the query depends on their values (e.g.
+    a cursor filter) aren't cached and build their query in full.
+    """
+
+    cacheable_filter_types = (
+        PythonICATWhereFilter,
+        PythonICATOrderFilter,
+        PythonICATSkipFilter,
+        PythonICATLimitFilter,
+        PythonICATIncludeFilter,
+        PythonICATDistinctFieldFilter,
+    )
+
+    def __init__(self, maxsize):
+        """
+        :param maxsize: Maximum number of plans kept in the cache, 0 disables the cache
+        :type maxsize: :class:`int`
+        """
+        self.maxsize = maxsize
+        self._cache = LRUCache(maxsize=maxsize) if maxsize > 0 else None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_query(self, client, entity_type, filters, aggregate=None):
+        """
+        Get a query for a request, using a cached plan if the request's filter structure
+        has been seen before
+
+        :param client: ICAT client containing an authenticated user
+        :type client: :class:`icat.client.Client`
+        :param entity_type: The type of entity requested to manipulate data with
+        :type entity_type: :class:`str`
+        :param filters: The list of filters to be applied to the request
+        :type filters: List of specific implementations :class:`QueryFilter`
+        :param aggregate: Name of the aggregate function to apply to the query
+        :type aggregate: :class:`str`
+        :return: :class:`ICATQuery` with the request's filters applied
+        """
+        if not self.is_cacheable(filters):
+            log.debug("Request's filters can't be cached, building query in full")
+            return self.build_query(client, entity_type, filters, aggregate)
+
+        plan_key, plan_filters, parameters, limit = self.normalise_filters(entity_type, filters, aggregate)
+
+        with self._lock:
+            plan = self._cache.get(plan_key)
+            if plan is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if plan is None:
+            log.debug("Query plan not cached, compiling plan for %s", entity_type)
+            plan = QueryPlan.from_filters(client, entity_type, plan_filters, aggregate)
+            with self._lock:
+                self._cache[plan_key] = plan
+
+        return plan.bind(client, parameters, limit)
+
+    def is_cacheable(self, filters):
+        if self._cache is None:
+            return False
+
+        for query_filter in filters:
+            if type(query_filter) not in self.cacheable_filter_types:
+                return False
+            # Invalid (e.g. non-string) fields can't be part of the plan's cache key, the
+            # query is built in full so the usual error is raised
+            if type(query_filter) is PythonICATDistinctFieldFilter and not all(
+                isinstance(field, str) for field in query_filter.fields
+            ):
+                return False
+
+        return True
+
+    @staticmethod
+    def build_query(client, entity_type, filters, aggregate=None):
+        query = ICATQuery(client, entity_type, aggregate=aggregate)
+        filter_handler = FilterOrderHandler()
+        filter_handler.manage_icat_filters(filters, query.query)
+        return query
+
+    @staticmethod
+    def normalise_filters(entity_type, filters, aggregate=None):
+        """
+        Split a request's filters into the structure used as the plan's cache key and
+        the values that are bound to the plan
+
+        :param entity_type: The type of entity requested to manipulate data with
+        :type entity_type: :class:`str`
+        :param filters: The list of (cacheable) filters to be applied to the request
+        :type filters: List of specific implementations :class:`QueryFilter`
+        :param aggregate: Name of the aggregate function to apply to the query
+        :type aggregate: :class:`str`
+        :return: Tuple of the plan's cache key, the filters to compile a plan from
+            (with where filters replaced by `(field, token)` pairs), the where
+            conditions' values and the limit (see `QueryPlan.bind()`)
+        :raises FilterError: If a where filter's operation isn't valid
+        """
+        plan_key = [entity_type, aggregate]
+        plan_filters = []
+        parameters = []
+        skip = None
+        limit = None
+
+        # Filters are sorted in the same way as `FilterOrderHandler`, so the conditions
+        # of the plan are added in the same order as they would be without the cache
+        for query_filter in sorted(filters, key=lambda x: x.precedence):
+            filter_type = type(query_filter)
+            if filter_type is PythonICATWhereFilter:
+                # `create_filter()` transforms the field for case insensitive operations
+                # (e.g. to `UPPER(name)`), which is part of the plan's structure
+                ((field, value),) = query_filter.create_filter().items()
+                token = f"__query_plan_parameter_{len(parameters)}__"
+                plan_key.append(("where", field))
+                plan_filters.append((field, token))
+                parameters.append(value)
+            elif filter_type is PythonICATOrderFilter:
+                plan_key.append(("order", query_filter.field, query_filter.direction))
+                plan_filters.append(query_filter)
+            elif filter_type is PythonICATIncludeFilter:
+                plan_key.append(("include", tuple(query_filter.included_filters)))
+                plan_filters.append(query_filter)
+            elif filter_type is PythonICATDistinctFieldFilter:
+                plan_key.append(("distinct", tuple(query_filter.fields)))
+                plan_filters.append(query_filter)
+            elif filter_type is PythonICATSkipFilter:
+                skip = query_filter
+            elif filter_type is PythonICATLimitFilter:
+                limit = query_filter
+
+        if limit is not None:
+            limit_values = (skip.skip_value if skip else limit.skip_value, limit.limit_value, False)
+        elif skip is not None:
+            limit_values = (skip.skip_value, get_icat_max_entities(skip.filter_use), True)
+        else:
+            limit_values = None
+
+        return tuple(plan_key), plan_filters, parameters, limit_values
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "size": len(self._cache) if self._cache is not None else 0,
+                "max_size": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def clear(self):
+        with self._lock:
+            if self._cache is not None:
+                self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+query_plan_cache = QueryPlanCache(Config.config.datagateway_api.query_plan_cache_size)
@@ -0,0 +1,207 @@
+from contextlib import contextmanager
+import logging
+import queue
+import threading
+
+from icat.exception import ICATSessionError
+
+from datagateway_api.common.config import Config
+from datagateway_api.common.exceptions import PythonICATError, ServiceUnavailableError
+from datagateway_api.datagateway_api.icat.icat_client_pool import ICATClient
+
+log = logging.getLogger()
+
+
+class ReaderClientPool:
+    """
+    Pool of ICAT clients logged in as the reader account, used by the reader
+    performance queries (see `ReaderQueryHandler`)
+
+    Each reader query checks a client out of the pool for its duration, so up to
+    `size` reader queries can be sent to ICAT at once rather than being serialised
+    through a single client. Clients are created as they're needed, up to `size`.
+
+    Every client in the pool uses the same reader session. Logging in is single-flight:
+    when the session expires, the first thread to notice logs in again and any other
+    thread that noticed the same expired session waits for, and then uses, the new
+    session rather than logging in itself. A background thread refreshes the session
+    every `refresh_interval` seconds so it shouldn't expire while the API is in use.
+    """
+
+    def __init__(self, size, refresh_interval, checkout_timeout):
+        """
+        :param size: Maximum number of reader clients
+        :type size: :class:`int`
+        :param refresh_interval: Number of seconds between background refreshes of the
+            reader session
+        :type refresh_interval: :class:`float`
+        :param checkout_timeout: Number of seconds to wait for a client to become
+            available
+        :type checkout_timeout: :class:`float`
+        """
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self.checkout_timeout = checkout_timeout
+        self.session_id = None
+        self.total_logins = 0
+        self._available_checkouts = threading.BoundedSemaphore(size)
+        self._clients = queue.LifoQueue()
+        self._login_lock = threading.Lock()
+        self._login_client = None
+        self._refresh_thread = None
+        self._stop_event = threading.Event()
+
+    @contextmanager
+    def checkout(self):
+        """
+        Context manager that checks a reader client out of the pool for the duration of
+        the `with` block
+
+        :return: ICAT client with the reader session attached
+        :raises ServiceUnavailableError: If no client becomes available before the
+            checkout timeout
+        :raises PythonICATError: If the reader account's credentials aren't valid
+        """
+        if not self._available_checkouts.acquire(timeout=self.checkout_timeout):
+            log.warning("Timed out waiting %s seconds for a reader client", self.checkout_timeout)
+            raise ServiceUnavailableError("Timed out waiting for an available reader client")
+
+        client = None
+        try:
+            try:
+                client = self._clients.get_nowait()
+            except queue.Empty:
+                log.info("Creating reader client")
+                client = ICATClient("datagateway_api")
+
+            client.sessionId = self.get_session_id()
+            yield client
+        finally:
+            if client is not None:
+                self._clients.put(client)
+            self._available_checkouts.release()
+
+    def run(self, function):
+        """
+        Call `function` with a reader client checked out of the pool. If the reader
+        session has expired, the reader account logs in again (once, however many
+        threads find the session expired) and `function` is called again
+
+        :param function: Function making ICAT calls using the reader client passed to it
+        :type function: :class:`function`
+        :return: The result of `function`
+        """
+        with self.checkout() as client:
+            try:
+                return function(client)
+            except ICATSessionError:
+                log.info("Reader session expired, logging in again")
+                client.sessionId = self.login(expired_session_id=client.sessionId)
+                return function(client)
+
+    def get_session_id(self):
+        """
+        :return: The reader's session ID, logging in if there isn't a session yet
+        :raises PythonICATError: If the reader account's credentials aren't valid
+        """
+        return self.session_id or self.login(expired_session_id=None)
+
+    def login(self, expired_session_id):
+        """
+        Log in as the reader account, unless the session has already been replaced by
+        another thread
+
+        :param expired_session_id: The reader session that's expired (or None if there
+            isn't one), used to tell whether another thread has already logged in again
+        :type expired_session_id: :class:`str`
+        :return: The reader's session ID
+        :raises PythonICATError: If the reader account's credentials aren't valid
+        """
+        with self._login_lock:
+            if self.session_id is not None and self.session_id != expired_session_id:
+                return self.session_id
+
+            reader_config = Config.config.datagateway_api.use_reader_for_performance
+            if self._login_client is None:
+                self._login_client = ICATClient("datagateway_api")
+            # Logging in would otherwise log out the previous session, which other
+            # clients may still be using
+            self._login_client.sessionId = None
+            try:
+                self.session_id = self._login_client.login(
+                    auth=reader_config.reader_mechanism,
+                    credentials={
+                        "username": reader_config.reader_username,
+                        "password": reader_config.reader_password.get_secret_value(),
+                    },
+                )
+            except ICATSessionError as e:
+                log.error("User credentials for reader account aren't valid")
+                raise PythonICATError("Internal error with reader account configuration") from e
+
+            self.total_logins += 1
+            log.info("Logged in as reader account")
+            self._start_background_refresh()
+            return self.session_id
+
+    def refresh(self):
+        """
+        Refresh the reader session, logging in again if it's already expired
+        """
+        with self._login_lock:
+            session_id = self.session_id
+            if session_id is None:
+                return
+
+            try:
+                self._login_client.sessionId = session_id
+                self._login_client.refresh()
+                log.debug("Refreshed reader session")
+                return
+            except ICATSessionError:
+                log.info("Reader session expired before it was refreshed")
+
+        self.login(expired_session_id=session_id)
+
+    def _start_background_refresh(self):
+        if self._refresh_thread is not None or self.refresh_interval <= 0:
+            return
+
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop,
+            name="reader-session-refresh",
+            daemon=True,
+        )
+        self._refresh_thread.start()
+
+    def _refresh_loop(self):
+        while not self._stop_event.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # Requests will log in again if the session does expire
+                log.warning("Unable to refresh reader session: %s", e)
+
+    def get_stats(self):
+        """
+        :return: Dictionary containing the number of reader clients that are idle, the
+            maximum number of reader clients and the number of logins since startup
+        """
+        return {
+            "idle_clients": self._clients.qsize(),
+            "max_clients": self.size,
+            "total_logins": self.total_logins,
+        }
+
+
+reader_config = Config.config.datagateway_api.use_reader_for_performance
+# The pool is only used when the reader performance queries are configured
+reader_client_pool = (
+    ReaderClientPool(
+        reader_config.pool_size,
+        reader_config.refresh_interval,
+        Config.config.datagateway_api.client_lease_timeout,
+    )
+    if reader_config is not None
+    else None
+)
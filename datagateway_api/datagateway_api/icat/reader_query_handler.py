@@ -2,14 +2,14 @@ from datetime import datetime, timezone
 import logging
 from typing import List, Optional
 
-from cachetools.func import ttl_cache
-from icat.exception import ICATSessionError
-
 from datagateway_api.common.config import Config
-from datagateway_api.common.exceptions import MissingRecordError, PythonICATError
+from datagateway_api.common.exceptions import MissingRecordError
 from datagateway_api.common.filters import QueryFilter
+from datagateway_api.common.icat_properties import get_icat_max_entities
 from datagateway_api.datagateway_api.icat.filters import PythonICATWhereFilter
-from datagateway_api.datagateway_api.icat.icat_client_pool import ICATClient
+from datagateway_api.datagateway_api.icat.permission_cache import MissingRecord, permission_cache
+from datagateway_api.datagateway_api.icat.reader_client_pool import reader_client_pool
+from datagateway_api.datagateway_api.icat.session_cache import session_metadata_cache
 
 log = logging.getLogger()
 
@@ -28,28 +28,35 @@ class ReaderQueryHandler:
     On a production instance where this functionality is needed, the reader account will
     have been setup with appropriate ICAT rules to view the entities.
 
+    The results of the permission checks (including negative ones) are cached in
+    `permission_cache`, which is shared by every reader performance query. Queries are
+    executed as the reader using clients checked out of `reader_client_pool`.
+
     Example workflow:
-    - User sends request to /datafiles with a WHERE filter of dataset.id = 4
+    - User sends request to /datafiles with a WHERE filter of dataset.id = 4 (or
+      dataset.id in [4, 5])
     - Query is determined as eligble
-    - Dataset query is sent to ICAT with a WHERE filter of id = 4
-    - If the appropriate dataset is returned, the user's original query is executed, but
-      as the reader account, not the user's account
-    - If no dataset is found (i.e. the user doesn't have permission is view the dataset)
-      the API responds with a 403
+    - The permission checks are made for every listed dataset, one query per kind of
+      check
+    - If the user can see every listed dataset, the user's original query is executed,
+      but as the reader account, not the user's account
+    - Otherwise, the user's original query is executed as the user
     """
 
-    # Lookup to determine which field to search whether a user has permission to view
-    entity_filter_check = {"Datafile": "dataset.id", "Dataset": "investigation.id"}
-    parent_entity_lookup = {"Datafile": "Dataset", "Dataset": "Investigation"}
-    # Keep a cached reader_client for faster queries. A reader client is created when
-    # the first instance of this class is created and is refreshed when a login attempt
-    # fails (due to an expired session ID)
-    reader_client = None
-    maxsize = 128  # cachetools default value
-    ttl = 600  # seconds, cachetools default value
-    if Config.config.datagateway_api.use_reader_for_performance is not None:
-        maxsize = Config.config.datagateway_api.use_reader_for_performance.maxsize
-        ttl = Config.config.datagateway_api.use_reader_for_performance.ttl
+    # Parent entity types whose visibility can be checked directly, any other parent
+    # entity is resolved up to one of these using the configured `parent_relations`
+    checked_entity_types = ("Dataset", "Investigation")
+    # Resolved parent chains, keyed by entity type and where filter field, see
+    # `get_parent_chain()`
+    parent_chains = {}
+    # Joins from an Investigation `i` to the users of its InvestigationUsers (`iuu`) and
+    # InstrumentScientists (`su`). Every join is explicit, as navigating a path from an
+    # entity that's been LEFT JOINed would make it an inner join
+    investigation_user_joins = (
+        "LEFT JOIN i.investigationUsers iu LEFT JOIN iu.user iuu "
+        "LEFT JOIN i.investigationInstruments ii LEFT JOIN ii.instrument inst "
+        "LEFT JOIN inst.instrumentScientists s LEFT JOIN s.user su"
+    )
 
     def __init__(self, entity_type: str, filters: List[QueryFilter]) -> None:
         self.entity_type = entity_type
@@ -59,53 +66,87 @@ class ReaderQueryHandler:
             self.entity_type,
         )
         self.reader_query_eligible = self.check_eligibility()
-        if not ReaderQueryHandler.reader_client:
-            self.create_reader_client()
 
-    @classmethod
-    def create_reader_client(cls) -> ICATClient:
+    @staticmethod
+    def search(query: str) -> list:
         """
-        Create a new client (assigning it as a class variable) and login using the
-        reader's credentials. If the credentials aren't valid, a PythonICATError is
-        raised (resulting in a 500). The client object is returned
+        Execute a query as the reader account, using a client checked out of
+        `reader_client_pool`
         """
-        log.info("Creating reader_client")
-        cls.reader_client = ICATClient("datagateway_api")
-        try:
-            cls.reader_client.login(
-                auth=Config.config.datagateway_api.use_reader_for_performance.reader_mechanism,
-                credentials={
-                    "username": Config.config.datagateway_api.use_reader_for_performance.reader_username,
-                    "password": (
-                        Config.config.datagateway_api.use_reader_for_performance.reader_password.get_secret_value()
-                    ),
-                },
-            )
-        except ICATSessionError as e:
-            log.error("User credentials for reader account aren't valid")
-            raise PythonICATError("Internal error with reader account configuration") from e
+        return reader_client_pool.run(lambda reader_client: reader_client.search(query))
 
-        return cls.reader_client
+    @staticmethod
+    def format_ids(ids: List[int]) -> str:
+        """
+        Format a list of (validated) IDs for use in a JPQL `IN` condition
+        """
+        return f"({', '.join(str(id_) for id_ in ids)})"
+
+    @staticmethod
+    def format_user_condition(user_name: str) -> str:
+        """
+        Format a JPQL condition that's true when the user is an InvestigationUser or
+        InstrumentScientist, for use with `investigation_user_joins`
+        """
+        # Quotes are escaped by doubling them in JPQL
+        user_name_literal = user_name.replace("'", "''")
+        return f"(iuu.name = '{user_name_literal}' OR su.name = '{user_name_literal}')"  # noqa: B907
 
     @classmethod
-    def refresh(cls) -> None:
+    def get_parent_ids(cls, entity_type: str, relation: str, entity_ids: List[int]) -> dict:
+        """
+        Get the parent of many entities using one query. The results (including missing
+        entities) are cached in `permission_cache` per entity, in a namespace named
+        after the entity type and relation (e.g. `dataset_investigation`).
+
+        Args:
+            entity_type (str): ICAT entity type of the entities, e.g. Datafile.
+            relation (str): Name of the relation to the parent, e.g. dataset.
+            entity_ids (list[int]): ICAT id of each entity.
+
+        Returns:
+            dict: ICAT id of each entity's parent, keyed by the entity's id. A
+                `MissingRecord` is given for each entity that isn't found.
         """
-        Refresh `cls.reader_client` if it is defined and is close to expiring.
-        If it is not defined, or has already expired, create a new one.
+
+        def fetch_parent_ids(uncached_entity_ids):
+            query = (
+                f"SELECT o.id, o.{relation}.id FROM {entity_type} o "  # noqa: S608
+                f"WHERE o.id IN {cls.format_ids(uncached_entity_ids)}"
+            )
+            parent_ids = dict(cls.search(query))
+            log.debug("Found %s.id for %s.id: %s", relation, entity_type.lower(), parent_ids)
+            return {
+                entity_id: parent_ids.get(entity_id, MissingRecord(f"No {entity_type} found for id={entity_id}"))
+                for entity_id in uncached_entity_ids
+            }
+
+        return permission_cache.get_many_or_fetch(
+            f"{entity_type.lower()}_{relation.lower()}",
+            entity_ids,
+            fetch_parent_ids,
+        )
+
+    @classmethod
+    def get_investigation_ids(cls, dataset_ids: List[int]) -> dict:
         """
-        if cls.reader_client is not None and cls.reader_client.sessionId is not None:
-            try:
-                cls.reader_client.autoRefresh()
-                return
-            except ICATSessionError:
-                log.debug("Reader session expired")
+        Get the parent Investigation of many Datasets using one query. The results
+        (including missing Datasets) are cached in `permission_cache` per Dataset.
 
-        cls.create_reader_client()
+        Args:
+            dataset_ids (list[int]): ICAT Dataset.id of each Dataset.
+
+        Returns:
+            dict: ICAT id of each Dataset's parent Investigation, keyed by Dataset.id. A
+                `MissingRecord` is given for each Dataset that isn't found.
+        """
+        return cls.get_parent_ids("Dataset", "investigation", dataset_ids)
 
     @classmethod
-    @ttl_cache(maxsize=maxsize, ttl=ttl)
     def get_investigation_id(cls, dataset_id: int) -> int:
         """
+        The result (including a missing Dataset) is cached in `permission_cache`.
+
         Args:
             dataset_id (int): ICAT Dataset.id.
 
@@ -115,101 +156,297 @@ class ReaderQueryHandler:
         Returns:
             int: ICAT id of the Dataset's parent Investigation.
         """
-        query = f"SELECT d.investigation.id FROM Dataset d WHERE d.id={dataset_id}"  # noqa: S608
-        cls.refresh()
-        investigation_ids = cls.reader_client.search(query)
-        if len(investigation_ids) == 0:
-            raise MissingRecordError(f"No Dataset found for id={dataset_id}")
-
-        log.debug("Found investigation.id=%s for dataset.id=%s", investigation_ids[0], dataset_id)
-        return investigation_ids[0]
+        investigation_id = cls.get_investigation_ids([dataset_id])[dataset_id]
+        if isinstance(investigation_id, MissingRecord):
+            raise MissingRecordError(investigation_id.message)
+        return investigation_id
 
     @classmethod
-    @ttl_cache(maxsize=maxsize, ttl=ttl)
-    def get_investigation_users(cls, investigation_id: int) -> set[str]:
+    def get_allowed_investigation_ids(cls, user_name: str, investigation_ids: List[int]) -> set[int]:
         """
+        Check whether a user is allowed to see many Investigations (as an
+        InvestigationUser or InstrumentScientist) using one query. The verdicts
+        (whether positive or negative) are cached in `permission_cache` per user and
+        investigation.
+
         Args:
-            investigation_id (int): ICAT Investigation.id.
+            user_name (str): ICAT User.name.
+            investigation_ids (list[int]): ICAT Investigation.id of each Investigation.
 
         Returns:
-            set[str]:
-                ICAT User.name of all InvestigationUsers associated with the Investigation with id `investigation_id`.
+            set[int]: ICAT Investigation.id of the Investigations `user_name` has an
+                association with allowing read access.
         """
-        query = (
-            f"SELECT iu.user.name FROM InvestigationUser iu WHERE iu.investigation.id={investigation_id}"  # noqa: S608
+
+        def fetch_verdicts(keys):
+            uncached_investigation_ids = [investigation_id for _, investigation_id in keys]
+            query = (
+                f"SELECT DISTINCT i.id FROM Investigation i {cls.investigation_user_joins} "  # noqa: S608
+                f"WHERE i.id IN {cls.format_ids(uncached_investigation_ids)} "
+                f"AND {cls.format_user_condition(user_name)}"
+            )
+            allowed_ids = set(cls.search(query))
+            log.debug("%s is associated with investigation.id in %s", user_name, allowed_ids)
+            return {key: key[1] in allowed_ids for key in keys}
+
+        verdicts = permission_cache.get_many_or_fetch(
+            "user_investigation",
+            [(user_name, investigation_id) for investigation_id in investigation_ids],
+            fetch_verdicts,
         )
-        cls.refresh()
-        user_names = cls.reader_client.search(query=query)
-        log.debug("Found %s as InvestigationUsers for investigation.id=%s", user_names, investigation_id)
-        return set(user_names)
+        return {investigation_id for (_, investigation_id), allowed in verdicts.items() if allowed}
 
     @classmethod
-    @ttl_cache(maxsize=maxsize, ttl=ttl)
-    def get_instrument_scientists(cls, investigation_id: int) -> set[str]:
+    def is_user_allowed(cls, user_name: str, investigation_id: int) -> bool:
         """
+        The verdict (whether positive or negative) is cached in `permission_cache` per
+        user and investigation.
+
         Args:
+            user_name (str): ICAT User.name.
             investigation_id (int): ICAT Investigation.id.
 
         Returns:
-            set[str]:
-                ICAT User.name of all InstrumentScientists associated with the Investigation with id `investigation_id`.
+            bool: If `user_name` has an association with `investigation_id` allowing read access.
         """
-        query = (
-            "SELECT s.user.name FROM InstrumentScientist s "  # noqa: S608
-            f"LEFT JOIN s.instrument.investigationInstruments ii WHERE ii.investigation.id={investigation_id}"
-        )
-        cls.refresh()
-        user_names = cls.reader_client.search(query=query)
-        log.debug("Found %s as InstrumentScientists for investigation.id=%s", user_names, investigation_id)
-        return set(user_names)
+        return investigation_id in cls.get_allowed_investigation_ids(user_name, [investigation_id])
 
     @classmethod
-    def is_user_allowed(cls, user_name: str, investigation_id: int) -> bool:
+    def get_open_dataset_ids(cls, dataset_ids: List[int]) -> set[int]:
         """
+        Check whether many Datasets are open using one query. The results are cached in
+        `permission_cache` per Dataset.
+
         Args:
-            user_name (str): ICAT User.name.
-            investigation_id (int): ICAT Investigation.id.
+            dataset_ids (list[int]): ICAT Dataset.id of each Dataset.
 
         Returns:
-            bool: If `user_name` has an association with `investigation_id` allowing read access.
+            set[int]: ICAT Dataset.id of the Datasets that have been made open/public.
         """
-        return user_name in cls.get_investigation_users(
-            investigation_id=investigation_id,
-        ) or user_name in cls.get_instrument_scientists(investigation_id=investigation_id)
+
+        def fetch_open_datasets(uncached_dataset_ids):
+            query = (
+                "SELECT dcd.dataset.id, dp.publicationDate FROM DataPublication dp "  # noqa: S608
+                "JOIN dp.content c JOIN c.dataCollectionDatasets dcd "
+                f"WHERE dcd.dataset.id IN {cls.format_ids(uncached_dataset_ids)}"
+            )
+            now = datetime.now(tz=timezone.utc)
+            open_dataset_ids = {
+                dataset_id for dataset_id, publication_date in cls.search(query) if publication_date < now
+            }
+            log.debug("Open datasets: %s", open_dataset_ids)
+            return {dataset_id: dataset_id in open_dataset_ids for dataset_id in uncached_dataset_ids}
+
+        results = permission_cache.get_many_or_fetch("dataset_open", dataset_ids, fetch_open_datasets)
+        return {dataset_id for dataset_id, is_open in results.items() if is_open}
 
     @classmethod
-    @ttl_cache(maxsize=maxsize, ttl=ttl)
     def is_dataset_open(cls, dataset_id: int) -> bool:
         """
+        The result is cached in `permission_cache`.
+
         Args:
             dataset_id (int): ICAT Dataset.id.
 
         Returns:
             bool: Whether the Dataset with `dataset_id` has been made open/public.
         """
+        return dataset_id in cls.get_open_dataset_ids([dataset_id])
+
+    @classmethod
+    def get_cached_dataset_verdict(cls, user_name: str, dataset_id: int) -> Optional[bool]:
+        """
+        Get whether a user can see a Dataset from the results of previous checks cached
+        in `permission_cache`, or None if not enough of them are cached
+        """
+        is_cached, investigation_id = permission_cache.get("dataset_investigation", dataset_id)
+        if not is_cached:
+            return None
+        if isinstance(investigation_id, MissingRecord):
+            return False
+
+        is_cached, is_allowed = permission_cache.get("user_investigation", (user_name, investigation_id))
+        if not is_cached:
+            return None
+        if is_allowed:
+            return True
+
+        is_cached, is_open = permission_cache.get("dataset_open", dataset_id)
+        return is_open if is_cached else None
+
+    @classmethod
+    def fetch_dataset_verdicts(cls, user_name: str, dataset_ids: List[int]) -> set[int]:
+        """
+        Check whether a user can see many Datasets using at most two queries. The first
+        finds the Datasets whose Investigation the user is an InvestigationUser or
+        InstrumentScientist of. Only the Datasets it doesn't find need the second, which
+        finds their Investigations and publication dates (or that they don't exist).
+        Neither query returns a row for each combination of the Investigation's users,
+        InstrumentScientists and publications: the first only returns the (distinct)
+        Dataset and Investigation IDs and the second doesn't join users, so a Dataset
+        contributes one row to the first and one row per publication date to the second.
+        The results populate the `dataset_investigation`, `user_investigation` and
+        `dataset_open` namespaces of `permission_cache`.
+
+        Args:
+            user_name (str): ICAT User.name.
+            dataset_ids (list[int]): ICAT Dataset.id of each Dataset.
+
+        Returns:
+            set[int]: ICAT Dataset.id of the Datasets `user_name` can see.
+        """
         query = (
-            "SELECT dp.publicationDate FROM DataPublication dp JOIN dp.content c "  # noqa: S608
-            f"JOIN c.dataCollectionDatasets dcd WHERE dcd.dataset.id={dataset_id}"
+            "SELECT DISTINCT d.id, i.id "  # noqa: S608
+            f"FROM Dataset d JOIN d.investigation i {cls.investigation_user_joins} "
+            f"WHERE d.id IN {cls.format_ids(dataset_ids)} AND {cls.format_user_condition(user_name)}"
         )
-        cls.refresh()
-        for publication_date in cls.reader_client.search(query):
-            if publication_date < datetime.now(tz=timezone.utc):
-                log.debug("dataset.id=%s is open", dataset_id)
-                return True
+        allowed_investigation_ids = dict(cls.search(query))
+        visible_dataset_ids = set(allowed_investigation_ids)
+        for dataset_id, investigation_id in allowed_investigation_ids.items():
+            permission_cache.store("dataset_investigation", dataset_id, investigation_id)
+            permission_cache.store("user_investigation", (user_name, investigation_id), True)
+
+        # The user isn't associated with the Investigations of the remaining Datasets
+        # (otherwise they'd have been found above), so they can only see the published
+        # ones
+        remaining_dataset_ids = [id_ for id_ in dataset_ids if id_ not in allowed_investigation_ids]
+        if remaining_dataset_ids:
+            query = (
+                "SELECT DISTINCT d.id, i.id, dp.publicationDate "  # noqa: S608
+                "FROM Dataset d JOIN d.investigation i LEFT JOIN d.dataCollectionDatasets dcd "
+                "LEFT JOIN dcd.dataCollection dc LEFT JOIN dc.dataPublications dp "
+                f"WHERE d.id IN {cls.format_ids(remaining_dataset_ids)}"
+            )
+            now = datetime.now(tz=timezone.utc)
+            investigation_ids = {}
+            open_dataset_ids = set()
+            for dataset_id, investigation_id, publication_date in cls.search(query):
+                investigation_ids[dataset_id] = investigation_id
+                if publication_date is not None and publication_date < now:
+                    open_dataset_ids.add(dataset_id)
+
+            for dataset_id in remaining_dataset_ids:
+                if dataset_id not in investigation_ids:
+                    permission_cache.store(
+                        "dataset_investigation",
+                        dataset_id,
+                        MissingRecord(f"No Dataset found for id={dataset_id}"),
+                    )
+                    continue
+
+                permission_cache.store("dataset_investigation", dataset_id, investigation_ids[dataset_id])
+                permission_cache.store("user_investigation", (user_name, investigation_ids[dataset_id]), False)
+                permission_cache.store("dataset_open", dataset_id, dataset_id in open_dataset_ids)
+
+            visible_dataset_ids |= open_dataset_ids
+
+        log.debug("%s can see dataset.id in %s", user_name, visible_dataset_ids)
+        return visible_dataset_ids
 
-        log.debug("dataset.id=%s is closed", dataset_id)
-        return False
+    @classmethod
+    def get_visible_dataset_ids(cls, user_name: str, dataset_ids: List[int]) -> set[int]:
+        """
+        Check whether a user can see many Datasets: whether they're an InvestigationUser
+        or InstrumentScientist of its Investigation, or the Dataset has been published.
+        Cached results are used where possible, the remaining Datasets are checked using
+        `fetch_dataset_verdicts()`.
+
+        Args:
+            user_name (str): ICAT User.name.
+            dataset_ids (list[int]): ICAT Dataset.id of each Dataset.
+
+        Returns:
+            set[int]: ICAT Dataset.id of the Datasets `user_name` can see. Datasets
+                that don't exist aren't included.
+        """
+        visible_dataset_ids = set()
+        unchecked_dataset_ids = []
+        for dataset_id in dict.fromkeys(dataset_ids):
+            verdict = cls.get_cached_dataset_verdict(user_name, dataset_id)
+            if verdict is None:
+                unchecked_dataset_ids.append(dataset_id)
+            elif verdict:
+                visible_dataset_ids.add(dataset_id)
+
+        if unchecked_dataset_ids:
+            visible_dataset_ids |= cls.fetch_dataset_verdicts(user_name, unchecked_dataset_ids)
+
+        return visible_dataset_ids
+
+    @classmethod
+    def get_relation_type(cls, entity_type: str, relation: str) -> Optional[str]:
+        """
+        Get the entity type of a one-relation of an entity type, or None if the entity
+        type has no such relation
+        """
+        entity_info = reader_client_pool.run(lambda reader_client: reader_client.getEntityInfo(entity_type))
+        for field in entity_info.fields:
+            if field.name == relation and field.relType.lower() == "one":
+                return field.type
+
+        return None
+
+    @classmethod
+    def get_parent_chain(cls, entity_type: str, field: str) -> Optional[tuple]:
+        """
+        Resolve the chain of parent entities between the parent entity whose ID is given
+        by `field` (e.g. Datafile for `datafile.id`) and the first entity whose
+        visibility can be checked (a Dataset or Investigation), following the configured
+        `parent_relations`. The chain is resolved using ICAT's entity information and is
+        remembered for each entity type and field
+
+        Args:
+            entity_type (str): ICAT entity type of the query, e.g. DatafileParameter.
+            field (str): Where filter field on the ID of a parent, e.g. datafile.id.
+
+        Returns:
+            tuple: Tuple of the (entity type, relation) steps to follow from the parent
+                entity and the entity type that is checked, or None if the chain can't
+                be resolved (e.g. a relation missing from `parent_relations`).
+        """
+        cache_key = (entity_type, field)
+        if cache_key not in cls.parent_chains:
+            parent_relations = Config.config.datagateway_api.use_reader_for_performance.parent_relations
+            *relations, id_field = field.split(".")
+            parent_entity_type = entity_type
+            for relation in relations:
+                if parent_entity_type is not None:
+                    parent_entity_type = cls.get_relation_type(parent_entity_type, relation)
+
+            steps = []
+            while (
+                id_field == "id"
+                and parent_entity_type is not None
+                and parent_entity_type not in cls.checked_entity_types
+                and parent_entity_type in parent_relations
+                and len(steps) < len(parent_relations)
+            ):
+                relation = parent_relations[parent_entity_type]
+                steps.append((parent_entity_type, relation))
+                parent_entity_type = cls.get_relation_type(parent_entity_type, relation)
+
+            if id_field == "id" and parent_entity_type in cls.checked_entity_types:
+                cls.parent_chains[cache_key] = (steps, parent_entity_type)
+            else:
+                log.warning("Unable to resolve the parent of %s from %s for reader queries", entity_type, field)
+                cls.parent_chains[cache_key] = None
+
+        return cls.parent_chains[cache_key]
 
     def check_eligibility(self) -> bool:
         """
         This function checks whether the input query can be executed as a 'reader
-        performance query'. The entity of the query needs to be in `entity_filter_check`
-        and an appropriate WHERE filter needs to be sought
+        performance query'. The entity of the query needs to be in the configured
+        `entity_filter_fields`, its parent needs to be resolvable up to a Dataset or
+        Investigation and an appropriate WHERE filter needs to be sought
         (using `get_where_filter_for_entity_id_check()`)
         """
         log.info("Checking whether query is eligible to go via reader account")
-        if self.entity_type in ReaderQueryHandler.entity_filter_check.keys():
-            if self.get_where_filter_for_entity_id_check():
+        entity_filter_fields = Config.config.datagateway_api.use_reader_for_performance.entity_filter_fields
+        if self.entity_type in entity_filter_fields:
+            self.id_field = entity_filter_fields[self.entity_type]
+            self.parent_chain = ReaderQueryHandler.get_parent_chain(self.entity_type, self.id_field)
+            if self.parent_chain and self.get_where_filter_for_entity_id_check():
                 return True
 
         return False
@@ -224,48 +461,84 @@ class ReaderQueryHandler:
         """
         Iterate through the instance's query filters and return a WHERE filter for a
         relevant parent entity (e.g. dataset.id or datafile.id). The WHERE filter must
-        use the 'eq' operator
+        use the 'eq' operator, or the 'in' operator with a list of no more than ICAT's
+        `maxEntities` IDs
         """
 
         for query_filter in self.filters:
             if (
                 isinstance(query_filter, PythonICATWhereFilter)
-                and query_filter.field == ReaderQueryHandler.entity_filter_check[self.entity_type]
-                and query_filter.operation == "eq"
+                and query_filter.field == self.id_field
+                and query_filter.operation in ["eq", "in", "inq"]
             ):
+                entity_ids = self.get_filter_entity_ids(query_filter)
+                if not entity_ids or len(entity_ids) > get_icat_max_entities():
+                    continue
+
                 log.debug(
                     "WHERE filter relevant for reader query checking: %s",
                     query_filter,
                 )
-                self.where_filter_entity_id = int(query_filter.value)
+                self.where_filter_entity_ids = entity_ids
                 return query_filter
 
         return None
 
-    def is_user_authorised_to_see_entity_id(self, client) -> bool:
+    @staticmethod
+    def get_filter_entity_ids(query_filter: PythonICATWhereFilter) -> Optional[List[int]]:
         """
-        This function checks whether the user is authorised to see a parent entity (e.g.
-        if they query /datafiles, whether they can see a particular dataset). A query is
-        created and sent to ICAT for execution - the query is performed using the
-        session ID provided in the request
+        Get the (distinct) IDs of a WHERE filter on a parent entity's ID, or None if
+        any of its values isn't an ID
         """
-        user_name = client.getUserName()
-        id_field = ReaderQueryHandler.entity_filter_check[self.entity_type]
-        log.info("Checking to see if user '%s' can see %s=%s", user_name, id_field, self.where_filter_entity_id)
-
-        if self.entity_type == "Dataset":
-            if ReaderQueryHandler.is_user_allowed(user_name=user_name, investigation_id=self.where_filter_entity_id):
-                log.debug("User is authorised to see investigation.id=%s", self.where_filter_entity_id)
-                return True
+        values = query_filter.value
+        if query_filter.operation == "eq":
+            values = [values]
+        elif isinstance(values, str):
+            # The value of an 'in' filter is formatted as a string once the filter has
+            # been applied to a query
+            values = [value for value in values.strip("()").split(",") if value.strip()]
+        elif not isinstance(values, list):
+            return None
 
-        elif self.entity_type == "Datafile":
-            investigation_id = ReaderQueryHandler.get_investigation_id(dataset_id=self.where_filter_entity_id)
-            if ReaderQueryHandler.is_user_allowed(
-                user_name=user_name,
-                investigation_id=investigation_id,
-            ) or ReaderQueryHandler.is_dataset_open(dataset_id=self.where_filter_entity_id):
-                log.debug("User is authorised to see dataset.id=%s", self.where_filter_entity_id)
-                return True
+        try:
+            return list(dict.fromkeys(int(value) for value in values))
+        except (TypeError, ValueError):
+            return None
 
-        log.debug("User not authorised to see %s=%s", id_field, self.where_filter_entity_id)
+    def is_user_authorised_to_see_entity_id(self, client) -> bool:
+        """
+        This function checks whether the user is authorised to see every parent entity
+        listed in the WHERE filter (e.g. if they query /datafiles, whether they can see
+        particular datasets). Parents other than Datasets and Investigations are first
+        resolved up to the Datasets or Investigations whose visibility is checked. Each
+        kind of check is made for all of the parent entities using a single query,
+        executed as the reader account. If the user can't see any one of the parent
+        entities, the user isn't authorised
+        """
+        user_name = session_metadata_cache.get_or_fetch(client).username
+        entity_ids = self.where_filter_entity_ids
+        log.info("Checking to see if user '%s' can see %s in %s", user_name, self.id_field, entity_ids)
+
+        steps, checked_entity_type = self.parent_chain
+        parent_ids = entity_ids
+        for parent_entity_type, relation in steps:
+            ancestor_ids = ReaderQueryHandler.get_parent_ids(parent_entity_type, relation, parent_ids)
+            if any(isinstance(id_, MissingRecord) for id_ in ancestor_ids.values()):
+                log.debug("Not all of %s.id in %s exist", parent_entity_type, parent_ids)
+                return False
+            parent_ids = list(dict.fromkeys(ancestor_ids.values()))
+
+        if checked_entity_type == "Investigation":
+            allowed_ids = ReaderQueryHandler.get_allowed_investigation_ids(user_name, parent_ids)
+            not_allowed_ids = [id_ for id_ in parent_ids if id_ not in allowed_ids]
+
+        elif checked_entity_type == "Dataset":
+            visible_ids = ReaderQueryHandler.get_visible_dataset_ids(user_name, parent_ids)
+            not_allowed_ids = [id_ for id_ in parent_ids if id_ not in visible_ids]
+
+        if not not_allowed_ids:
+            log.debug("User is authorised to see %s in %s", self.id_field, entity_ids)
+            return True
+
+        log.debug("User not authorised to see %s.id in %s", checked_entity_type.lower(), not_allowed_ids)
         return False
@@ -0,0 +1,410 @@
+from copy import deepcopy
+from functools import wraps
+import json
+import logging
+import threading
+from typing import NamedTuple
+
+from cachetools import TTLCache
+
+from datagateway_api.common.config import Config
+from datagateway_api.common.count_cache import CountCache
+from datagateway_api.datagateway_api.icat.client_lease import ClientLeaseManager
+from datagateway_api.datagateway_api.icat.filters import (
+    PythonICATDistinctFieldFilter,
+    PythonICATIncludeFilter,
+    PythonICATLimitFilter,
+    PythonICATOrderFilter,
+    PythonICATSkipFilter,
+    PythonICATWhereFilter,
+)
+from datagateway_api.datagateway_api.icat.session_cache import session_metadata_cache
+
+log = logging.getLogger()
+
+# Writes to the entity types ICAT's authorisation is built from can change what any
+# user can see. As well as the rules and groupings, this includes the entity types that
+# rules (and data publications) commonly grant access through, which are beneath the
+# investigations and datasets they give access to rather than above them, so wouldn't
+# otherwise invalidate those
+AUTHORISATION_ENTITY_TYPES = frozenset(
+    [
+        "DataCollection",
+        "DataCollectionDatafile",
+        "DataCollectionDataset",
+        "DataPublication",
+        "Grouping",
+        "InstrumentScientist",
+        "InvestigationInstrument",
+        "InvestigationUser",
+        "PublicStep",
+        "Rule",
+        "User",
+        "UserGroup",
+    ],
+)
+# Used as a dependency when an entry's dependencies can't be determined, so it's
+# invalidated by writes to any entity type
+ANY_ENTITY_TYPE = "*"
+
+
+class CachedResponse(NamedTuple):
+    result: object
+    # Entity types the response was built from, writes to any of these make it stale
+    dependencies: frozenset
+    size: int
+
+
+class ResponseCache:
+    """
+    Bounded, TTL based cache of the results of read requests (GET, GET by ID and
+    findone), keyed by the session's user, the entity type and the request's filters.
+    Counts are cached by `count_cache` instead
+
+    Results are cached per user (rather than per session) because what a user can see
+    depends on ICAT's authorisation rules for that user, not on the session they use.
+    Each entry records the entity types it depends on: the entity requested plus every
+    entity type reached by the related fields used in its filters (e.g. an investigation
+    request including `datasets` depends on `Dataset` too).
+
+    Writes made via the API (see `invalidates_cached_responses()`) invalidate every
+    entry depending on the written entity type, or on any entity type beneath it through
+    one-many relationships (which ICAT may create or delete in cascade). Writes to the
+    entity types ICAT's authorisation is built from clear the whole cache, as they can
+    change what any user can see. Writes made outside of the API are only picked up once
+    the entries expire, so the TTL should be kept short.
+
+    The size of the cache is bounded by the total size of the cached results (measured
+    as the length of their JSON representation), not the number of entries.
+    """
+
+    cacheable_filter_types = (
+        PythonICATWhereFilter,
+        PythonICATOrderFilter,
+        PythonICATSkipFilter,
+        PythonICATLimitFilter,
+        PythonICATIncludeFilter,
+        PythonICATDistinctFieldFilter,
+    )
+
+    def __init__(self, max_bytes, ttl):
+        """
+        :param max_bytes: Maximum total size of the cached results
+        :type max_bytes: :class:`int`
+        :param ttl: Number of seconds a result is cached for
+        :type ttl: :class:`float`
+        """
+        self._cache = TTLCache(maxsize=max_bytes, ttl=ttl, getsizeof=lambda entry: entry.size)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_execute(self, client, operation, entity_type, query, execute):
+        """
+        Get the cached result of a read request, executing (and caching) it if there's
+        no cached result
+
+        :param client: ICAT client containing an authenticated user
+        :type client: :class:`icat.client.Client`
+        :param operation: Name of the read operation e.g. `get_with_filters`
+        :type operation: :class:`str`
+        :param entity_type: The type of entity requested
+        :type entity_type: :class:`str`
+        :param query: The request's filters, or the ID of the requested entity
+        :type query: List of specific implementations :class:`QueryFilter` or
+            :class:`int`
+        :param execute: Function that executes the request
+        :type execute: :class:`function`
+        :return: Result of the request
+        """
+        if not self.is_cacheable(query):
+            return execute()
+
+        # The key is created before the request is executed as applying filters to a
+        # query can modify them
+        username = session_metadata_cache.get_or_fetch(client).username
+        key = (username, operation, entity_type, self.normalise_query(query))
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        # Copies of cached results are returned so callers modifying a result (e.g.
+        # when mapping it to a response) can't change the cached result
+        if entry is not None:
+            log.debug("Response cache hit for %s on %s", operation, entity_type)
+            return deepcopy(entry.result)
+
+        log.debug("Response cache miss for %s on %s", operation, entity_type)
+        result = execute()
+        entry = CachedResponse(
+            result,
+            get_dependencies(client, entity_type, query),
+            len(json.dumps(result, default=str)),
+        )
+        if entry.size > self._cache.maxsize:
+            log.debug("Result is too large to be cached (%d bytes)", entry.size)
+            return result
+
+        with self._lock:
+            self._cache[key] = entry
+
+        return deepcopy(result)
+
+    def is_cacheable(self, query):
+        if not isinstance(query, list):
+            return True
+        return all(type(query_filter) in self.cacheable_filter_types for query_filter in query)
+
+    @staticmethod
+    def normalise_query(query):
+        """
+        Convert a request's filters into a hashable form. The order of the filters is
+        kept, as it's significant for order filters
+        """
+        if not isinstance(query, list):
+            return query
+
+        return json.dumps(
+            [[type(query_filter).__name__, vars(query_filter)] for query_filter in query],
+            sort_keys=True,
+            default=str,
+        )
+
+    def invalidate(self, client, entity_type):
+        """
+        Remove the cached results that depend on `entity_type` (or any entity type
+        beneath it), used when it's written to
+
+        :param client: ICAT client containing an authenticated user
+        :type client: :class:`icat.client.Client`
+        :param entity_type: The type of entity written to
+        :type entity_type: :class:`str`
+        """
+        if entity_type in AUTHORISATION_ENTITY_TYPES:
+            log.info("%s written to, clearing response cache", entity_type)
+            self.clear()
+            return
+
+        affected_entity_types = get_affected_entity_types(client, entity_type)
+        with self._lock:
+            stale_keys = [key for key, entry in self._cache.items() if entry.dependencies & affected_entity_types]
+            for key in stale_keys:
+                del self._cache[key]
+
+        log.debug("Invalidated %d cached responses after a write to %s", len(stale_keys), entity_type)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "size": self._cache.currsize,
+                "max_size": self._cache.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+def get_dependencies(client, entity_type, query):
+    """
+    Get the entity types a request's result is built from: the entity requested plus
+    every entity type reached by the related fields used in its filters
+
+    :param client: ICAT client containing an authenticated user
+    :type client: :class:`icat.client.Client`
+    :param entity_type: The type of entity requested
+    :type entity_type: :class:`str`
+    :param query: The request's filters, or the ID of the requested entity
+    :type query: List of specific implementations :class:`QueryFilter` or
+        :class:`int`
+    :return: :class:`frozenset` of entity type names
+    """
+    fields = []
+    for query_filter in query if isinstance(query, list) else []:
+        if isinstance(query_filter, (PythonICATWhereFilter, PythonICATOrderFilter)):
+            fields.append(query_filter.field)
+        elif isinstance(query_filter, PythonICATIncludeFilter):
+            fields.extend(query_filter.included_filters)
+        elif isinstance(query_filter, PythonICATDistinctFieldFilter):
+            fields.extend(query_filter.fields)
+
+    dependencies = {entity_type}
+    for field in fields:
+        # Functions applied to the field (e.g. `UPPER(name)`) are removed
+        field_path = str(field).rsplit("(", 1)[-1].split(")", 1)[0]
+        related_entity_type = entity_type
+        for field_name in field_path.split("."):
+            try:
+                entity_field = get_field(client, related_entity_type, field_name)
+            except StopIteration:
+                log.debug("Unable to resolve field %s for cache dependencies", field)
+                dependencies.add(ANY_ENTITY_TYPE)
+                break
+            if entity_field.relType.lower() == "attribute":
+                break
+            related_entity_type = entity_field.type
+            dependencies.add(related_entity_type)
+
+    return frozenset(dependencies)
+
+
+def get_affected_entity_types(client, entity_type):
+    """
+    Get the entity types whose cached results are made stale by a write to
+    `entity_type`: the entity type itself, every entity type beneath it through
+    one-many relationships and `ANY_ENTITY_TYPE`
+
+    :param client: ICAT client containing an authenticated user
+    :type client: :class:`icat.client.Client`
+    :param entity_type: The type of entity written to
+    :type entity_type: :class:`str`
+    :return: :class:`set` of entity type names
+    """
+    affected_entity_types = {entity_type}
+    unvisited_entity_types = [entity_type]
+    while unvisited_entity_types:
+        for field in client.getEntityInfo(unvisited_entity_types.pop()).fields:
+            if field.relType.lower() == "many" and field.type not in affected_entity_types:
+                affected_entity_types.add(field.type)
+                unvisited_entity_types.append(field.type)
+
+    affected_entity_types.add(ANY_ENTITY_TYPE)
+    return affected_entity_types
+
+
+def get_field(client, entity_type, field_name):
+    return next(field for field in client.getEntityInfo(entity_type).fields if field.name == field_name)
+
+
+response_cache_config = Config.config.datagateway_api.response_cache
+response_cache = (
+    ResponseCache(response_cache_config.max_bytes, response_cache_config.ttl)
+    if response_cache_config and response_cache_config.enabled
+    else None
+)
+
+COUNT_REFRESH_WORKERS = 2
+count_cache_config = Config.config.datagateway_api.count_cache
+count_cache = (
+    CountCache(
+        "datagateway_api",
+        count_cache_config.maxsize,
+        count_cache_config.soft_ttl,
+        count_cache_config.hard_ttl,
+        refresh_workers=COUNT_REFRESH_WORKERS,
+    )
+    if count_cache_config and count_cache_config.enabled
+    else None
+)
+# Background refreshes have their own leases (one per refresh worker), so they never
+# take a client a request is waiting for
+count_refresh_lease_manager = ClientLeaseManager(
+    COUNT_REFRESH_WORKERS,
+    Config.config.datagateway_api.client_lease_timeout,
+)
+# Order, skip and limit filters can change a count (e.g. by joining an entity to order
+# by it), but aren't sent by DataGateway's frontends so counts using them aren't cached
+count_cache_filter_types = (
+    PythonICATWhereFilter,
+    PythonICATIncludeFilter,
+    PythonICATDistinctFieldFilter,
+)
+
+
+def caches_response(method):
+    """
+    Decorator for Python ICAT read methods that serves results from `response_cache`
+    (if it's enabled). This must be applied after `requires_session_id` so the request's
+    client is available
+
+    This assumes the entity type and the request's filters (or ID) are the third and
+    fourth arguments of the method
+    """
+
+    @wraps(method)
+    def wrapper_caches_response(self, session_id, entity_type, query, **kwargs):
+        if response_cache is None:
+            return method(self, session_id, entity_type, query, **kwargs)
+
+        return response_cache.get_or_execute(
+            kwargs.get("client"),
+            method.__name__,
+            entity_type,
+            query,
+            lambda: method(self, session_id, entity_type, query, **kwargs),
+        )
+
+    return wrapper_caches_response
+
+
+def caches_count(method):
+    """
+    Decorator for Python ICAT count methods that serves counts from `count_cache` (if
+    it's enabled), refreshing stale counts in the background. This must be applied after
+    `requires_session_id` so the request's client is available
+
+    The background refresh leases its own client (from `count_refresh_lease_manager`)
+    using the request's session ID, as the request's client is returned to the pool
+    when the request ends
+
+    This assumes the entity type and the request's filters are the third and fourth
+    arguments of the method
+    """
+
+    @wraps(method)
+    def wrapper_caches_count(self, session_id, entity_type, filters, **kwargs):
+        if count_cache is None or not all(type(query_filter) in count_cache_filter_types for query_filter in filters):
+            return method(self, session_id, entity_type, filters, **kwargs)
+
+        # The key is created (and filters copied) before the count is made as applying
+        # filters to a query can modify them
+        client = kwargs.get("client")
+        username = session_metadata_cache.get_or_fetch(client).username
+        key = (username, entity_type, ResponseCache.normalise_query(filters))
+        refresh_filters = deepcopy(filters)
+
+        def refresh():
+            with count_refresh_lease_manager.lease(kwargs.get("client_pool"), session_id) as refresh_client:
+                refresh_kwargs = {**kwargs, "client": refresh_client}
+                return method(self, session_id, entity_type, refresh_filters, **refresh_kwargs)
+
+        return count_cache.get_or_count(
+            key,
+            lambda: method(self, session_id, entity_type, filters, **kwargs),
+            refresh,
+            get_dependencies(client, entity_type, filters),
+        )
+
+    return wrapper_caches_count
+
+
+def invalidates_cached_responses(function):
+    """
+    Decorator for functions that write to ICAT, which invalidates the cached responses
+    (and counts) depending on the entity type written to. Responses are invalidated even
+    if the write fails, as part of it may have been made before the failure
+
+    This assumes the client and entity type are the first two arguments of the function
+    """
+
+    @wraps(function)
+    def wrapper_invalidates_cached_responses(client, entity_type, *args, **kwargs):
+        try:
+            return function(client, entity_type, *args, **kwargs)
+        finally:
+            if response_cache is not None:
+                response_cache.invalidate(client, entity_type)
+            if count_cache is not None:
+                if entity_type in AUTHORISATION_ENTITY_TYPES:
+                    count_cache.clear()
+                else:
+                    count_cache.invalidate(get_affected_entity_types(client, entity_type))
+
+    return wrapper_invalidates_cached_responses
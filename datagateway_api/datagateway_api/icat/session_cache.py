@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+import logging
+import threading
+from typing import NamedTuple
+
+from cachetools import TTLCache
+from dateutil.tz import tzlocal
+
+from datagateway_api.common.config import Config
+
+log = logging.getLogger()
+
+
+class SessionMetadata(NamedTuple):
+    username: str
+    expiry: datetime
+
+    def is_expired(self) -> bool:
+        return datetime.now(tzlocal()) >= self.expiry
+
+    def get_remaining_minutes(self) -> float:
+        return (self.expiry - datetime.now(tzlocal())).total_seconds() / 60
+
+
+class SessionMetadataCache:
+    """
+    Bounded cache of session metadata (the session's username and absolute expiry time)
+    keyed by session ID
+
+    Without this, every request needs a `getRemainingMinutes()` call to check the session
+    is valid and one or more `getUserName()` calls (for logging and the reader
+    performance checks) before any actual query is sent to ICAT. The metadata is fetched
+    once per session and reused by `requires_session_id`, `ReaderQueryHandler`,
+    `get_session_details_helper` and `SessionBearer`.
+
+    An entry is only used until its session expires or it becomes older than `ttl`
+    seconds, whichever happens first. The TTL bounds how long changes made to the
+    session outside of the API (e.g. a refresh or logout via another service) can go
+    unnoticed. Logouts and refreshes made via the API invalidate the entry immediately.
+    """
+
+    def __init__(self, maxsize, ttl):
+        """
+        :param maxsize: Maximum number of sessions kept in the cache
+        :type maxsize: :class:`int`
+        :param ttl: Maximum number of seconds an entry is kept for
+        :type ttl: :class:`int`
+        """
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        """
+        Get the cached metadata of a session, if there is any
+
+        :param session_id: The user's session ID
+        :type session_id: :class:`str`
+        :return: :class:`SessionMetadata` of the session, or None if the session isn't
+            cached (or has expired)
+        """
+        with self._lock:
+            metadata = self._cache.get(session_id)
+            if metadata is not None and metadata.is_expired():
+                # The session may have been refreshed outside of the API so it's
+                # dropped here and checked again with ICAT
+                del self._cache[session_id]
+                metadata = None
+
+        return metadata
+
+    def get_or_fetch(self, client):
+        """
+        Get the metadata of the session attached to `client`, fetching it from ICAT (and
+        caching it) if it's not already cached
+
+        :param client: ICAT client containing an authenticated user
+        :type client: :class:`icat.client.Client`
+        :return: :class:`SessionMetadata` of the session. If the session has expired,
+            the metadata is returned but it isn't cached
+        :raises ICATSessionError: If the session ID isn't valid
+        """
+        metadata = self.get(client.sessionId)
+        if metadata is not None:
+            return metadata
+
+        log.debug("Session metadata not cached, fetching from ICAT")
+        remaining_minutes = client.getRemainingMinutes()
+        expiry = datetime.now(tzlocal()) + timedelta(minutes=remaining_minutes)
+        metadata = SessionMetadata(client.getUserName() if remaining_minutes >= 0 else None, expiry)
+
+        if not metadata.is_expired():
+            with self._lock:
+                self._cache[client.sessionId] = metadata
+
+        return metadata
+
+    def invalidate(self, session_id):
+        """
+        Remove a session from the cache, used when a session is logged out or refreshed
+
+        :param session_id: The user's session ID
+        :type session_id: :class:`str`
+        """
+        with self._lock:
+            self._cache.pop(session_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+session_metadata_cache = SessionMetadataCache(
+    Config.config.datagateway_api.session_cache_maxsize,
+    Config.config.datagateway_api.session_cache_ttl,
+)
@@ -1,12 +1,43 @@
-from typing import Annotated, Any, List, Type
+from typing import Annotated, Any, List, Optional, Type
 
 
-from fastapi import APIRouter, Path, Query, Request
-from pydantic import BaseModel, Json
+from fastapi import APIRouter, Path, Query, Request, Response
+from pydantic import BaseModel, create_model, Json
 
+from datagateway_api.common.config import Config
+from datagateway_api.common.exceptions import BadRequestError, FilterError
 from datagateway_api.common.helpers import get_filters_from_query_string, get_session_id_from_auth_header
+from datagateway_api.common.icat_executor import get_icat_executor
+from datagateway_api.common.ndjson import (
+    create_ndjson_ingest_response,
+    create_ndjson_response,
+    ingest_ndjson_records,
+    is_ndjson_requested,
+    NDJSON_MEDIA_TYPE,
+)
+from datagateway_api.datagateway_api.icat.filters import PythonICATCursorFilter
 from datagateway_api.datagateway_api.icat.python_icat import PythonICAT
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class BatchRequest(BaseModel):
+    ids: List[int]
+
+
+class DeleteChunkResult(BaseModel):
+    ids: List[int]
+    deleted: bool
+    error: Optional[str] = None
+
+
+class IngestBatchResult(BaseModel):
+    first_line: int
+    last_line: int
+    ids: Optional[List[int]] = None
+    error: Optional[str] = None
+
+
 WhereQuery = Query(
     default=None,
     title="WHERE_FILTER",
@@ -129,6 +160,24 @@ DistinctQuery = Query(
     description="Apply distinct filter to the query. Return unique values for the fields requested.",
     json_schema_extra={"type": "array", "items": {"type": "string", "default": ""}},
 )
+CursorQuery = Query(
+    default=None,
+    title="CURSOR",
+    description=(
+        "Page through results using a cursor rather than a skip filter, which costs the same for every page. Give"
+        " an empty cursor (along with a limit filter) for the first page, then the cursor from the"
+        f" `{NEXT_CURSOR_HEADER}` header of the previous response for the following pages. The same order filters"
+        " must be given for each page and can only be on attributes of the entity."
+    ),
+)
+StreamQuery = Query(
+    default=False,
+    title="STREAM",
+    description=(
+        "Stream the results as NDJSON (one JSON object per line) as they're fetched from"
+        " ICAT. This can also be requested using an `Accept: application/x-ndjson` header."
+    ),
+)
 IncludeQuery = Query(
     default=None,
     title="INCLUDE_FILTER",
@@ -180,7 +229,7 @@ def get_endpoint(
     Given an entity endpoint_name, register collection-level FastAPI endpoints on the
     provided APIRouter.
 
-    It registers GET, POST, and PATCH handlers for collection
+    It registers GET, POST, PATCH and DELETE handlers for collection
     access.
 
     :param router: FastAPI APIRouter to register endpoints on
@@ -189,6 +238,7 @@ def get_endpoint(
     :param dg_models: Dictionary mapping entity names to their corresponding DataGateway Pydantic models
     :param python_icat: The python ICAT instance used for processing requests
     """
+    icat_executor = get_icat_executor()
 
     @router.get(
         "",
@@ -197,29 +247,70 @@ def get_endpoint(
         response_model=List[dg_models[entity_name]],
         response_model_exclude_unset=True,
         responses={
-            200: {"description": f"Success - returns {entity_name} that satisfy the filters"},
+            200: {
+                "description": f"Success - returns {entity_name} that satisfy the filters",
+                "content": {NDJSON_MEDIA_TYPE: {}},
+                "headers": {
+                    NEXT_CURSOR_HEADER: {
+                        "description": "Cursor for the next page of results, when a cursor is given",
+                        "schema": {"type": "string"},
+                    },
+                },
+            },
             400: {"description": "Bad request - Something was wrong with the request"},
             401: {"description": "Unauthorized - No session ID found in HTTP Auth. header"},
             403: {"description": "Forbidden - The session ID provided is invalid"},
             404: {"description": "No such record - Unable to find a record in ICAT"},
         },
     )
-    def get(
+    async def get(
         request: Request,
+        response: Response,
         where: List[Json] = WhereQuery,  # pylint:disable=unused-argument
         order: List[str] = OrderQuery,  # pylint:disable=unused-argument
-        limit: int = LimitQuery,  # pylint:disable=unused-argument
-        skip: int = SkipQuery,  # pylint:disable=unused-argument
+        limit: int = LimitQuery,
+        skip: int = SkipQuery,
         distinct: List[str] = DistinctQuery,  # pylint:disable=unused-argument
         include: Any = IncludeQuery,  # pylint:disable=unused-argument
+        cursor: Optional[str] = CursorQuery,
+        stream: bool = StreamQuery,
     ):
-        return python_icat.get_with_filters(
-            get_session_id_from_auth_header(request),
+        session_id = get_session_id_from_auth_header(request)
+        filters = get_filters_from_query_string(request, "datagateway_api")
+
+        ndjson_requested = is_ndjson_requested(request, stream)
+        cursor_filter = None
+        if cursor is not None:
+            if skip is not None:
+                raise FilterError("A cursor cannot be used with a skip filter")
+            # The next cursor is sent in a header, which has already been sent by the
+            # time a stream's last result is known
+            if ndjson_requested:
+                raise FilterError("A cursor cannot be used when streaming results")
+            cursor_filter = PythonICATCursorFilter(cursor)
+            filters.append(cursor_filter)
+
+        if ndjson_requested:
+            return await create_ndjson_response(
+                icat_executor,
+                python_icat.stream_with_filters(session_id, entity_name, filters, **kwargs),
+            )
+
+        results = await icat_executor.run(
+            python_icat.get_with_filters,
+            session_id,
             entity_name,
-            get_filters_from_query_string(request, "datagateway_api"),
+            filters,
             **kwargs,
         )
 
+        if cursor_filter:
+            next_cursor = cursor_filter.get_next_cursor(results, limit)
+            if next_cursor:
+                response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+        return results
+
     @router.post(
         "",
         summary=f"Create new {endpoint_name}",
@@ -234,8 +325,9 @@ def get_endpoint(
             404: {"description": "No such record - Unable to find a record in ICAT"},
         },
     )
-    def post(body: List[dg_models[f"{entity_name}Post"]], request: Request):  # noqa: F821
-        return python_icat.create(
+    async def post(body: List[dg_models[f"{entity_name}Post"]], request: Request):  # noqa: F821
+        return await icat_executor.run(
+            python_icat.create,
             get_session_id_from_auth_header(request),
             entity_name,
             [result.model_dump(by_alias=True) for result in body],
@@ -256,14 +348,193 @@ def get_endpoint(
             404: {"description": "No such record - Unable to find a record in ICAT"},
         },
     )
-    def patch(body: List[dg_models[f"{entity_name}Patch"]], request: Request):  # noqa: F821
-        return python_icat.update(
+    async def patch(body: List[dg_models[f"{entity_name}Patch"]], request: Request):  # noqa: F821
+        return await icat_executor.run(
+            python_icat.update,
             get_session_id_from_auth_header(request),
             entity_name,
             [result.model_dump(by_alias=True, exclude_none=True) for result in body],
             **kwargs,
         )
 
+    @router.delete(
+        "",
+        summary=f"Delete {endpoint_name}",
+        description=(
+            f"Deletes the {entity_name} objects with the IDs given in the request body, or those matching the where"
+            " filters given. Entities are deleted in chunks, a chunk failing doesn't stop the other chunks from"
+            " being deleted"
+        ),
+        response_model=List[DeleteChunkResult],
+        response_model_exclude_unset=True,
+        responses={
+            200: {"description": "Success - returns the IDs of each chunk and whether they were deleted"},
+            400: {"description": "Bad request - Something was wrong with the request"},
+            401: {"description": "Unauthorized - No session ID found in HTTP Auth. header"},
+            403: {"description": "Forbidden - The session ID provided is invalid"},
+        },
+    )
+    async def delete(
+        request: Request,
+        body: Optional[BatchRequest] = None,
+        where: List[Json] = WhereQuery,  # pylint:disable=unused-argument
+    ):
+        session_id = get_session_id_from_auth_header(request)
+        filters = get_filters_from_query_string(request, "datagateway_api")
+        if (body is None) == (not filters):
+            raise BadRequestError("Either a list of IDs or where filters must be given (but not both)")
+
+        if body is not None:
+            return await icat_executor.run(python_icat.delete_with_ids, session_id, entity_name, body.ids, **kwargs)
+
+        return await icat_executor.run(python_icat.delete_with_filters, session_id, entity_name, filters, **kwargs)
+
+
+def get_batch_endpoint(
+    router: APIRouter,
+    endpoint_name: str,
+    entity_name: str,
+    dg_models: dict[str, Type[BaseModel]],
+    python_icat: PythonICAT,
+    **kwargs,
+) -> None:
+    """
+    Given an entity endpoint_name, register batch FastAPI endpoints on the provided
+    APIRouter.
+
+    It registers GET and POST handlers that return the entities matching a list of IDs,
+    the POST handler taking the IDs in the request body for lists too long for a URL.
+
+    :param router: FastAPI APIRouter to register endpoints on
+    :param endpoint_name: The plural of the entity_name used for the API route and documentation (e.g. "Datasets").
+    :param entity_name: The ICAT entity name used for backend queries and model selection (e.g. "Dataset").
+    :param dg_models: Dictionary mapping entity names to their corresponding DataGateway Pydantic models
+    :param python_icat: The python ICAT instance used for processing requests
+    """
+    icat_executor = get_icat_executor()
+    batch_response_model = create_model(
+        f"{entity_name}Batch",
+        results=(List[dg_models[entity_name]], ...),
+        missing=(List[int], ...),
+    )
+    batch_responses = {
+        200: {
+            "description": (
+                f"Success - the {entity_name} objects matching the IDs (in the order the IDs were given) and the IDs"
+                " with no matching object"
+            ),
+        },
+        400: {"description": "Bad request - Something was wrong with the request"},
+        401: {"description": "Unauthorized - No session ID found in HTTP Auth. header"},
+        403: {"description": "Forbidden - The session ID provided is invalid"},
+    }
+
+    async def get_batch(request: Request, ids: List[int]):
+        return await icat_executor.run(
+            python_icat.get_with_ids,
+            get_session_id_from_auth_header(request),
+            entity_name,
+            ids,
+            **kwargs,
+        )
+
+    @router.get(
+        "/batch",
+        summary=f"Find the {endpoint_name} matching the given IDs",
+        description=f"Retrieves the {entity_name} objects matching a list of IDs using a single request to ICAT",
+        response_model=batch_response_model,
+        response_model_exclude_unset=True,
+        responses=batch_responses,
+    )
+    async def get(
+        request: Request,
+        ids: Annotated[List[int], Query(description="The IDs of the entities to retrieve e.g. `?ids=1&ids=2`")],
+    ):
+        return await get_batch(request, ids)
+
+    @router.post(
+        "/batch",
+        summary=f"Find the {endpoint_name} matching the given IDs",
+        description=(
+            f"Retrieves the {entity_name} objects matching a list of IDs given in the request body, for lists of IDs"
+            " too long to be given in the URL"
+        ),
+        response_model=batch_response_model,
+        response_model_exclude_unset=True,
+        responses=batch_responses,
+    )
+    async def post(body: BatchRequest, request: Request):
+        return await get_batch(request, body.ids)
+
+
+def get_ingest_endpoint(
+    router: APIRouter,
+    endpoint_name: str,
+    entity_name: str,
+    dg_models: dict[str, Type[BaseModel]],
+    python_icat: PythonICAT,
+    **kwargs,
+) -> None:
+    """
+    Given an entity endpoint_name, register an ingest FastAPI endpoint on the provided
+    APIRouter.
+
+    It registers a POST handler that creates the entities of an NDJSON request body in
+    batches while the body is still being received, streaming back the result of each
+    batch (see `ingest_ndjson_records()`).
+
+    :param router: FastAPI APIRouter to register endpoints on
+    :param endpoint_name: The plural of the entity_name used for the API route and documentation (e.g. "Datasets").
+    :param entity_name: The ICAT entity name used for backend queries and model selection (e.g. "Dataset").
+    :param dg_models: Dictionary mapping entity names to their corresponding DataGateway Pydantic models
+    :param python_icat: The python ICAT instance used for processing requests
+    """
+    icat_executor = get_icat_executor()
+    post_model = dg_models[f"{entity_name}Post"]
+
+    def parse_record(record):
+        return post_model.model_validate(record).model_dump(by_alias=True)
+
+    @router.post(
+        "/ingest",
+        summary=f"Ingest {endpoint_name}",
+        description=(
+            f"Creates the {entity_name} objects given as NDJSON (one object per line) in the request body. Objects are"
+            " created in batches while the body is being uploaded and the result of each batch (the IDs of the"
+            " created objects, or the error that stopped the batch from being created) is streamed back as NDJSON"
+        ),
+        response_model=List[IngestBatchResult],
+        response_model_exclude_unset=True,
+        responses={
+            200: {"description": "Success - streams the result of each batch", "content": {NDJSON_MEDIA_TYPE: {}}},
+            400: {"description": "Bad request - Something was wrong with the request"},
+            401: {"description": "Unauthorized - No session ID found in HTTP Auth. header"},
+            403: {"description": "Forbidden - The session ID provided is invalid"},
+        },
+        openapi_extra={
+            "requestBody": {
+                "required": True,
+                # Each line of the body is an object of the entity's POST model, which is
+                # in the schema's components as it's used by the POST endpoint
+                "content": {NDJSON_MEDIA_TYPE: {"schema": {"$ref": f"#/components/schemas/{entity_name}Post"}}},
+            },
+        },
+    )
+    async def ingest(request: Request):
+        session_id = get_session_id_from_auth_header(request)
+        if NDJSON_MEDIA_TYPE not in request.headers.get("Content-Type", ""):
+            raise BadRequestError(f"The request body must be given as {NDJSON_MEDIA_TYPE}")
+
+        return await create_ndjson_ingest_response(
+            ingest_ndjson_records(
+                icat_executor,
+                request.stream(),
+                parse_record,
+                lambda records: python_icat.create_batch(session_id, entity_name, records, **kwargs),
+                Config.config.datagateway_api.write_batch_size,
+            ),
+        )
+
 
 def get_id_endpoint(
     router: APIRouter,
@@ -285,6 +556,7 @@ def get_id_endpoint(
     :param dg_models: Dictionary mapping entity names to their corresponding DataGateway Pydantic models
     :param python_icat: The python ICAT instance used for processing requests
     """
+    icat_executor = get_icat_executor()
 
     @router.get(
         "/{id_}",
@@ -300,11 +572,12 @@ def get_id_endpoint(
             404: {"description": "No such record - Unable to find a record in ICAT"},
         },
     )
-    def get(
+    async def get(
         request: Request,
         id_: Annotated[int, Path(description="The id of the entity to retrieve")],
     ):
-        return python_icat.get_with_id(
+        return await icat_executor.run(
+            python_icat.get_with_id,
             get_session_id_from_auth_header(request),
             entity_name,
             id_,
@@ -324,11 +597,12 @@ def get_id_endpoint(
             404: {"description": "No such record - Unable to find a record in ICAT"},
         },
     )
-    def delete(
+    async def delete(
         request: Request,
         id_: Annotated[int, Path(description="The id of the entity to delete")],
     ):
-        python_icat.delete_with_id(
+        await icat_executor.run(
+            python_icat.delete_with_id,
             get_session_id_from_auth_header(request),
             entity_name,
             id_,
@@ -349,28 +623,22 @@ def get_id_endpoint(
             404: {"description": "No such record - Unable to find a record in ICAT"},
         },
     )
-    def patch(
+    async def patch(
         body: dg_models[f"{entity_name}Post"],  # noqa: F821
         request: Request,
         id_: Annotated[int, Path(description="The id of the entity to update")],
     ):
-        session_id = get_session_id_from_auth_header(request)
-
-        python_icat.update_with_id(
-            session_id,
+        # The updated entity is read back by `update_with_id()`, so it isn't requested
+        # again here
+        return await icat_executor.run(
+            python_icat.update_with_id,
+            get_session_id_from_auth_header(request),
             entity_name,
             id_,
             body.model_dump(by_alias=True),
             **kwargs,
         )
 
-        return python_icat.get_with_id(
-            session_id,
-            entity_name,
-            id_,
-            **kwargs,
-        )
-
 
 def get_count_endpoint(
     router: APIRouter,
@@ -391,6 +659,7 @@ def get_count_endpoint(
     :param entity_name: The ICAT entity name used for backend queries and model selection (e.g. "Dataset").
     :param python_icat: The python ICAT instance used for processing requests
     """
+    icat_executor = get_icat_executor()
 
     @router.get(
         "/count",
@@ -407,7 +676,7 @@ def get_count_endpoint(
             404: {"description": "No such record - Unable to find a record in ICAT"},
         },
     )
-    def get(
+    async def get(
         request: Request,
         where: List[Json] = WhereQuery,  # pylint:disable=unused-argument
         distinct: List[str] = DistinctQuery,  # pylint:disable=unused-argument
@@ -415,7 +684,8 @@ def get_count_endpoint(
     ):
         filters = get_filters_from_query_string(request, "datagateway_api")
 
-        return python_icat.count_with_filters(
+        return await icat_executor.run(
+            python_icat.count_with_filters,
             get_session_id_from_auth_header(request),
             entity_name,
             filters,
@@ -442,6 +712,7 @@ def get_find_one_endpoint(
     :param dg_models: Dictionary mapping entity names to their corresponding DataGateway Pydantic models
     :param python_icat: The python ICAT instance used for processing requests
     """
+    icat_executor = get_icat_executor()
 
     @router.get(
         "/findone",
@@ -457,7 +728,7 @@ def get_find_one_endpoint(
             404: {"description": "No such record - Unable to find a record in ICAT"},
         },
     )
-    def get(
+    async def get(
         request: Request,
         where: List[Json] = WhereQuery,  # pylint:disable=unused-argument
         order: List[str] = OrderQuery,  # pylint:disable=unused-argument
@@ -468,7 +739,8 @@ def get_find_one_endpoint(
     ):
         filters = get_filters_from_query_string(request, "datagateway_api")
 
-        return python_icat.get_one_with_filters(
+        return await icat_executor.run(
+            python_icat.get_one_with_filters,
             get_session_id_from_auth_header(request),
             entity_name,
             filters,
@@ -507,6 +779,8 @@ def create_collection_router(
     get_endpoint(router, endpoint_name, entity_name, dg_models, python_icat, **kwargs)
     get_count_endpoint(router, endpoint_name, entity_name, python_icat, **kwargs)
     get_find_one_endpoint(router, entity_name, dg_models, python_icat, **kwargs)
+    get_batch_endpoint(router, endpoint_name, entity_name, dg_models, python_icat, **kwargs)
+    get_ingest_endpoint(router, endpoint_name, entity_name, dg_models, python_icat, **kwargs)
     get_id_endpoint(router, endpoint_name, entity_name, dg_models, python_icat, **kwargs)
 
     return router
@@ -3,6 +3,7 @@ from typing import Literal
 from fastapi import APIRouter, HTTPException
 
 from datagateway_api.common.constants import Constants
+from datagateway_api.common.icat_executor import get_icat_executor
 
 
 def ping_endpoint(python_icat, **kwargs) -> APIRouter:
@@ -17,6 +18,7 @@ def ping_endpoint(python_icat, **kwargs) -> APIRouter:
     """
 
     router = APIRouter(prefix="/ping", tags=["Ping"])
+    icat_executor = get_icat_executor()
 
     @router.get(
         "",
@@ -32,9 +34,9 @@ def ping_endpoint(python_icat, **kwargs) -> APIRouter:
             500: {"description": "Pinging the API's connection method has gone wrong"},
         },
     )
-    def ping():
+    async def ping():
         try:
-            return python_icat.ping(**kwargs)
+            return await icat_executor.run(python_icat.ping, **kwargs)
         except Exception as exc:
             raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -7,6 +7,7 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from datagateway_api.auth.session_bearer import SessionBearer
 from datagateway_api.common.helpers import get_session_id_from_auth_header
+from datagateway_api.common.icat_executor import get_icat_executor
 
 log = logging.getLogger()
 
@@ -43,6 +44,7 @@ def sessions_endpoints(python_icat, **kwargs) -> APIRouter:
     router = APIRouter(prefix="/sessions", tags=["Sessions"])
 
     session_auth = SessionBearer()
+    icat_executor = get_icat_executor()
 
     @router.post(
         "",
@@ -58,12 +60,12 @@ def sessions_endpoints(python_icat, **kwargs) -> APIRouter:
             403: {"description": "Forbidden - User credentials were invalid"},
         },
     )
-    def post(request: LoginRequest):
+    async def post(request: LoginRequest):
         """
         Generates a sessionID if the user has correct credentials
         :return: String - SessionID
         """
-        return {"sessionID": python_icat.login(request.model_dump(), **kwargs)}
+        return {"sessionID": await icat_executor.run(python_icat.login, request.model_dump(), **kwargs)}
 
     @router.delete(
         "",
@@ -78,13 +80,13 @@ def sessions_endpoints(python_icat, **kwargs) -> APIRouter:
             404: {"description": "Not Found - Unable to find session ID"},
         },
     )
-    def delete(request: Request, _: Annotated[str, Depends(session_auth)]):
+    async def delete(request: Request, _: Annotated[str, Depends(session_auth)]):
         """
         Deletes a users sessionID when they logout
         :return: Blank response, 200
         """
 
-        python_icat.logout(get_session_id_from_auth_header(request), **kwargs)
+        await icat_executor.run(python_icat.logout, get_session_id_from_auth_header(request), **kwargs)
         return ""
 
     @router.get(
@@ -109,12 +111,16 @@ def sessions_endpoints(python_icat, **kwargs) -> APIRouter:
             403: {"description": "Forbidden - The session ID provided is invalid"},
         },
     )
-    def get(request: Request, _: Annotated[str, Depends(session_auth)]):
+    async def get(request: Request, _: Annotated[str, Depends(session_auth)]):
         """
         Gives details of a user's session
         :return: Session details
         """
-        return python_icat.get_session_details(get_session_id_from_auth_header(request), **kwargs)
+        return await icat_executor.run(
+            python_icat.get_session_details,
+            get_session_id_from_auth_header(request),
+            **kwargs,
+        )
 
     @router.put(
         "",
@@ -129,13 +135,13 @@ def sessions_endpoints(python_icat, **kwargs) -> APIRouter:
             403: {"description": "Forbidden - The session ID provided is invalid"},
         },
     )
-    def put(request: Request, _: Annotated[str, Depends(session_auth)]):
+    async def put(request: Request, _: Annotated[str, Depends(session_auth)]):
         """
         Refreshes a user's session
         :return: The session ID that has been refreshed
         """
 
-        python_icat.refresh(get_session_id_from_auth_header(request), **kwargs)
+        await icat_executor.run(python_icat.refresh, get_session_id_from_auth_header(request), **kwargs)
         return ""
 
     return router
@@ -21,13 +21,10 @@ class SearchAPIWhereFilter(PythonICATWhereFilter):
         self.search_api_query = search_api_query
         super().__init__(field, value, operation)
 
-        # Detect various datetime formats and convert them into a format that ICAT can
-        # understand
-        if (
-            self.field in PaNOSCAttribute._datetime_field_names
-            and isinstance(self.value, str)
-            and DateHandler.is_str_a_date(self.value)
-        ):
+        # Convert the values of date fields into a format that ICAT can understand. The
+        # schema is used to determine which fields are dates, rather than checking
+        # whether every string value looks like a date
+        if self.field in PaNOSCAttribute._datetime_field_names and isinstance(self.value, str):
             value_datetime = DateHandler.str_to_datetime_object(value)
             str_datetime = DateHandler.datetime_object_to_str(value_datetime)
             # +/- need to be removed so the format works when querying ICAT
@@ -75,6 +72,8 @@ class SearchAPIWhereFilter(PythonICATWhereFilter):
                     elif isinstance(filter_value, datetime):
                         icat_field_name = icat_field_name[2]
                     elif isinstance(filter_value, str):
+                        # Parameter values can be stored as any of the types, so only
+                        # ISO 8601 dates are searched for as dates
                         if DateHandler.is_str_a_date(filter_value):
                             icat_field_name = icat_field_name[2]
                         else:
@@ -1,9 +1,13 @@
+from copy import deepcopy
 from functools import wraps
+import inspect
 import json
 import logging
 
 from pydantic import ValidationError
 
+from datagateway_api.common.config import Config
+from datagateway_api.common.count_cache import CountCache
 from datagateway_api.common.exceptions import (
     BadRequestError,
     MissingRecordError,
@@ -24,6 +28,18 @@ from datagateway_api.search_api.session_handler import (
 
 log = logging.getLogger()
 
+count_cache_config = Config.config.search_api.count_cache if Config.config.search_api else None
+count_cache = (
+    CountCache(
+        "search_api",
+        count_cache_config.maxsize,
+        count_cache_config.soft_ttl,
+        count_cache_config.hard_ttl,
+    )
+    if count_cache_config and count_cache_config.enabled
+    else None
+)
+
 
 def search_api_error_handling(method):
     """
@@ -39,16 +55,25 @@ def search_api_error_handling(method):
     def wrapper_error_handling(*args, **kwargs):
         try:
             return method(*args, **kwargs)
-        except (ValidationError, ScoringAPIError) as e:
-            log.exception(msg=e.args)
+        except Exception as e:
+            raise_search_api_error(e)
+
+    @wraps(method)
+    async def async_wrapper_error_handling(*args, **kwargs):
+        try:
+            return await method(*args, **kwargs)
+        except Exception as e:
+            raise_search_api_error(e)
+
+    def raise_search_api_error(e):
+        log.exception(msg=e.args)
+        if isinstance(e, (ValidationError, ScoringAPIError)):
             assign_status_code(e, 500)
             raise SearchAPIError(create_error_message(e)) from e
-        except (ValueError, TypeError, AttributeError, KeyError) as e:
-            log.exception(msg=e.args)
+        elif isinstance(e, (ValueError, TypeError, AttributeError, KeyError)):
             assign_status_code(e, 400)
             raise BadRequestError(create_error_message(e)) from e
-        except Exception as e:
-            log.exception(msg=e.args)
+        else:
             # Defensively assign a 500 if the exception doesn't already have a status
             # code
             assign_status_code(e, 500)
@@ -71,6 +96,8 @@ def search_api_error_handling(method):
             },
         }
 
+    if inspect.iscoroutinefunction(method):
+        return async_wrapper_error_handling
     return wrapper_error_handling
 
 
@@ -161,6 +188,9 @@ def get_count(entity_name, filters):
     Get the number of results of a given entity, with filters provided in the request to
     restrict the search
 
+    If the count cache is enabled, cached counts are served and refreshed in the
+    background once they're stale (see `CountCache`)
+
     :param entity_name: Name of the entity requested to query against
     :type entity_name: :class:`str`
     :param filters: The list of Search API filters to be applied to the request/query
@@ -171,6 +201,33 @@ def get_count(entity_name, filters):
     log.info("Getting number of results for %s, using request's filters", entity_name)
     log.debug("Entity Name: %s, Filters: %s", entity_name, filters)
 
+    if count_cache is None:
+        return {"count": execute_count_query(entity_name, filters)}
+
+    # The key is created (and filters copied) before the count is made as applying
+    # filters to a query modifies them. Every request uses the same (anonymous) user so
+    # the user isn't part of the key
+    key = (entity_name, get_count_cache_key(filters))
+    refresh_filters = deepcopy(filters)
+    count = count_cache.get_or_count(
+        key,
+        lambda: execute_count_query(entity_name, filters),
+        client_manager(lambda: execute_count_query(entity_name, refresh_filters)),
+    )
+
+    return {"count": count}
+
+
+def execute_count_query(entity_name, filters):
+    """
+    Build and execute the count query of a given entity, using the request's filters
+
+    :param entity_name: Name of the entity requested to query against
+    :type entity_name: :class:`str`
+    :param filters: The list of Search API filters to be applied to the request/query
+    :type filters: List of specific implementation :class:`QueryFilter`
+    :return: The number of records returned from the query
+    """
     query = SearchAPIQuery(entity_name, aggregate="COUNT")
 
     filter_handler = FilterOrderHandler()
@@ -183,7 +240,35 @@ def get_count(entity_name, filters):
     log.debug("JPQL Query to be sent/executed in ICAT: %s", query.icat_query.query)
     icat_query_data = query.icat_query.execute_query(SessionHandler.client, True)
 
-    return {"count": icat_query_data[0]}
+    return icat_query_data[0]
+
+
+def get_count_cache_key(filters):
+    """
+    Convert a request's filters into a hashable form, used in the key of the count
+    cache. Nested filters are converted recursively and references to the query the
+    filters have been applied to are left out
+
+    :param filters: The list of Search API filters to be applied to the request/query
+    :type filters: List of specific implementation :class:`QueryFilter`
+    :return: JSON string representing the filters
+    """
+
+    def normalise_filter(query_filter):
+        try:
+            attributes = vars(query_filter)
+        except TypeError:
+            return str(query_filter)
+        return [
+            type(query_filter).__name__,
+            {name: value for name, value in attributes.items() if name != "search_api_query"},
+        ]
+
+    return json.dumps(
+        [normalise_filter(query_filter) for query_filter in filters],
+        sort_keys=True,
+        default=normalise_filter,
+    )
 
 
 @client_manager
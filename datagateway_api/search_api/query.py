@@ -50,6 +50,7 @@ class SearchAPIICATQuery(ICATQuery):
             )
 
             self.query.manual_count = False
+            self.query.result_order = []
         except ValueError as e:
             raise SearchAPIError(
                 f"An issue has occurred while creating a query for ICAT: {e}",
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Path, Query, Request
 from pydantic import BaseModel
 
 from datagateway_api.common.helpers import get_filters_from_query_string
+from datagateway_api.common.icat_executor import get_icat_executor
 from datagateway_api.search_api import models as search_api_models
 from datagateway_api.search_api.filters import SearchAPIScoringFilter
 from datagateway_api.search_api.helpers import (
@@ -143,7 +144,7 @@ def get_search_endpoint(
         },
     )
     @search_api_error_handling
-    def get(
+    async def get(
         request: Request,
         filter_: str = FilterQuery,  # pylint:disable=unused-argument
     ):
@@ -153,14 +154,17 @@ def get_search_endpoint(
             entity_name,
         )
 
-        results = get_search(entity_name, filters)
+        def search():
+            results = get_search(entity_name, filters)
 
-        for possible_scoring_filter in filters:
-            if isinstance(possible_scoring_filter, SearchAPIScoringFilter):
-                scores = SearchScoring.get_score(possible_scoring_filter.value)
-                return SearchScoring.add_scores_to_results(results, scores)
+            for possible_scoring_filter in filters:
+                if isinstance(possible_scoring_filter, SearchAPIScoringFilter):
+                    scores = SearchScoring.get_score(possible_scoring_filter.value)
+                    return SearchScoring.add_scores_to_results(results, scores)
 
-        return results
+            return results
+
+        return await get_icat_executor("search_api").run(search)
 
 
 def get_single_endpoint(
@@ -188,7 +192,7 @@ def get_single_endpoint(
         },
     )
     @search_api_error_handling
-    def get(
+    async def get(
         request: Request,
         pid: Annotated[str, Path(description="The pid of the entity to retrieve")],
         filter_: str = FilterQuery,  # pylint:disable=unused-argument
@@ -200,7 +204,7 @@ def get_single_endpoint(
         )
         log.debug("Filters: %s", filters)
 
-        return get_with_pid(entity_name, pid, filters)
+        return await get_icat_executor("search_api").run(get_with_pid, entity_name, pid, filters)
 
 
 def get_number_count_endpoint(
@@ -228,7 +232,7 @@ def get_number_count_endpoint(
         },
     )
     @search_api_error_handling
-    def get(
+    async def get(
         request: Request,
         where: Any = WhereQuery,  # pylint:disable=unused-argument
     ):
@@ -239,7 +243,7 @@ def get_number_count_endpoint(
         )
         log.debug("Filters: %s", filters)
 
-        return get_count(entity_name, filters)
+        return await get_icat_executor("search_api").run(get_count, entity_name, filters)
 
 
 def get_files_endpoint(router: APIRouter, entity_name: str) -> None:
@@ -262,7 +266,7 @@ def get_files_endpoint(router: APIRouter, entity_name: str) -> None:
         },
     )
     @search_api_error_handling
-    def get(
+    async def get(
         request: Request,
         pid: Annotated[str, Path(description="The pid of the entity to retrieve")],
         filter_: str = FilterQuery,  # pylint:disable=unused-argument
@@ -274,7 +278,7 @@ def get_files_endpoint(router: APIRouter, entity_name: str) -> None:
         )
         log.debug("Filters: %s", filters)
 
-        return get_files(entity_name, pid, filters)
+        return await get_icat_executor("search_api").run(get_files, entity_name, pid, filters)
 
 
 def get_number_count_files_endpoint(
@@ -303,7 +307,7 @@ def get_number_count_files_endpoint(
         },
     )
     @search_api_error_handling
-    def get(
+    async def get(
         request: Request,
         pid: Annotated[str, Path(description="The pid of the entity to retrieve")],
         where: Any = WhereQuery,  # pylint:disable=unused-argument
@@ -315,7 +319,7 @@ def get_number_count_files_endpoint(
         )
         log.debug("Filters: %s", filters)
 
-        return get_files_count(entity_name, filters, pid)
+        return await get_icat_executor("search_api").run(get_files_count, entity_name, filters, pid)
 
 
 def create_search_collection_router(
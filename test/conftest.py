@@ -1,15 +1,15 @@
 import json
 from unittest.mock import mock_open, patch
 
-from icat.query import Query
 import pytest
 
 from datagateway_api.common.config import APIConfig
+from datagateway_api.datagateway_api.icat.query import ICATQuery
 
 
 @pytest.fixture()
 def icat_query(icat_client):
-    return Query(icat_client, "Investigation")
+    return ICATQuery(icat_client, "Investigation").query
 
 
 @pytest.fixture()
@@ -27,7 +27,6 @@ def test_config_data():
     return {
         "datagateway_api": {
             "extension": "/datagateway-api",
-            "client_cache_size": 5,
             "client_pool_init_size": 2,
             "client_pool_max_size": 5,
             "icat_url": "https://localhost:8181",
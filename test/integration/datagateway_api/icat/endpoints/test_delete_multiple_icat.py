@@ -0,0 +1,60 @@
+class TestDeleteMultiple:
+    def test_valid_delete_with_ids(
+        self,
+        test_client,
+        valid_icat_credentials_header,
+        single_investigation_test_data,
+    ):
+        test_data_id = single_investigation_test_data[0]["id"]
+
+        test_response = test_client.request(
+            "DELETE",
+            "/datagateway-api/investigations",
+            headers=valid_icat_credentials_header,
+            json={"ids": [test_data_id]},
+        )
+
+        assert test_response.json() == [{"ids": [test_data_id], "deleted": True}]
+
+    def test_valid_delete_with_where_filter(
+        self,
+        test_client,
+        valid_icat_credentials_header,
+        single_investigation_test_data,
+    ):
+        test_response = test_client.delete(
+            '/datagateway-api/investigations?where={"title": {"like": "Test data for Python ICAT on DataGateway API"}}',
+            headers=valid_icat_credentials_header,
+        )
+
+        assert test_response.json() == [{"ids": [single_investigation_test_data[0]["id"]], "deleted": True}]
+
+    def test_invalid_delete_with_ids(
+        self,
+        test_client,
+        valid_icat_credentials_header,
+    ):
+        """Request with a non-existent ID, reported as a failed chunk"""
+
+        final_investigation_result = test_client.get(
+            '/datagateway-api/investigations/findone?order="id DESC"',
+            headers=valid_icat_credentials_header,
+        )
+        test_data_id = final_investigation_result.json()["id"]
+
+        test_response = test_client.request(
+            "DELETE",
+            "/datagateway-api/investigations",
+            headers=valid_icat_credentials_header,
+            json={"ids": [test_data_id + 100]},
+        )
+
+        assert test_response.json()[0]["deleted"] is False
+
+    def test_invalid_delete_without_ids_or_filters(self, test_client, valid_icat_credentials_header):
+        test_response = test_client.delete(
+            "/datagateway-api/investigations",
+            headers=valid_icat_credentials_header,
+        )
+
+        assert test_response.status_code == 400
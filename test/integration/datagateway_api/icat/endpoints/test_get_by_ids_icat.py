@@ -0,0 +1,60 @@
+from test.integration.datagateway_api.icat.test_query import (
+    prepare_icat_data_for_assertion,
+)
+
+
+class TestICATGetByIDs:
+    def test_valid_get_with_ids(
+        self,
+        test_client,
+        valid_icat_credentials_header,
+        multiple_investigation_test_data,
+    ):
+        investigation_data = test_client.get(
+            '/datagateway-api/investigations?where={"title": {"like": "Test data for Python ICAT on DataGateway API"}}'
+            '&order="id DESC"',
+            headers=valid_icat_credentials_header,
+        )
+        test_data_ids = [investigation["id"] for investigation in investigation_data.json()]
+        missing_id = max(test_data_ids) + 100
+
+        test_response = test_client.get(
+            f"/datagateway-api/investigations/batch?ids={test_data_ids[1]}&ids={missing_id}&ids={test_data_ids[0]}",
+            headers=valid_icat_credentials_header,
+        )
+
+        assert [investigation["id"] for investigation in test_response.json()["results"]] == [
+            test_data_ids[1],
+            test_data_ids[0],
+        ]
+        assert test_response.json()["missing"] == [missing_id]
+
+    def test_valid_post_with_ids(
+        self,
+        test_client,
+        valid_icat_credentials_header,
+        single_investigation_test_data,
+    ):
+        investigation_data = test_client.get(
+            '/datagateway-api/investigations?where={"title": {"like": "Test data for Python ICAT on DataGateway API"}}',
+            headers=valid_icat_credentials_header,
+        )
+        test_data_id = investigation_data.json()[0]["id"]
+
+        test_response = test_client.post(
+            "/datagateway-api/investigations/batch",
+            headers=valid_icat_credentials_header,
+            json={"ids": [test_data_id]},
+        )
+        response_json = prepare_icat_data_for_assertion(test_response.json()["results"])
+
+        assert response_json == single_investigation_test_data
+        assert test_response.json()["missing"] == []
+
+    def test_invalid_ids(self, test_client, valid_icat_credentials_header):
+        test_response = test_client.get(
+            "/datagateway-api/investigations/batch?ids=invalid",
+            headers=valid_icat_credentials_header,
+        )
+
+        assert test_response.status_code == 422
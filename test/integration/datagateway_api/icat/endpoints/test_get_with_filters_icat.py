@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from test.integration.datagateway_api.icat.test_query import (
@@ -74,3 +76,66 @@ class TestICATGetWithFilters:
             filter_count += 1
 
         assert response_json == filtered_investigation_data
+
+    @pytest.mark.parametrize(
+        "query_string, headers",
+        [
+            pytest.param("&stream=true", {}, id="stream query parameter"),
+            pytest.param("", {"Accept": "application/x-ndjson"}, id="ndjson accept header"),
+        ],
+    )
+    def test_valid_stream_get_with_filters(
+        self,
+        test_client,
+        valid_icat_credentials_header,
+        multiple_investigation_test_data,
+        query_string,
+        headers,
+    ):
+        test_response = test_client.get(
+            '/datagateway-api/investigations?where={"title": {"like": "Test data for Python ICAT on DataGateway API"}}'
+            f'&order="id ASC"{query_string}',
+            headers={**valid_icat_credentials_header, **headers},
+        )
+
+        assert test_response.headers["content-type"] == "application/x-ndjson"
+        response_json = prepare_icat_data_for_assertion(
+            [json.loads(line) for line in test_response.text.splitlines()],
+        )
+
+        assert response_json == multiple_investigation_test_data
+
+    def test_valid_cursor_get_with_filters(
+        self,
+        test_client,
+        valid_icat_credentials_header,
+        multiple_investigation_test_data,
+    ):
+        response_json = []
+        cursor = ""
+        while cursor is not None:
+            test_response = test_client.get(
+                '/datagateway-api/investigations?where={"title": {"like": "Test data for Python ICAT on DataGateway'
+                f' API"}}}}&order="name asc"&limit=2&cursor={cursor}',
+                headers=valid_icat_credentials_header,
+            )
+            response_json.extend(prepare_icat_data_for_assertion(test_response.json()))
+            cursor = test_response.headers.get("X-Next-Cursor")
+
+        expected_data = sorted(multiple_investigation_test_data, key=lambda investigation: investigation["name"])
+        assert response_json == expected_data
+
+    @pytest.mark.parametrize(
+        "query_string, headers",
+        [
+            pytest.param("&stream=true", {}, id="stream query parameter"),
+            pytest.param("", {"Accept": "application/x-ndjson"}, id="ndjson accept header"),
+        ],
+    )
+    def test_cursor_with_stream_rejected(self, test_client, valid_icat_credentials_header, query_string, headers):
+        test_response = test_client.get(
+            f"/datagateway-api/investigations?limit=2&cursor={query_string}",
+            headers={**valid_icat_credentials_header, **headers},
+        )
+
+        assert test_response.status_code == 400
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from datagateway_api.common.ndjson import NDJSON_MEDIA_TYPE
+from test.integration.datagateway_api.icat.endpoints.test_create_icat import TestICATCreateData
+
+
+class TestIngest:
+    @pytest.mark.usefixtures("remove_test_created_investigation_data")
+    def test_valid_ingest(self, test_client, valid_icat_credentials_header):
+        investigations = [
+            {
+                "name": f"{TestICATCreateData.investigation_name_prefix} Ingest {i}",
+                "title": "Test data for Python ICAT on DataGateway API",
+                "visitId": "Data Ingest Visit",
+                "facility": 1,
+                "type": 1,
+            }
+            for i in range(3)
+        ]
+
+        test_response = test_client.post(
+            "/datagateway-api/investigations/ingest",
+            headers={**valid_icat_credentials_header, "Content-Type": NDJSON_MEDIA_TYPE},
+            content="".join(f"{json.dumps(investigation)}\n" for investigation in investigations),
+        )
+
+        results = [json.loads(line) for line in test_response.text.splitlines()]
+        created_ids = [id_ for result in results for id_ in result["ids"]]
+        assert test_response.status_code == 200
+        assert len(created_ids) == 3
+
+        created_data = test_client.get(
+            "/datagateway-api/investigations/batch",
+            params={"ids": created_ids},
+            headers=valid_icat_credentials_header,
+        )
+        assert [investigation["name"] for investigation in created_data.json()["results"]] == [
+            investigation["name"] for investigation in investigations
+        ]
+
+    def test_invalid_line_reported(self, test_client, valid_icat_credentials_header):
+        test_response = test_client.post(
+            "/datagateway-api/investigations/ingest",
+            headers={**valid_icat_credentials_header, "Content-Type": NDJSON_MEDIA_TYPE},
+            content="not json\n",
+        )
+
+        assert test_response.status_code == 200
+        assert "error" in json.loads(test_response.text)
+
+    def test_invalid_content_type(self, test_client, valid_icat_credentials_header):
+        test_response = test_client.post(
+            "/datagateway-api/investigations/ingest",
+            headers=valid_icat_credentials_header,
+            json=[],
+        )
+
+        assert test_response.status_code == 400
@@ -16,8 +16,6 @@ class TestICATOrderFilter:
 
         assert test_filter.direction == "ASC"
 
-        filter_handler.clear_python_icat_order_filters()
-
     def test_result_order_appended(self, icat_query):
         id_filter = PythonICATOrderFilter("id", "ASC")
         title_filter = PythonICATOrderFilter("title", "DESC")
@@ -26,9 +24,7 @@ class TestICATOrderFilter:
         filter_handler.add_filters([id_filter, title_filter])
         filter_handler.apply_filters(icat_query)
 
-        assert PythonICATOrderFilter.result_order == [("id", "ASC"), ("title", "DESC")]
-
-        filter_handler.clear_python_icat_order_filters()
+        assert icat_query.result_order == [("id", "ASC"), ("title", "DESC")]
 
     def test_join_specs_added(self, icat_query):
         pid_filter = PythonICATOrderFilter("studyInvestigations.study.pid", "ASC")
@@ -41,15 +37,13 @@ class TestICATOrderFilter:
         filter_handler.add_filters([pid_filter, name_filter])
         filter_handler.apply_filters(icat_query)
 
-        assert PythonICATOrderFilter.join_specs == {
+        assert icat_query.join_specs == {
             "studyInvestigations": "LEFT JOIN",
             "studyInvestigations.study": "LEFT JOIN",
             "investigationInstruments": "LEFT JOIN",
             "investigationInstruments.instrument": "LEFT JOIN",
         }
 
-        filter_handler.clear_python_icat_order_filters()
-
     def test_valid_one_many_related_ordering(self, icat_query):
         pid_filter = PythonICATOrderFilter("studyInvestigations.study.pid", "DESC")
         filter_handler = FilterOrderHandler()
@@ -61,20 +55,16 @@ class TestICATOrderFilter:
             "studyInvestigations.study": "LEFT JOIN",
         }
 
-        filter_handler.clear_python_icat_order_filters()
-
     def test_invalid_one_many_related_ordering(self, icat_query):
         pid_filter = PythonICATOrderFilter("studyInvestigations.study.pid", "DESC")
         filter_handler = FilterOrderHandler()
         filter_handler.add_filter(pid_filter)
 
-        PythonICATOrderFilter.join_specs["testEntities"] = "LEFT JOIN"
+        icat_query.join_specs["testEntities"] = "LEFT JOIN"
 
         with pytest.raises(FilterError):
             filter_handler.apply_filters(icat_query)
 
-        filter_handler.clear_python_icat_order_filters()
-
     def test_filter_applied_to_query(self, icat_query):
         test_filter = PythonICATOrderFilter("id", "DESC")
 
@@ -84,8 +74,6 @@ class TestICATOrderFilter:
 
         assert icat_query.order == OrderedDict([("id", "%s DESC")])
 
-        filter_handler.clear_python_icat_order_filters()
-
     def test_invalid_field(self, icat_query):
         test_filter = PythonICATOrderFilter("unknown_field", "DESC")
 
@@ -94,8 +82,6 @@ class TestICATOrderFilter:
         with pytest.raises(FilterError):
             filter_handler.apply_filters(icat_query)
 
-        filter_handler.clear_python_icat_order_filters()
-
     def test_invalid_direction(self, icat_query):
         test_filter = PythonICATOrderFilter("id", "up")
 
@@ -22,6 +22,7 @@ class TestICATSkipFilter:
                 Config.config.datagateway_api.icat_check_cert,
             )["maxEntities"],
         )
+        assert icat_query.open_ended_limit
 
     @pytest.mark.parametrize(
         "skip_value",
@@ -322,6 +322,41 @@ class TestICATQuery:
 
         assert query_output_json[0] == single_investigation_test_data[0]
 
+    @pytest.mark.parametrize(
+        "skip_value, limit_value, chunk_size, expected_chunk_sizes",
+        [
+            pytest.param(None, None, 2, [2, 2, 1], id="multiple chunks"),
+            pytest.param(None, None, 10, [5], id="single chunk"),
+            pytest.param(1, 3, 2, [2, 1], id="limit and skip respected"),
+        ],
+    )
+    def test_valid_chunked_query_execution(
+        self,
+        icat_client,
+        multiple_investigation_test_data,
+        skip_value,
+        limit_value,
+        chunk_size,
+        expected_chunk_sizes,
+    ):
+        test_query = ICATQuery(icat_client, "Investigation")
+        PythonICATWhereFilter(
+            "title",
+            "Test data for Python ICAT on DataGateway API",
+            "like",
+        ).apply_filter(test_query.query)
+        if limit_value:
+            test_query.query.setLimit((skip_value, limit_value))
+
+        chunks = list(test_query.iter_query_chunks(icat_client, chunk_size))
+
+        assert [len(chunk) for chunk in chunks] == expected_chunk_sizes
+        query_data = prepare_icat_data_for_assertion([result for chunk in chunks for result in chunk])
+        expected_data = multiple_investigation_test_data
+        if limit_value:
+            expected_data = expected_data[skip_value : skip_value + limit_value]
+        assert query_data == expected_data
+
     def test_valid_get_distinct_attributes(self, icat_client):
         test_query = ICATQuery(icat_client, "Investigation")
         test_query.query.setAttributes(["summary", "name"])
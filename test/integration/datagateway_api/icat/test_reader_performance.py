@@ -1,6 +1,6 @@
-from datetime import datetime
-import time
+from datetime import datetime, timedelta
 from typing import Generator
+from unittest.mock import patch
 
 from icat.client import Client
 import pytest
@@ -17,6 +17,8 @@ from datagateway_api.datagateway_api.icat.helpers import (
     is_use_reader_for_performance_enabled,
 )
 from datagateway_api.datagateway_api.icat.icat_client_pool import ICATClient
+from datagateway_api.datagateway_api.icat.permission_cache import permission_cache
+from datagateway_api.datagateway_api.icat.reader_client_pool import reader_client_pool, ReaderClientPool
 from datagateway_api.datagateway_api.icat.reader_query_handler import (
     ReaderQueryHandler,
 )
@@ -101,6 +103,64 @@ def associate_data_publication(icat_client: Client) -> Generator[None, None, Non
             icat_client.delete(bean=data_collection)
 
 
+@pytest.fixture(scope="class")
+def associate_many_users(icat_client: Client) -> Generator[None, None, None]:
+    """
+    Make three users investigation users of dataset 8's investigation and instrument
+    scientists of one of its instruments, and put dataset 8 in three (not yet public)
+    data publications
+    """
+    entities = []
+    try:
+        dataset = icat_client.get("Dataset d INCLUDE d.investigation", 8)
+        facility = icat_client.get("Facility", 1)
+        users = [icat_client.new(obj="User", name=f"simple/verdict{i}") for i in range(3)]
+        for user in users:
+            user.create()
+            entities.append(user)
+
+        instrument = icat_client.new(obj="Instrument", name="verdict instrument", facility=facility)
+        instrument.create()
+        entities.insert(0, instrument)
+        icat_client.createMany(
+            beans=[
+                icat_client.new(
+                    obj="InvestigationInstrument",
+                    investigation=dataset.investigation,
+                    instrument=instrument,
+                ),
+                *(icat_client.new(obj="InstrumentScientist", instrument=instrument, user=user) for user in users),
+                *(
+                    icat_client.new(obj="InvestigationUser", role="", investigation=dataset.investigation, user=user)
+                    for user in users
+                ),
+            ],
+        )
+
+        data_collection = icat_client.new(
+            obj="DataCollection",
+            dataPublications=[
+                icat_client.new(
+                    obj="DataPublication",
+                    title="title",
+                    pid=f"verdict pid {i}",
+                    publicationDate=datetime.now() + timedelta(days=i + 1),
+                    facility=facility,
+                    type=icat_client.get("DataPublicationType", 1),
+                )
+                for i in range(3)
+            ],
+            dataCollectionDatasets=[icat_client.new(obj="DataCollectionDataset", dataset=dataset)],
+        )
+        data_collection.create()
+        entities.insert(0, data_collection)
+        yield
+    finally:
+        # Deleting the users and instrument cascades to their investigation users,
+        # instrument scientists and investigation instruments
+        icat_client.deleteMany(beans=entities)
+
+
 @pytest.fixture(scope="class")
 def icat_user_client() -> Client:
     client = Client(url=Config.config.datagateway_api.icat_url, checkCert=Config.config.datagateway_api.icat_check_cert)
@@ -122,6 +182,16 @@ def enable_reader_config() -> Generator[None, None, None]:
     Config.config = APIConfig.load()
 
 
+@pytest.fixture(scope="function")
+def enable_reader_parameter_config() -> Generator[None, None, None]:
+    Config.config.datagateway_api.use_reader_for_performance.enabled = True
+    Config.config.datagateway_api.use_reader_for_performance.entity_filter_fields.update(
+        {"DatafileParameter": "datafile.dataset.id", "Sample": "investigation.id"},
+    )
+    yield
+    Config.config = APIConfig.load()
+
+
 @pytest.fixture(scope="function")
 def enable_reader_bad_config() -> Generator[None, None, None]:
     Config.config.datagateway_api.use_reader_for_performance.enabled = True
@@ -156,6 +226,18 @@ class TestReaderPerformance:
                 True,
                 id="Typical use case with multiple query filters",
             ),
+            pytest.param(
+                "Datafile",
+                [PythonICATWhereFilter("dataset.id", [3, 4], "in")],
+                True,
+                id="Datafiles in many datasets",
+            ),
+            pytest.param(
+                "Datafile",
+                [PythonICATWhereFilter("dataset.id", [], "in")],
+                False,
+                id="Datafiles in no datasets",
+            ),
             pytest.param(
                 "Datafile",
                 [PythonICATLimitFilter(25)],
@@ -185,13 +267,33 @@ class TestReaderPerformance:
         query_eligbility = test_handler.is_query_eligible_for_reader_performance()
         assert query_eligbility == expected_eligbility
 
+    @pytest.mark.parametrize(
+        ["entity_type", "filters"],
+        [
+            pytest.param("DatafileParameter", [PythonICATWhereFilter("datafile.dataset.id", 2, "eq")]),
+            pytest.param("Sample", [PythonICATWhereFilter("investigation.id", [2, 3], "in")]),
+        ],
+    )
+    def test_configured_entity_types(
+        self,
+        enable_reader_parameter_config: None,
+        enable_reader_permissions: None,
+        associate_icat_user: None,
+        icat_user_client: Client,
+        entity_type: str,
+        filters: list[PythonICATWhereFilter],
+    ) -> None:
+        test_handler = ReaderQueryHandler(entity_type, filters)
+
+        assert test_handler.is_query_eligible_for_reader_performance()
+        assert test_handler.is_user_authorised_to_see_entity_id(icat_user_client)
+
     def test_reader_client(self, enable_reader_config: None):
-        ReaderQueryHandler("Datafile", [])
-        reader_client = ReaderQueryHandler.reader_client
-        assert isinstance(reader_client, ICATClient)
-        assert reader_client.getUserName() == (
-            f"{Config.config.datagateway_api.use_reader_for_performance.reader_mechanism}/{Config.config.datagateway_api.use_reader_for_performance.reader_username}"
-        )
+        with reader_client_pool.checkout() as reader_client:
+            assert isinstance(reader_client, ICATClient)
+            assert reader_client.getUserName() == (
+                f"{Config.config.datagateway_api.use_reader_for_performance.reader_mechanism}/{Config.config.datagateway_api.use_reader_for_performance.reader_username}"
+            )
 
     @pytest.mark.parametrize(
         ["entity_type", "filters", "results_length"],
@@ -204,6 +306,8 @@ class TestReaderPerformance:
             pytest.param("Datafile", [PythonICATWhereFilter("dataset.id", 3, "eq")], 16),
             pytest.param("Dataset", [PythonICATWhereFilter("investigation.id", 4, "eq")], 2),
             pytest.param("Datafile", [PythonICATWhereFilter("dataset.id", 4, "eq")], 16),
+            pytest.param("Dataset", [PythonICATWhereFilter("investigation.id", [2, 3], "in")], 4),
+            pytest.param("Datafile", [PythonICATWhereFilter("dataset.id", [2, 3], "in")], 32),
         ],
     )
     def test_execute_query_as_reader(
@@ -258,26 +362,58 @@ class TestReaderPerformance:
         results = get_data_with_filters(client=icat_root_client, entity_type=entity_type, filters=filters)
         assert len(results) == results_length
 
+    @pytest.mark.parametrize(
+        ["user_name", "expected_dataset_ids", "expected_queries"],
+        [
+            pytest.param("simple/verdict1", {8}, 1, id="Investigation user and instrument scientist"),
+            pytest.param("simple/icatuser", set(), 2, id="User not associated with the dataset"),
+        ],
+    )
+    def test_dataset_verdicts_with_many_users(
+        self,
+        enable_reader_config: None,
+        enable_reader_permissions: None,
+        associate_many_users: None,
+        user_name: str,
+        expected_dataset_ids: set,
+        expected_queries: int,
+    ) -> None:
+        results = []
+
+        def record_search(query):
+            results.append(reader_client_pool.run(lambda reader_client: reader_client.search(query)))
+            return results[-1]
+
+        permission_cache.clear()
+        with patch.object(ReaderQueryHandler, "search", side_effect=record_search):
+            assert ReaderQueryHandler.get_visible_dataset_ids(user_name, [8]) == expected_dataset_ids
+
+        # Without joining every combination of the three users, instrument scientists
+        # and publications, no query returns more than a row per publication
+        assert len(results) == expected_queries
+        assert all(len(rows) <= 3 for rows in results)
+
     def test_refresh(self, enable_reader_config: None) -> None:
-        client = Client(
-            url=Config.config.datagateway_api.icat_url,
-            checkCert=Config.config.datagateway_api.icat_check_cert,
-        )
-        client._next_refresh = 0
-        ReaderQueryHandler.reader_client = client
-        ReaderQueryHandler.refresh()
-        current_time = time.time()
-        assert current_time + 89 * 60 < ReaderQueryHandler.reader_client._next_refresh < current_time + 90 * 60
+        test_pool = ReaderClientPool(size=2, refresh_interval=0, checkout_timeout=5)
+        session_id = test_pool.login(expired_session_id=None)
+        test_pool.refresh()
+
+        with test_pool.checkout() as reader_client:
+            assert reader_client.sessionId == session_id
+            assert reader_client.getRemainingMinutes() > 89
+
+    def test_expired_session(self, enable_reader_config: None) -> None:
+        test_pool = ReaderClientPool(size=2, refresh_interval=0, checkout_timeout=5)
+        test_pool.session_id = "expired"
+
+        assert test_pool.run(lambda reader_client: reader_client.getUserName()).endswith("reader")
+        assert test_pool.session_id != "expired"
 
     def test_refresh_failure(self, enable_reader_bad_config: None) -> None:
-        client = Client(
-            url=Config.config.datagateway_api.icat_url,
-            checkCert=Config.config.datagateway_api.icat_check_cert,
-        )
-        client._next_refresh = 0
-        ReaderQueryHandler.reader_client = client
+        test_pool = ReaderClientPool(size=2, refresh_interval=0, checkout_timeout=5)
         with pytest.raises(PythonICATError, match="Internal error with reader account configuration"):
-            ReaderQueryHandler.refresh()
+            with test_pool.checkout():
+                pass
 
     def test_get_investigation_id_failure(self, enable_reader_config: None) -> None:
         with pytest.raises(expected_exception=MissingRecordError, match="No Dataset found for id=-1"):
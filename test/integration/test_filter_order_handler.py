@@ -11,9 +11,8 @@ from datagateway_api.search_api.filters import SearchAPIIncludeFilter
 
 class TestFilterOrderHandler:
     """
-    `merge_python_icat_limit_skip_filters` and`clear_python_icat_order_filters()` are
-    tested while testing the Python ICAT filters, so tests of these functions won't be
-    found here
+    `merge_python_icat_limit_skip_filters()` is tested while testing the Python ICAT
+    filters, so tests of this function won't be found here
     """
 
     def test_add_filter(self, icat_query):
@@ -0,0 +1,62 @@
+from icat.entities import getTypeMap
+from icat.helper import Version
+import pytest
+
+
+class EntityInfo(dict):
+    # Mimics the suds objects returned by ICAT, which support both item and attribute
+    # access
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError as e:
+            raise AttributeError(name) from e
+
+
+def entity_field(name, field_type, rel_type="ATTRIBUTE"):
+    return EntityInfo(name=name, type=field_type, relType=rel_type)
+
+
+class OfflineClient:
+    """
+    Enough of a Python ICAT client for queries to be built (and converted to JPQL)
+    without a connection to ICAT
+    """
+
+    apiversion = Version("5.0.0")
+    entity_info = {
+        "Parameter": [entity_field("id", "Long")],
+        "Investigation": [
+            entity_field("id", "Long"),
+            entity_field("name", "String"),
+            entity_field("title", "String"),
+            entity_field("startDate", "Date"),
+            entity_field("doi", "String"),
+            entity_field("datasets", "Dataset", "MANY"),
+        ],
+        "Dataset": [
+            entity_field("id", "Long"),
+            entity_field("name", "String"),
+            entity_field("investigation", "Investigation", "ONE"),
+        ],
+    }
+
+    def __init__(self):
+        self.typemap = getTypeMap(self)
+
+    def getEntityNames(self):  # noqa: N802
+        return list(self.entity_info)
+
+    def getEntityInfo(self, beanName):  # noqa: N802, N803
+        return EntityInfo(fields=self.entity_info[beanName])
+
+    def getEntityClass(self, name):  # noqa: N802
+        return self.typemap[name.lower()]
+
+    def _has_wsdl_type(self, name):
+        return True
+
+
+@pytest.fixture()
+def offline_client():
+    return OfflineClient()
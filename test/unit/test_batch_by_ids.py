@@ -0,0 +1,53 @@
+import re
+from unittest.mock import patch
+
+import pytest
+
+from datagateway_api.common.exceptions import BadRequestError
+from datagateway_api.datagateway_api.icat.helpers import get_batch_by_ids, get_entities_by_ids
+from datagateway_api.datagateway_api.icat.query import ICATQuery
+
+EXISTING_IDS = {1, 2, 3, 5, 8}
+
+
+@pytest.fixture()
+def id_queries():
+    executed_queries = []
+
+    def execute_query(icat_query, client, return_json_formattable=False):
+        (condition,) = icat_query.query.conditions["id"]
+        ids = [int(id_) for id_ in re.findall(r"\d+", condition)]
+        executed_queries.append(ids)
+        # ICAT doesn't return the records in the order of the IN expression
+        return [{"id": id_} for id_ in sorted(ids, reverse=True) if id_ in EXISTING_IDS]
+
+    with patch("datagateway_api.datagateway_api.icat.helpers.get_icat_max_entities", return_value=3):
+        with patch.object(ICATQuery, "execute_query", autospec=True, side_effect=execute_query):
+            yield executed_queries
+
+
+class TestGetBatchByIds:
+    def test_ids_fetched_in_chunks(self, offline_client, id_queries):
+        records = get_entities_by_ids(offline_client, "Investigation", [8, 1, 4, 2, 1, 5, 9])
+
+        assert id_queries == [[8, 1, 4], [2, 5, 9]]
+        assert records == {id_: {"id": id_} for id_ in [8, 1, 2, 5]}
+
+    def test_results_in_request_order(self, offline_client, id_queries):
+        batch = get_batch_by_ids(offline_client, "Investigation", [5, 4, 1, 7])
+
+        assert batch == {"results": [{"id": 5}, {"id": 1}], "missing": [4, 7]}
+
+    def test_repeated_ids_returned_once(self, offline_client, id_queries):
+        batch = get_batch_by_ids(offline_client, "Investigation", [5, 4, 1, 5, 4, 1, 5])
+
+        assert batch == {"results": [{"id": 5}, {"id": 1}], "missing": [4]}
+        assert id_queries == [[5, 4, 1]]
+
+    def test_too_many_ids(self, offline_client, id_queries):
+        with patch("datagateway_api.datagateway_api.icat.helpers.Config") as config:
+            config.config.datagateway_api.max_query_results = 2
+            with pytest.raises(BadRequestError):
+                get_batch_by_ids(offline_client, "Investigation", [1, 2, 3])
+
+        assert id_queries == []
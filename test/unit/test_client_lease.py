@@ -0,0 +1,128 @@
+import threading
+from unittest.mock import patch
+
+from object_pool import ObjectPool
+import pytest
+
+from datagateway_api.common.exceptions import ServiceUnavailableError
+from datagateway_api.datagateway_api.icat.client_lease import ClientLeaseManager
+from datagateway_api.datagateway_api.icat.helpers import requires_session_id
+
+
+class DummyClient:
+    def __init__(self):
+        self.sessionId = None
+
+    def clean_up(self, **kwargs):
+        pass
+
+
+@pytest.fixture()
+def dummy_client_pool():
+    test_pool = ObjectPool(DummyClient, min_init=1, max_capacity=2, max_reusable=0, expires=0)
+    yield test_pool
+    test_pool.destroy()
+
+
+class TestClientLeaseManager:
+    def test_lease_attaches_session_id(self, dummy_client_pool):
+        test_manager = ClientLeaseManager(max_leases=2, lease_timeout=1)
+
+        with test_manager.lease(dummy_client_pool, "Test Session ID") as client:
+            assert client.sessionId == "Test Session ID"
+            assert test_manager.get_stats()["active_leases"] == 1
+
+        assert client.sessionId is None
+        assert test_manager.get_stats() == {"active_leases": 0, "max_leases": 2, "total_leases": 1}
+
+    def test_client_returned_to_pool(self, dummy_client_pool):
+        test_manager = ClientLeaseManager(max_leases=2, lease_timeout=1)
+
+        with test_manager.lease(dummy_client_pool) as client:
+            assert dummy_client_pool.get_pool_size() == 0
+
+        assert dummy_client_pool.get_pool_size() == 1
+        with test_manager.lease(dummy_client_pool) as reused_client:
+            assert reused_client is client
+
+    def test_client_returned_on_exception(self, dummy_client_pool):
+        test_manager = ClientLeaseManager(max_leases=1, lease_timeout=1)
+
+        with pytest.raises(ValueError):
+            with test_manager.lease(dummy_client_pool, "Test Session ID"):
+                raise ValueError("Mocked exception")
+
+        assert dummy_client_pool.get_pool_size() == 1
+        assert test_manager.get_stats()["active_leases"] == 0
+        # Lease has been released so another client can be leased straight away
+        with test_manager.lease(dummy_client_pool) as client:
+            assert client.sessionId is None
+
+    def test_concurrent_leases_get_different_clients(self, dummy_client_pool):
+        test_manager = ClientLeaseManager(max_leases=2, lease_timeout=1)
+
+        with test_manager.lease(dummy_client_pool, "Same Session ID") as client_a:
+            # Pool is empty so a new client is created for the second lease
+            with test_manager.lease(dummy_client_pool, "Same Session ID") as client_b:
+                assert client_a is not client_b
+                assert test_manager.get_stats()["active_leases"] == 2
+
+    def test_lease_timeout(self, dummy_client_pool):
+        test_manager = ClientLeaseManager(max_leases=1, lease_timeout=0.1)
+
+        with test_manager.lease(dummy_client_pool):
+            with pytest.raises(ServiceUnavailableError):
+                with test_manager.lease(dummy_client_pool):
+                    pass
+
+    def test_lease_waits_for_client(self, dummy_client_pool):
+        test_manager = ClientLeaseManager(max_leases=1, lease_timeout=5)
+        leased_event = threading.Event()
+        release_event = threading.Event()
+
+        def hold_lease():
+            with test_manager.lease(dummy_client_pool):
+                leased_event.set()
+                release_event.wait()
+
+        holding_thread = threading.Thread(target=hold_lease)
+        holding_thread.start()
+        leased_event.wait()
+        threading.Timer(0.1, release_event.set).start()
+
+        with test_manager.lease(dummy_client_pool, "Test Session ID") as client:
+            assert client.sessionId == "Test Session ID"
+
+        holding_thread.join()
+        assert test_manager.get_stats()["total_leases"] == 2
+
+    def test_streams_leased_separately(self, dummy_client_pool):
+        request_manager = ClientLeaseManager(max_leases=1, lease_timeout=0.1)
+        stream_manager = ClientLeaseManager(max_leases=1, lease_timeout=0.1)
+
+        @requires_session_id
+        def stream(self, session_id, **kwargs):
+            yield kwargs["client"].sessionId
+
+        @requires_session_id
+        def request(self, session_id, **kwargs):
+            return kwargs["client"].sessionId
+
+        helpers = "datagateway_api.datagateway_api.icat.helpers"
+        with patch(f"{helpers}.client_lease_manager", request_manager):
+            with patch(f"{helpers}.stream_lease_manager", stream_manager):
+                with patch(f"{helpers}.session_metadata_cache") as session_cache:
+                    session_cache.get_or_fetch.return_value.is_expired.return_value = False
+                    open_stream = stream("self", "Stream Session ID", client_pool=dummy_client_pool)
+                    assert next(open_stream) == "Stream Session ID"
+
+                    # The open stream doesn't hold a request lease, but does hold the
+                    # only stream lease
+                    assert request("self", "Request Session ID", client_pool=dummy_client_pool) == "Request Session ID"
+                    with pytest.raises(ServiceUnavailableError):
+                        next(stream("self", "Stream Session ID", client_pool=dummy_client_pool))
+
+                    open_stream.close()
+
+        assert request_manager.get_stats()["active_leases"] == 0
+        assert stream_manager.get_stats()["active_leases"] == 0
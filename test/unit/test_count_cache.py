@@ -0,0 +1,113 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from datagateway_api.common.count_cache import CountCache
+
+
+def wait_for_refreshes(test_cache, timeout=5):
+    end_time = time.monotonic() + timeout
+    while test_cache.get_stats()["refreshing"] and time.monotonic() < end_time:
+        time.sleep(0.01)
+
+
+class TestCountCache:
+    def test_fresh_count_served_from_cache(self):
+        test_cache = CountCache("test", maxsize=10, soft_ttl=60, hard_ttl=120)
+        count = MagicMock(return_value=5)
+
+        results = [test_cache.get_or_count("key", count) for _ in range(3)]
+
+        assert results == [5, 5, 5]
+        count.assert_called_once()
+        assert test_cache.get_stats()["hits"] == 2
+        assert test_cache.get_stats()["stale_hits"] == 0
+
+    def test_stale_count_served_and_refreshed(self):
+        test_cache = CountCache("test", maxsize=10, soft_ttl=0, hard_ttl=120)
+        refresh = MagicMock(return_value=10)
+        test_cache.get_or_count("key", lambda: 5)
+
+        assert test_cache.get_or_count("key", lambda: 5, refresh) == 5
+        wait_for_refreshes(test_cache)
+
+        refresh.assert_called_once()
+        assert test_cache.get_or_count("key", lambda: 5, refresh) == 10
+        assert test_cache.get_stats()["stale_hits"] == 2
+
+    def test_single_refresh_per_key(self):
+        test_cache = CountCache("test", maxsize=10, soft_ttl=0, hard_ttl=120, refresh_workers=4)
+        refresh_started = threading.Event()
+        finish_refresh = threading.Event()
+
+        def refresh():
+            refresh_started.set()
+            finish_refresh.wait(5)
+            return 10
+
+        refresh_mock = MagicMock(side_effect=refresh)
+        test_cache.get_or_count("key", lambda: 5)
+
+        for _ in range(5):
+            assert test_cache.get_or_count("key", lambda: 5, refresh_mock) == 5
+        refresh_started.wait(5)
+        finish_refresh.set()
+        wait_for_refreshes(test_cache)
+
+        refresh_mock.assert_called_once()
+
+    def test_failed_refresh_keeps_count(self):
+        test_cache = CountCache("test", maxsize=10, soft_ttl=0, hard_ttl=120)
+        test_cache.get_or_count("key", lambda: 5)
+
+        test_cache.get_or_count("key", lambda: 5, MagicMock(side_effect=ValueError("ICAT unavailable")))
+        wait_for_refreshes(test_cache)
+
+        assert test_cache.get_or_count("key", lambda: 5, lambda: 5) == 5
+        assert test_cache.get_stats()["failed_refreshes"] == 1
+
+    def test_refresh_during_invalidation_not_stored(self):
+        test_cache = CountCache("test", maxsize=10, soft_ttl=0, hard_ttl=120)
+        refresh_started = threading.Event()
+        finish_refresh = threading.Event()
+
+        def refresh():
+            refresh_started.set()
+            finish_refresh.wait(5)
+            return 10
+
+        test_cache.get_or_count("key", lambda: 5, dependencies=frozenset(["Investigation"]))
+        test_cache.get_or_count("key", lambda: 5, refresh)
+        refresh_started.wait(5)
+        test_cache.invalidate({"Investigation"})
+        finish_refresh.set()
+        wait_for_refreshes(test_cache)
+
+        assert test_cache.get_stats()["entries"] == 0
+
+    @pytest.mark.parametrize(
+        "invalidated_entity_types, expected_remaining_entries",
+        [
+            pytest.param({"Dataset"}, 1, id="dependency of one count"),
+            pytest.param({"Investigation", "*"}, 0, id="dependency of all counts"),
+            pytest.param({"Facility"}, 2, id="unrelated entity type"),
+        ],
+    )
+    def test_invalidate(self, invalidated_entity_types, expected_remaining_entries):
+        test_cache = CountCache("test", maxsize=10, soft_ttl=60, hard_ttl=120)
+        test_cache.get_or_count("a", lambda: 1, dependencies=frozenset(["Investigation"]))
+        test_cache.get_or_count("b", lambda: 1, dependencies=frozenset(["Investigation", "Dataset"]))
+
+        test_cache.invalidate(invalidated_entity_types)
+
+        assert test_cache.get_stats()["entries"] == expected_remaining_entries
+
+    def test_expired_count_not_served(self):
+        test_cache = CountCache("test", maxsize=10, soft_ttl=0, hard_ttl=0.05)
+        test_cache.get_or_count("key", lambda: 5)
+        time.sleep(0.1)
+
+        assert test_cache.get_or_count("key", lambda: 10) == 10
+        assert test_cache.get_stats()["misses"] == 2
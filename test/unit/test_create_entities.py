@@ -0,0 +1,79 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from icat.exception import ICATObjectExistsError
+import pytest
+
+from datagateway_api.common.config import Config
+from datagateway_api.common.exceptions import BadRequestError
+from datagateway_api.datagateway_api.icat.helpers import (
+    convert_attribute_value,
+    create_entities,
+    create_entity_batch,
+)
+
+
+@pytest.fixture()
+def client():
+    client = MagicMock()
+    next_ids = iter(range(1, 100))
+    client.createMany.side_effect = lambda batch: [next(next_ids) for _ in batch]
+    client.new.side_effect = lambda entity_type, **kwargs: MagicMock(**kwargs)
+    with patch.object(Config.config.datagateway_api, "write_batch_size", 2):
+        yield client
+
+
+class TestCreateEntities:
+    def test_entities_created_in_batches(self, client):
+        with patch(
+            "datagateway_api.datagateway_api.icat.helpers.get_entities_by_ids",
+            side_effect=lambda client, entity_type, ids: {id_: {"id": id_} for id_ in ids},
+        ) as get_entities_by_ids:
+            created_data = create_entities(client, "Investigation", [{}, {}, {}, {}, {}])
+
+        assert [len(call.args[0]) for call in client.createMany.call_args_list] == [2, 2, 1]
+        get_entities_by_ids.assert_called_once_with(client, "Investigation", [1, 2, 3, 4, 5])
+        assert created_data == [{"id": id_} for id_ in [1, 2, 3, 4, 5]]
+
+    def test_failed_batch_rolls_back_created_batches(self, client):
+        client.createMany.side_effect = [[1, 2], [3, 4], ICATObjectExistsError("Entity already exists")]
+
+        with pytest.raises(BadRequestError):
+            create_entities(client, "Investigation", [{}, {}, {}, {}, {}])
+
+        deleted_ids = [[entity.id for entity in call.args[0]] for call in client.deleteMany.call_args_list]
+        assert deleted_ids == [[1, 2], [3, 4]]
+
+
+class TestCreateEntityBatch:
+    def test_batch_created_without_reading_back(self, client):
+        with patch("datagateway_api.datagateway_api.icat.helpers.get_entities_by_ids") as get_entities_by_ids:
+            created_ids = create_entity_batch(client, "Investigation", [{}, {}, {}])
+
+        assert created_ids == [1, 2, 3]
+        client.createMany.assert_called_once()
+        get_entities_by_ids.assert_not_called()
+
+    def test_failed_batch(self, client):
+        client.createMany.side_effect = ICATObjectExistsError("Entity already exists")
+
+        with pytest.raises(BadRequestError):
+            create_entity_batch(client, "Investigation", [{}])
+
+
+class TestConvertAttributeValue:
+    @pytest.mark.parametrize(
+        "attribute_type, value, expected_value",
+        [
+            pytest.param("Date", "2020-02-02 09:00:09", datetime(2020, 2, 2, 9, 0, 9), id="date attribute"),
+            pytest.param("String", "2020-02-02 09:00:09", "2020-02-02 09:00:09", id="date-like string attribute"),
+            pytest.param("String", "May", "May", id="string attribute"),
+            pytest.param("Long", 5, 5, id="numeric attribute"),
+        ],
+    )
+    def test_convert_attribute_value(self, attribute_type, value, expected_value):
+        assert convert_attribute_value(MagicMock(type=attribute_type), value) == expected_value
+
+    def test_invalid_date(self):
+        with pytest.raises(BadRequestError):
+            convert_attribute_value(MagicMock(type="Date"), "Not a date")
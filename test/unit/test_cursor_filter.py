@@ -0,0 +1,193 @@
+from collections import OrderedDict
+from unittest.mock import MagicMock, patch
+
+from pydantic import SecretStr
+import pytest
+
+from datagateway_api.common.exceptions import BadRequestError, FilterError
+from datagateway_api.datagateway_api.icat.filters import PythonICATCursorFilter
+
+
+@pytest.fixture()
+def mock_query():
+    # Python ICAT's Query needs a connection to ICAT, so the query is mocked
+    attr_types = {
+        "id": "Long",
+        "name": "String",
+        "startDate": "Date",
+        "doi": "String",
+        "numericValue": "Double",
+        "sample": "boolean",
+        "valueType": "ParameterValueType",
+    }
+    query = MagicMock()
+    query.attributes = []
+    query.order = OrderedDict()
+    query.entity.getAttrInfo.side_effect = lambda client, attr: MagicMock(type=attr_types[attr])
+    return query
+
+
+class TestPythonICATCursorFilter:
+    def test_first_page(self, mock_query):
+        test_filter = PythonICATCursorFilter("")
+        mock_query.order["name"] = "%s DESC"
+
+        test_filter.apply_filter(mock_query)
+
+        mock_query.setOrder.assert_called_once_with([("name", "DESC"), ("id", "ASC")])
+        mock_query.addConditions.assert_not_called()
+
+    def test_id_already_in_order(self, mock_query):
+        test_filter = PythonICATCursorFilter("")
+        mock_query.order["id"] = "%s DESC"
+
+        test_filter.apply_filter(mock_query)
+
+        mock_query.setOrder.assert_not_called()
+        assert test_filter.order == [("id", "DESC")]
+
+    @pytest.mark.parametrize(
+        "order, cursor_values, expected_condition",
+        [
+            pytest.param({}, [5], {"id": ">= 5 AND ((o.id > 5))"}, id="id only"),
+            pytest.param(
+                {"name": "%s"},
+                ["It's a test", 5],
+                {"name": ">= 'It''s a test' AND ((o.name > 'It''s a test') OR (o.name = 'It''s a test' AND o.id > 5))"},
+                id="string order key",
+            ),
+            pytest.param(
+                {"startDate": "%s DESC"},
+                ["2020-01-02 03:04:05+00:00", 5],
+                {
+                    "startDate": "<= {ts 2020-01-02 03:04:05} AND ((o.startDate < {ts 2020-01-02 03:04:05})"
+                    " OR (o.startDate = {ts 2020-01-02 03:04:05} AND o.id > 5))",
+                },
+                id="descending date order key",
+            ),
+            pytest.param(
+                {"numericValue": "%s"},
+                ["1.5", 5],
+                {"numericValue": ">= 1.5 AND ((o.numericValue > 1.5) OR (o.numericValue = 1.5 AND o.id > 5))"},
+                id="double order key",
+            ),
+            pytest.param(
+                {"sample": "%s"},
+                [False, 5],
+                {"sample": ">= FALSE AND ((o.sample > FALSE) OR (o.sample = FALSE AND o.id > 5))"},
+                id="boolean order key",
+            ),
+        ],
+    )
+    def test_cursor_condition(self, mock_query, order, cursor_values, expected_condition):
+        mock_query.order.update(order)
+        test_order = [(attr, "DESC" if "DESC" in direction else "ASC") for attr, direction in order.items()]
+        test_order.append(("id", "ASC"))
+        test_filter = PythonICATCursorFilter(PythonICATCursorFilter.encode_cursor(test_order, cursor_values))
+
+        test_filter.apply_filter(mock_query)
+
+        mock_query.addConditions.assert_called_once_with(expected_condition)
+
+    def test_cursor_order_mismatch(self, mock_query):
+        test_cursor = PythonICATCursorFilter.encode_cursor([("id", "ASC")], [5])
+        mock_query.order["name"] = "%s"
+
+        with pytest.raises(FilterError):
+            PythonICATCursorFilter(test_cursor).apply_filter(mock_query)
+
+    @pytest.mark.parametrize(
+        "test_cursor",
+        [
+            pytest.param("Not a cursor!", id="not base64"),
+            pytest.param("bm90IGpzb24=", id="not json"),
+            pytest.param(PythonICATCursorFilter.encode_cursor([("id", "ASC")], [1, 2]), id="wrong number of values"),
+        ],
+    )
+    def test_invalid_cursor(self, mock_query, test_cursor):
+        with pytest.raises(FilterError):
+            PythonICATCursorFilter(test_cursor).apply_filter(mock_query)
+
+    @pytest.mark.parametrize(
+        "order, cursor_values",
+        [
+            pytest.param({}, ["0)) OR ((1=1"], id="condition injected as id"),
+            pytest.param({}, [True], id="boolean as id"),
+            pytest.param({}, [[5]], id="list as id"),
+            pytest.param({"name": "%s"}, [5, 5], id="number as string"),
+            pytest.param({"startDate": "%s"}, [5, 5], id="number as date"),
+            pytest.param({"numericValue": "%s"}, ["1 OR 1=1", 5], id="condition injected as double"),
+            pytest.param({"numericValue": "%s"}, ["nan", 5], id="nan as double"),
+            pytest.param({"sample": "%s"}, ["TRUE OR 1=1", 5], id="string as boolean"),
+            pytest.param({"valueType": "%s"}, ["NUMERIC", 5], id="unsupported type"),
+        ],
+    )
+    def test_invalid_cursor_value(self, mock_query, order, cursor_values):
+        mock_query.order.update(order)
+        test_order = [(attr, "ASC") for attr in order]
+        test_order.append(("id", "ASC"))
+        test_cursor = PythonICATCursorFilter.encode_cursor(test_order, cursor_values)
+
+        with pytest.raises(FilterError):
+            PythonICATCursorFilter(test_cursor).apply_filter(mock_query)
+
+        mock_query.addConditions.assert_not_called()
+
+    def test_signed_cursor(self, mock_query):
+        with patch(
+            "datagateway_api.datagateway_api.icat.filters.Config.config.datagateway_api.cursor_signing_key",
+            SecretStr("key"),
+        ):
+            test_cursor = PythonICATCursorFilter.encode_cursor([("id", "ASC")], [5])
+            PythonICATCursorFilter(test_cursor).apply_filter(mock_query)
+
+            cursor_data, signature = test_cursor.split(".")
+            tampered_data = PythonICATCursorFilter.encode_cursor([("id", "ASC")], [6]).split(".")[0]
+            for tampered_cursor in (f"{tampered_data}.{signature}", cursor_data):
+                with pytest.raises(FilterError):
+                    PythonICATCursorFilter(tampered_cursor).apply_filter(mock_query)
+
+        mock_query.addConditions.assert_called_once_with({"id": ">= 5 AND ((o.id > 5))"})
+
+    def test_related_order_rejected(self, mock_query):
+        mock_query.order["investigation.name"] = "%s"
+
+        with pytest.raises(FilterError):
+            PythonICATCursorFilter("").apply_filter(mock_query)
+
+    def test_distinct_rejected(self, mock_query):
+        mock_query.attributes = ["name"]
+
+        with pytest.raises(FilterError):
+            PythonICATCursorFilter("").apply_filter(mock_query)
+
+    def test_next_cursor(self, mock_query):
+        test_filter = PythonICATCursorFilter("")
+        mock_query.order["name"] = "%s"
+        test_filter.apply_filter(mock_query)
+
+        next_cursor = test_filter.get_next_cursor([{"id": 1, "name": "a"}, {"id": 2, "name": "b"}], 2)
+
+        assert PythonICATCursorFilter.decode_cursor(next_cursor) == ([("name", "ASC"), ("id", "ASC")], ["b", 2])
+
+    @pytest.mark.parametrize(
+        "results, limit",
+        [
+            pytest.param([{"id": 1, "name": "a"}], 2, id="last page"),
+            pytest.param([], 2, id="no results"),
+            pytest.param([{"id": 1, "name": "a"}], None, id="no limit"),
+        ],
+    )
+    def test_no_next_cursor(self, mock_query, results, limit):
+        test_filter = PythonICATCursorFilter("")
+        test_filter.apply_filter(mock_query)
+
+        assert test_filter.get_next_cursor(results, limit) is None
+
+    def test_null_order_key(self, mock_query):
+        test_filter = PythonICATCursorFilter("")
+        mock_query.order["doi"] = "%s"
+        test_filter.apply_filter(mock_query)
+
+        with pytest.raises(BadRequestError):
+            test_filter.get_next_cursor([{"id": 1, "doi": None}], 1)
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 
 import pytest
 
@@ -12,20 +12,52 @@ class TestIsStrADate:
         assert date_output is True
 
     def test_valid_boundary_date(self):
-        date_output = DateHandler.is_str_a_date("29/2/2020")
+        date_output = DateHandler.is_str_a_date("2020-02-29")
+        assert date_output is True
+
+    def test_valid_datetime(self):
+        date_output = DateHandler.is_str_a_date("2018-05-05T15:00:00.000Z")
         assert date_output is True
 
     def test_invalid_boundary_date(self):
-        date_output = DateHandler.is_str_a_date("29/2/2019")
+        date_output = DateHandler.is_str_a_date("2019-02-29")
         # There was no leap year in 2019
         assert date_output is False
 
     def test_invalid_date(self):
-        date_output = DateHandler.is_str_a_date("25/25/2020")
+        date_output = DateHandler.is_str_a_date("2020-25-25")
         assert date_output is False
 
+    @pytest.mark.parametrize(
+        "potential_date",
+        [
+            pytest.param("29/2/2020", id="non-ISO date"),
+            pytest.param("May", id="month name"),
+            pytest.param("20200101", id="numeric string"),
+        ],
+    )
+    def test_non_iso_date(self, potential_date):
+        assert DateHandler.is_str_a_date(potential_date) is False
+
+
+class TestIsICATDateType:
+    @pytest.mark.parametrize(
+        "attribute_type, expected_result",
+        [
+            pytest.param("Date", True, id="date"),
+            pytest.param("Timestamp", True, id="timestamp"),
+            pytest.param("String", False, id="string"),
+        ],
+    )
+    def test_is_icat_date_type(self, attribute_type, expected_result):
+        assert DateHandler.is_icat_date_type(attribute_type) is expected_result
+
 
 class TestStrToDatetime:
+    def test_valid_iso_str_with_timezone(self):
+        datetime_output = DateHandler.str_to_datetime_object("2018-05-05T15:00:00.000Z")
+        assert datetime_output == datetime(2018, 5, 5, 15, tzinfo=timezone.utc)
+
     def test_valid_str(self):
         datetime_output = DateHandler.str_to_datetime_object("2008-10-15 12:05:09")
         assert datetime_output == datetime(
@@ -0,0 +1,75 @@
+from unittest.mock import MagicMock, patch
+
+from icat.exception import ICATNoObjectError, ICATSessionError
+import pytest
+
+from datagateway_api.common.config import Config
+from datagateway_api.common.exceptions import BadRequestError
+from datagateway_api.datagateway_api.icat.filters import PythonICATOrderFilter, PythonICATWhereFilter
+from datagateway_api.datagateway_api.icat.helpers import delete_entities, delete_entities_with_filters
+
+
+@pytest.fixture()
+def client():
+    client = MagicMock()
+    client.new.side_effect = lambda entity_type, **kwargs: MagicMock(**kwargs)
+    with patch.object(Config.config.datagateway_api, "write_batch_size", 2):
+        with patch.object(Config.config.datagateway_api, "delete_where_max_entities", 3):
+            yield client
+
+
+def get_deleted_ids(client):
+    return [[entity.id for entity in call.args[0]] for call in client.deleteMany.call_args_list]
+
+
+class TestDeleteEntities:
+    def test_ids_deleted_in_chunks(self, client):
+        chunk_results = delete_entities(client, "Datafile", [1, 2, 3, 2, 4, 5])
+
+        assert get_deleted_ids(client) == [[1, 2], [3, 4], [5]]
+        assert chunk_results == [
+            {"ids": [1, 2], "deleted": True},
+            {"ids": [3, 4], "deleted": True},
+            {"ids": [5], "deleted": True},
+        ]
+
+    def test_failed_chunk_reported(self, client):
+        client.deleteMany.side_effect = [None, ICATNoObjectError("Datafile[id:4] not found"), None]
+
+        chunk_results = delete_entities(client, "Datafile", [1, 2, 3, 4, 5])
+
+        assert [chunk["deleted"] for chunk in chunk_results] == [True, False, True]
+        assert chunk_results[1]["error"] == "Datafile[id:4] not found"
+
+    def test_session_error_raised(self, client):
+        client.deleteMany.side_effect = ICATSessionError("Session expired")
+
+        with pytest.raises(ICATSessionError):
+            delete_entities(client, "Datafile", [1, 2, 3])
+
+
+class TestDeleteEntitiesWithFilters:
+    def test_matching_entities_deleted(self, client):
+        with patch(
+            "datagateway_api.datagateway_api.icat.helpers.execute_entity_query",
+            return_value=[{"id": 7}, {"id": 9}],
+        ) as execute_entity_query:
+            chunk_results = delete_entities_with_filters(client, "Datafile", [PythonICATWhereFilter("name", "a", "eq")])
+
+        # One more ID than the cap is requested to detect too many matches
+        assert execute_entity_query.call_args.args[2][-1].limit_value == 4
+        assert chunk_results == [{"ids": [7, 9], "deleted": True}]
+
+    def test_too_many_matches(self, client):
+        with patch(
+            "datagateway_api.datagateway_api.icat.helpers.execute_entity_query",
+            return_value=[{"id": id_} for id_ in range(4)],
+        ):
+            with pytest.raises(BadRequestError):
+                delete_entities_with_filters(client, "Datafile", [PythonICATWhereFilter("name", "a", "eq")])
+
+        client.deleteMany.assert_not_called()
+
+    def test_non_where_filter_rejected(self, client):
+        with pytest.raises(BadRequestError):
+            delete_entities_with_filters(client, "Datafile", [PythonICATOrderFilter("name", "asc")])
@@ -0,0 +1,87 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from datagateway_api.datagateway_api.icat.filters import (
+    icat_set_limit,
+    PythonICATDistinctFieldFilter,
+    PythonICATOrderFilter,
+)
+from datagateway_api.datagateway_api.icat.query import ICATQuery
+
+
+@pytest.fixture(autouse=True)
+def max_entities():
+    with patch("datagateway_api.datagateway_api.icat.query.get_icat_max_entities", return_value=10):
+        yield
+
+
+def create_distinct_count_query(client, fields, limit=None):
+    test_query = ICATQuery(client, "Investigation", aggregate="COUNT")
+    PythonICATDistinctFieldFilter(fields).apply_filter(test_query.query)
+    if limit is not None:
+        icat_set_limit(test_query.query, *limit)
+    return test_query
+
+
+def mock_search_chunked(number_of_results):
+    def search_chunked(query, skip=0, count=None, chunksize=100):
+        results = range(number_of_results)[skip:]
+        return iter(results if count is None else results[:count])
+
+    return MagicMock(side_effect=search_chunked)
+
+
+class TestDistinctCount:
+    @pytest.mark.parametrize(
+        "limit, expected_count",
+        [
+            pytest.param(None, 42, id="no limit"),
+            pytest.param((0, 10), 10, id="limit"),
+            pytest.param((40, 10), 2, id="skip and limit"),
+            pytest.param((50, 10), 0, id="skip past results"),
+        ],
+    )
+    def test_single_attribute_counted_by_icat(self, offline_client, limit, expected_count):
+        test_query = create_distinct_count_query(offline_client, ["name"], limit)
+        client = MagicMock()
+        client.search.return_value = [42]
+
+        assert test_query.execute_query(client, True, max_results=20) == [expected_count]
+        client.search.assert_called_once()
+        assert str(client.search.call_args.args[0]) == "SELECT COUNT(DISTINCT(o.name)) FROM Investigation o"
+
+    @pytest.mark.parametrize(
+        "limit, expected_count",
+        [
+            pytest.param(None, 25, id="no limit"),
+            pytest.param((5, 10), 10, id="skip and limit"),
+        ],
+    )
+    def test_multiple_attributes_counted_in_chunks(self, offline_client, limit, expected_count):
+        test_query = create_distinct_count_query(offline_client, ["name", "title"], limit)
+        client = MagicMock()
+        client.searchChunked = mock_search_chunked(25)
+
+        # The number of results is above `max_results`, which only applies to results
+        # that are returned
+        assert test_query.execute_query(client, True, max_results=20) == [expected_count]
+        client.search.assert_not_called()
+        assert client.searchChunked.call_args.kwargs["chunksize"] == 10
+        assert (
+            str(client.searchChunked.call_args.args[0])
+            == "SELECT DISTINCT o.name, o.title FROM Investigation o ORDER BY o.name ASC, o.title ASC"
+        )
+
+    def test_chunks_ordered_by_every_attribute(self, offline_client):
+        test_query = create_distinct_count_query(offline_client, ["name", "title"])
+        PythonICATOrderFilter("title", "desc").apply_filter(test_query.query)
+        client = MagicMock()
+        client.searchChunked = mock_search_chunked(25)
+
+        assert test_query.execute_query(client, True, max_results=20) == [25]
+        # Ordering by the title alone wouldn't keep chunks stable, as names can repeat
+        assert (
+            str(client.searchChunked.call_args.args[0])
+            == "SELECT DISTINCT o.name, o.title FROM Investigation o ORDER BY o.title DESC, o.name ASC"
+        )
@@ -12,6 +12,7 @@ from datagateway_api.common.exceptions import (
     PythonICATError,
     ScoringAPIError,
     SearchAPIError,
+    ServiceUnavailableError,
 )
 
 
@@ -45,6 +46,11 @@ class TestExceptions:
             pytest.param(PythonICATError, "Python ICAT error", id="PythonICATError"),
             pytest.param(ScoringAPIError, "Scoring API error", id="ScoringAPIError"),
             pytest.param(SearchAPIError, "Search API error", id="SearchAPIError"),
+            pytest.param(
+                ServiceUnavailableError,
+                "Service unavailable, too many requests are queued",
+                id="ServiceUnavailableError",
+            ),
         ],
     )
     def test_valid_exception_message(self, exception_class, expected_message):
@@ -64,6 +70,7 @@ class TestExceptions:
             pytest.param(PythonICATError, 500, id="PythonICATError"),
             pytest.param(ScoringAPIError, 500, id="ScoringAPIError"),
             pytest.param(SearchAPIError, 500, id="SearchAPIError"),
+            pytest.param(ServiceUnavailableError, 503, id="ServiceUnavailableError"),
         ],
     )
     def test_valid_exception_status_code(self, exception_class, expected_status_code):
@@ -83,6 +90,7 @@ class TestExceptions:
             pytest.param(PythonICATError, id="PythonICATError"),
             pytest.param(ScoringAPIError, id="ScoringAPIError"),
             pytest.param(SearchAPIError, id="SearchAPIError"),
+            pytest.param(ServiceUnavailableError, id="ServiceUnavailableError"),
         ],
     )
     def test_valid_raise_exception(self, exception_class):
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+import subprocess  # noqa: S404
+import sys
+import threading
+
+from datagateway_api.common.filter_order_handler import FilterOrderHandler
+from datagateway_api.datagateway_api.icat.filters import PythonICATOrderFilter
+from datagateway_api.datagateway_api.icat.query import ICATQuery
+
+
+def test_importable_without_search_api():
+    """
+    Importing the Search API creates its client pool (which connects to ICAT), so
+    DataGateway API modules using `FilterOrderHandler` (and these tests) need it to only
+    be imported when a Search API query is handled. A new interpreter is used as other
+    tests may have already imported the Search API
+    """
+    test_script = (
+        "import sys\n"
+        "import datagateway_api.common.filter_order_handler\n"
+        "assert not any(module.startswith('datagateway_api.search_api') for module in sys.modules)\n"
+    )
+
+    subprocess.run([sys.executable, "-c", test_script], check=True)  # noqa: S603
+
+
+class TestConcurrentFilterApplication:
+    def test_order_state_not_shared_between_queries(self, offline_client):
+        """
+        Order filters used to keep the order and join specs of a request on the class,
+        so requests applying filters at the same time could leak them into each other
+        """
+        number_of_workers = 8
+        requests_per_worker = 50
+        orders = [
+            [("name", "asc"), ("datasets.name", "desc")],
+            [("title", "desc")],
+            [("startDate", "asc"), ("id", "desc")],
+            [("datasets.id", "asc"), ("name", "desc"), ("title", "asc")],
+        ]
+        start_barrier = threading.Barrier(number_of_workers)
+
+        def run_requests(worker_number):
+            start_barrier.wait()
+            failures = []
+            for request_number in range(requests_per_worker):
+                order = orders[(worker_number + request_number) % len(orders)]
+                query = ICATQuery(offline_client, "Investigation")
+                filter_handler = FilterOrderHandler()
+                filter_handler.manage_icat_filters(
+                    [PythonICATOrderFilter(field, direction) for field, direction in order],
+                    query.query,
+                )
+
+                expected_order = [(field, direction.upper()) for field, direction in order]
+                expected_join_specs = (
+                    {"datasets": "LEFT JOIN"} if any(field.startswith("datasets") for field, _ in order) else {}
+                )
+                if query.query.result_order != expected_order or query.query.join_specs != expected_join_specs:
+                    failures.append((order, query.query.result_order, query.query.join_specs))
+
+            return failures
+
+        with ThreadPoolExecutor(max_workers=number_of_workers) as executor:
+            failures = [
+                failure
+                for worker_failures in executor.map(run_requests, range(number_of_workers))
+                for failure in worker_failures
+            ]
+
+        assert failures == []
@@ -0,0 +1,66 @@
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from datagateway_api.common.exceptions import ServiceUnavailableError
+from datagateway_api.common.icat_executor import ICATExecutor
+
+
+class TestICATExecutor:
+    def test_run_returns_result(self):
+        test_executor = ICATExecutor("test", max_workers=2, max_queue_size=2)
+
+        result = asyncio.run(test_executor.run(lambda a, b=0: a + b, 1, b=2))
+
+        assert result == 3
+        test_executor.shutdown()
+
+    def test_run_in_executor_thread(self):
+        test_executor = ICATExecutor("test", max_workers=1, max_queue_size=0)
+
+        thread_name = asyncio.run(test_executor.run(lambda: threading.current_thread().name))
+
+        assert thread_name.startswith("test")
+        test_executor.shutdown()
+
+    def test_run_propagates_exceptions(self):
+        test_executor = ICATExecutor("test", max_workers=1, max_queue_size=0)
+
+        def raise_error():
+            raise ValueError("Mocked exception")
+
+        with pytest.raises(ValueError, match="Mocked exception"):
+            asyncio.run(test_executor.run(raise_error))
+        test_executor.shutdown()
+
+    def test_run_copies_context(self):
+        test_executor = ICATExecutor("test", max_workers=1, max_queue_size=0)
+        test_var = contextvars.ContextVar("test_var", default=None)
+
+        async def run_with_context():
+            test_var.set("Test value")
+            return await test_executor.run(test_var.get)
+
+        assert asyncio.run(run_with_context()) == "Test value"
+        test_executor.shutdown()
+
+    def test_full_queue_rejects_work(self):
+        test_executor = ICATExecutor("test", max_workers=1, max_queue_size=1)
+        release_event = threading.Event()
+
+        async def run_calls():
+            # One call occupies the worker and one is queued, so the third is rejected
+            running_tasks = [asyncio.ensure_future(test_executor.run(release_event.wait)) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(ServiceUnavailableError):
+                await test_executor.run(release_event.wait)
+
+            release_event.set()
+            await asyncio.gather(*running_tasks)
+            # Slots are released once the work has finished
+            return await test_executor.run(lambda: "Done")
+
+        assert asyncio.run(run_calls()) == "Done"
+        test_executor.shutdown()
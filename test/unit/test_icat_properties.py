@@ -0,0 +1,83 @@
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from datagateway_api.common.icat_properties import ICATPropertiesCache
+
+
+def mock_properties_response(max_entities):
+    response = MagicMock()
+    response.json.return_value = {"maxEntities": max_entities}
+    return response
+
+
+class TestICATPropertiesCache:
+    def test_properties_fetched_once_per_url(self):
+        test_cache = ICATPropertiesCache(refresh_interval=0)
+
+        with patch.object(
+            test_cache._session,
+            "get",
+            return_value=mock_properties_response(10000),
+        ) as mock_get:
+            for _ in range(3):
+                properties = test_cache.get("https://localhost:8181", False)
+
+        assert properties == {"maxEntities": 10000}
+        mock_get.assert_called_once_with(
+            "https://localhost:8181/icat/properties",
+            verify=False,
+        )
+
+    def test_properties_cached_separately_per_url(self):
+        test_cache = ICATPropertiesCache(refresh_interval=0)
+
+        with patch.object(
+            test_cache._session,
+            "get",
+            side_effect=[mock_properties_response(10000), mock_properties_response(500)],
+        ) as mock_get:
+            assert test_cache.get("https://icat-a:8181", False)["maxEntities"] == 10000
+            assert test_cache.get("https://icat-b:8181", True)["maxEntities"] == 500
+
+        assert mock_get.call_count == 2
+
+    def test_refresh_updates_properties(self):
+        test_cache = ICATPropertiesCache(refresh_interval=0)
+
+        with patch.object(
+            test_cache._session,
+            "get",
+            side_effect=[mock_properties_response(10000), mock_properties_response(20000)],
+        ):
+            test_cache.get("https://localhost:8181", False)
+            test_cache.refresh()
+
+        assert test_cache.get("https://localhost:8181", False)["maxEntities"] == 20000
+
+    def test_failed_refresh_keeps_stale_properties(self):
+        test_cache = ICATPropertiesCache(refresh_interval=0)
+
+        with patch.object(
+            test_cache._session,
+            "get",
+            side_effect=[mock_properties_response(10000), requests.ConnectionError()],
+        ):
+            test_cache.get("https://localhost:8181", False)
+            test_cache.refresh()
+
+        assert test_cache.get("https://localhost:8181", False)["maxEntities"] == 10000
+
+    def test_clear(self):
+        test_cache = ICATPropertiesCache(refresh_interval=0)
+
+        with patch.object(
+            test_cache._session,
+            "get",
+            return_value=mock_properties_response(10000),
+        ) as mock_get:
+            test_cache.get("https://localhost:8181", False)
+            test_cache.clear()
+            test_cache.get("https://localhost:8181", False)
+
+        assert mock_get.call_count == 2
@@ -0,0 +1,211 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+import pytest
+
+from datagateway_api.common.exceptions import AuthenticationError, BadRequestError, ServiceUnavailableError
+from datagateway_api.common.icat_executor import ICATExecutor
+from datagateway_api.common.ndjson import (
+    create_ndjson_ingest_response,
+    create_ndjson_response,
+    encode_ndjson_chunk,
+    ingest_ndjson_records,
+    is_ndjson_requested,
+    iter_ndjson_lines,
+    NDJSON_MEDIA_TYPE,
+)
+
+
+@pytest.fixture()
+def test_executor():
+    executor = ICATExecutor("test", max_workers=2, max_queue_size=2)
+    yield executor
+    executor.shutdown()
+
+
+class TestNDJSON:
+    @pytest.mark.parametrize(
+        "accept_header, stream, expected_result",
+        [
+            pytest.param(NDJSON_MEDIA_TYPE, False, True, id="ndjson accept header"),
+            pytest.param("application/json", True, True, id="stream query parameter"),
+            pytest.param("application/json", False, False, id="json accept header"),
+            pytest.param(None, False, False, id="no accept header"),
+        ],
+    )
+    def test_is_ndjson_requested(self, accept_header, stream, expected_result):
+        request = MagicMock()
+        request.headers = {"Accept": accept_header} if accept_header else {}
+
+        assert is_ndjson_requested(request, stream) == expected_result
+
+    def test_encode_ndjson_chunk(self):
+        assert encode_ndjson_chunk([{"id": 1}, {"id": 2, "name": "Test"}]) == '{"id": 1}\n{"id": 2, "name": "Test"}\n'
+
+    def test_streamed_response(self, test_executor):
+        closed = []
+
+        def chunks():
+            try:
+                yield [{"id": 1}, {"id": 2}]
+                yield [{"id": 3}]
+            finally:
+                closed.append(True)
+
+        test_app = FastAPI()
+
+        @test_app.get("/test")
+        async def get():
+            return await create_ndjson_response(test_executor, chunks())
+
+        response = TestClient(test_app).get("/test")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+        assert response.text == '{"id": 1}\n{"id": 2}\n{"id": 3}\n'
+        assert closed == [True]
+
+    def test_empty_response(self, test_executor):
+        def chunks():
+            yield from []
+
+        test_app = FastAPI()
+
+        @test_app.get("/test")
+        async def get():
+            return await create_ndjson_response(test_executor, chunks())
+
+        response = TestClient(test_app).get("/test")
+
+        assert response.status_code == 200
+        assert response.text == ""
+
+    def test_error_before_stream(self, test_executor):
+        def chunks():
+            raise AuthenticationError("Forbidden")
+            yield
+
+        with pytest.raises(AuthenticationError):
+            asyncio.run(create_ndjson_response(test_executor, chunks()))
+
+
+class IngestRecord(BaseModel):
+    name: str
+
+
+def parse_ingest_record(record):
+    return IngestRecord.model_validate(record).model_dump()
+
+
+async def collect_lines(byte_chunks, **kwargs):
+    async def chunks():
+        for chunk in byte_chunks:
+            yield chunk
+
+    return [line async for line in iter_ndjson_lines(chunks(), **kwargs)]
+
+
+class TestNDJSONIngest:
+    def test_lines_split_across_chunks(self):
+        lines = asyncio.run(collect_lines([b'{"a": 1}\n{"a"', b": 2}\n\n", b'{"a": 3}']))
+
+        assert lines == [(1, b'{"a": 1}'), (2, b'{"a": 2}'), (4, b'{"a": 3}')]
+
+    def test_line_too_long(self):
+        with pytest.raises(BadRequestError):
+            asyncio.run(collect_lines([b'{"a": 1}\n', b"x" * 20], max_line_bytes=10))
+
+    @pytest.fixture()
+    def ingest_app(self, test_executor):
+        created_batches = []
+
+        def create_batch(records):
+            if any(record["name"] == "duplicate" for record in records):
+                raise BadRequestError("Entity already exists")
+            if any(record["name"] == "unavailable" for record in records):
+                raise ServiceUnavailableError("ICAT is unavailable")
+            if any(record["name"] == "expired" for record in records):
+                raise AuthenticationError("Session expired")
+            created_batches.append(records)
+            first_id = sum(len(batch) for batch in created_batches) - len(records) + 1
+            return list(range(first_id, first_id + len(records)))
+
+        test_app = FastAPI()
+
+        @test_app.post("/ingest")
+        async def ingest(request: Request):
+            return await create_ndjson_ingest_response(
+                ingest_ndjson_records(test_executor, request.stream(), parse_ingest_record, create_batch, 2),
+            )
+
+        return TestClient(test_app), created_batches
+
+    def test_records_created_in_batches(self, ingest_app):
+        test_client, created_batches = ingest_app
+
+        def body():
+            for name in ["a", "b", "c", "d", "e"]:
+                yield f"{json.dumps({'name': name})}\n".encode()
+
+        response = test_client.post("/ingest", content=body())
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+        assert [json.loads(line) for line in response.text.splitlines()] == [
+            {"first_line": 1, "last_line": 2, "ids": [1, 2]},
+            {"first_line": 3, "last_line": 4, "ids": [3, 4]},
+            {"first_line": 5, "last_line": 5, "ids": [5]},
+        ]
+        assert [len(batch) for batch in created_batches] == [2, 2, 1]
+
+    def test_failed_batches_and_invalid_lines_reported(self, ingest_app):
+        test_client, created_batches = ingest_app
+        body = '{"name": "a"}\n{"title": "b"}\nnot json\n{"name": "duplicate"}\n{"name": "c"}\n{"name": "d"}\n'
+
+        response = test_client.post("/ingest", content=body)
+
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert response.status_code == 200
+        assert [(result["first_line"], "error" in result) for result in results] == [
+            (2, True),
+            (3, True),
+            (1, True),
+            (5, False),
+        ]
+        assert created_batches == [[{"name": "c"}, {"name": "d"}]]
+
+    def test_errors_after_stream_started_reported(self, ingest_app):
+        test_client, created_batches = ingest_app
+        body = "".join(
+            f"{json.dumps({'name': name})}\n" for name in ["a", "b", "unavailable", "c", "expired", "d", "e"]
+        )
+
+        response = test_client.post("/ingest", content=body)
+
+        assert response.status_code == 200
+        assert [json.loads(line) for line in response.text.splitlines()] == [
+            {"first_line": 1, "last_line": 2, "ids": [1, 2]},
+            {"first_line": 3, "last_line": 4, "error": "ICAT is unavailable"},
+            {"first_line": 5, "last_line": 6, "error": "Session expired"},
+            {"first_line": 7, "last_line": 7, "ids": [3]},
+        ]
+        assert created_batches == [[{"name": "a"}, {"name": "b"}], [{"name": "e"}]]
+
+    def test_error_before_stream(self, test_executor):
+        def create_batch(records):
+            raise AuthenticationError("Forbidden")
+
+        async def ingest():
+            async def chunks():
+                yield b'{"name": "a"}\n'
+
+            return await create_ndjson_ingest_response(
+                ingest_ndjson_records(test_executor, chunks(), parse_ingest_record, create_batch, 2),
+            )
+
+        with pytest.raises(AuthenticationError):
+            asyncio.run(ingest())
@@ -0,0 +1,145 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from datagateway_api.common.exceptions import BadRequestError
+from datagateway_api.datagateway_api.icat.filters import PythonICATOrderFilter
+from datagateway_api.datagateway_api.icat.query import ICATQuery
+
+
+@pytest.fixture()
+def paged_query():
+    # Python ICAT's Query needs a connection to ICAT, so the query is mocked
+    test_query = ICATQuery.__new__(ICATQuery)
+    test_query.query = MagicMock()
+    test_query.query.aggregate = None
+    test_query.query.attributes = []
+    test_query.query.order = {}
+    test_query.query.result_order = []
+    test_query.query.limit = None
+    test_query.query.open_ended_limit = False
+
+    def set_limit(limit):
+        test_query.query.limit = limit
+
+    test_query.query.setLimit.side_effect = set_limit
+
+    with patch("datagateway_api.datagateway_api.icat.query.get_icat_max_entities", return_value=10):
+        yield test_query
+
+
+def mock_search(number_of_results):
+    client = MagicMock()
+
+    def search(query):
+        skip, count = query.limit
+        return list(range(number_of_results))[skip : skip + count]
+
+    client.search.side_effect = search
+    return client
+
+
+class TestPagedQuery:
+    @pytest.mark.parametrize(
+        "limit, open_ended_limit, aggregate, expected_paging",
+        [
+            pytest.param(None, False, None, True, id="no limit"),
+            pytest.param((5, 10), True, None, True, id="skip without limit"),
+            pytest.param((0, 25), False, None, True, id="limit above max entities"),
+            pytest.param((0, 10), False, None, False, id="limit within max entities"),
+            pytest.param(None, False, "COUNT", False, id="count query"),
+            pytest.param(None, False, "DISTINCT", True, id="distinct query"),
+        ],
+    )
+    def test_is_paging_required(self, paged_query, limit, open_ended_limit, aggregate, expected_paging):
+        paged_query.query.limit = limit
+        paged_query.query.open_ended_limit = open_ended_limit
+        paged_query.query.aggregate = aggregate
+
+        assert paged_query.is_paging_required() == expected_paging
+
+    @pytest.mark.parametrize(
+        "limit, open_ended_limit, number_of_results, expected_results, expected_searches",
+        [
+            pytest.param(None, False, 25, list(range(25)), 3, id="multiple pages"),
+            pytest.param(None, False, 20, list(range(20)), 3, id="exact number of pages"),
+            pytest.param(None, False, 3, list(range(3)), 1, id="single page"),
+            pytest.param((5, 10), True, 25, list(range(5, 25)), 3, id="skip without limit"),
+            pytest.param((2, 15), False, 25, list(range(2, 17)), 2, id="limit above max entities"),
+        ],
+    )
+    def test_execute_paged_search(
+        self,
+        paged_query,
+        limit,
+        open_ended_limit,
+        number_of_results,
+        expected_results,
+        expected_searches,
+    ):
+        paged_query.query.limit = limit
+        paged_query.query.open_ended_limit = open_ended_limit
+        client = mock_search(number_of_results)
+
+        assert paged_query.execute_paged_search(client, max_results=100) == expected_results
+        assert client.search.call_count == expected_searches
+        paged_query.query.setOrder.assert_called_once_with([("id", "ASC")])
+
+    @pytest.mark.parametrize(
+        "result_order, attributes, expected_order",
+        [
+            pytest.param(
+                [("name", "DESC")],
+                [],
+                [("name", "DESC"), ("id", "ASC")],
+                id="id appended to existing order",
+            ),
+            pytest.param(
+                [("name", "DESC")],
+                ["name", "title"],
+                [("name", "DESC"), ("title", "ASC")],
+                id="distinct attributes appended to existing order",
+            ),
+            pytest.param([("id", "DESC"), ("name", "ASC")], [], None, id="id already ordered"),
+        ],
+    )
+    def test_order_tie_breakers(self, paged_query, result_order, attributes, expected_order):
+        paged_query.query.result_order = result_order
+        paged_query.query.order = {field: "%s" for field, _ in result_order}
+        paged_query.query.attributes = attributes
+
+        paged_query.execute_paged_search(mock_search(5), max_results=100)
+
+        if expected_order is None:
+            paged_query.query.setOrder.assert_not_called()
+        else:
+            paged_query.query.setOrder.assert_called_once_with(expected_order)
+
+    def test_max_results_exceeded(self, paged_query):
+        client = mock_search(40)
+
+        with pytest.raises(BadRequestError):
+            paged_query.execute_paged_search(client, max_results=30)
+        # Only the first result after the cap is fetched
+        assert client.search.call_count == 4
+
+    def test_max_results_not_exceeded(self, paged_query):
+        assert paged_query.execute_paged_search(mock_search(30), max_results=30) == list(range(30))
+
+    @pytest.mark.parametrize(
+        "order_filters, expected_order",
+        [
+            pytest.param([], "o.id ASC", id="no order"),
+            pytest.param([("name", "desc")], "o.name DESC, o.id ASC", id="non-unique order"),
+            pytest.param([("id", "desc")], "o.id DESC", id="ordered by id"),
+        ],
+    )
+    def test_streamed_chunks_ordered_by_id(self, offline_client, order_filters, expected_order):
+        test_query = ICATQuery(offline_client, "Investigation")
+        for field, direction in order_filters:
+            PythonICATOrderFilter(field, direction).apply_filter(test_query.query)
+        client = MagicMock()
+        client.searchChunked.return_value = iter([])
+
+        assert list(test_query.iter_query_chunks(client, chunk_size=10)) == []
+        assert str(client.searchChunked.call_args.args[0]).endswith(f" ORDER BY {expected_order}")
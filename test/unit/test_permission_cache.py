@@ -0,0 +1,284 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from datagateway_api.common.exceptions import MissingRecordError
+from datagateway_api.datagateway_api.icat.filters import PythonICATWhereFilter
+from datagateway_api.datagateway_api.icat.permission_cache import PermissionCache
+from datagateway_api.datagateway_api.icat.reader_query_handler import ReaderQueryHandler
+
+PAST = datetime(2000, 1, 1, tzinfo=timezone.utc)
+FUTURE = datetime(3000, 1, 1, tzinfo=timezone.utc)
+
+
+def patch_reader_client_pool(reader_client):
+    reader_client_pool = MagicMock()
+    reader_client_pool.run.side_effect = lambda function: function(reader_client)
+    return patch(
+        "datagateway_api.datagateway_api.icat.reader_query_handler.reader_client_pool",
+        reader_client_pool,
+    )
+
+
+class TestPermissionCache:
+    def test_result_cached(self):
+        test_cache = PermissionCache(maxsize=10, ttl=60)
+        fetch = MagicMock(return_value=5)
+
+        results = [test_cache.get_or_fetch("dataset_investigation", 1, fetch) for _ in range(3)]
+
+        assert results == [5, 5, 5]
+        fetch.assert_called_once()
+        assert test_cache.get_stats()["namespaces"]["dataset_investigation"] == {
+            "hits": 2,
+            "misses": 1,
+            "hit_rate": 2 / 3,
+        }
+
+    def test_negative_verdict_cached(self):
+        test_cache = PermissionCache(maxsize=10, ttl=60)
+        fetch = MagicMock(return_value=False)
+
+        for _ in range(2):
+            assert test_cache.get_or_fetch("user_investigation", ("user", 1), fetch) is False
+
+        fetch.assert_called_once()
+
+    def test_missing_record_cached(self):
+        test_cache = PermissionCache(maxsize=10, ttl=60)
+        fetch = MagicMock(side_effect=MissingRecordError("No Dataset found for id=1"))
+
+        for _ in range(2):
+            with pytest.raises(MissingRecordError, match="No Dataset found for id=1"):
+                test_cache.get_or_fetch("dataset_investigation", 1, fetch)
+
+        fetch.assert_called_once()
+
+    def test_namespaces_cached_separately(self):
+        test_cache = PermissionCache(maxsize=10, ttl=60)
+
+        test_cache.get_or_fetch("dataset_investigation", 1, lambda: 5)
+
+        assert test_cache.get_or_fetch("dataset_open", 1, lambda: True) is True
+
+    def test_many_results_fetched_at_once(self):
+        test_cache = PermissionCache(maxsize=10, ttl=60)
+        test_cache.store("dataset_open", 1, True)
+        fetch_many = MagicMock(side_effect=lambda keys: dict.fromkeys(keys, False))
+
+        assert test_cache.get_many_or_fetch("dataset_open", [1, 2, 3, 2], fetch_many) == {1: True, 2: False, 3: False}
+        assert test_cache.get_many_or_fetch("dataset_open", [2, 3], fetch_many) == {2: False, 3: False}
+        fetch_many.assert_called_once_with([2, 3])
+
+    @pytest.mark.parametrize(
+        "maxsize, max_bytes",
+        [pytest.param(5, None, id="entries"), pytest.param(100, 1000, id="bytes")],
+    )
+    def test_bounded(self, maxsize, max_bytes):
+        test_cache = PermissionCache(maxsize=maxsize, ttl=60, max_bytes=max_bytes)
+
+        for id_ in range(100):
+            test_cache.get_or_fetch("dataset_investigation", id_, lambda: 5)
+
+        assert 0 < test_cache.get_stats()["entries"] < 100
+        assert test_cache.get_stats()["size"] <= (max_bytes or maxsize)
+
+
+class TestReaderQueryHandlerPermissionCaching:
+    @pytest.fixture(autouse=True)
+    def reader_client(self):
+        test_cache = PermissionCache(maxsize=100, ttl=60)
+        reader_client = MagicMock()
+        with patch("datagateway_api.datagateway_api.icat.reader_query_handler.permission_cache", test_cache):
+            with patch_reader_client_pool(reader_client):
+                yield reader_client
+
+    def test_unauthorised_user_cached(self, reader_client):
+        reader_client.search.return_value = []
+
+        for _ in range(3):
+            assert ReaderQueryHandler.is_user_allowed("user", 1) is False
+
+        # One query for both investigation users and instrument scientists
+        reader_client.search.assert_called_once()
+
+    def test_missing_dataset_cached(self, reader_client):
+        reader_client.search.return_value = []
+
+        for _ in range(2):
+            with pytest.raises(MissingRecordError):
+                ReaderQueryHandler.get_investigation_id(dataset_id=1)
+
+        reader_client.search.assert_called_once()
+
+    def test_unauthorised_user_cached_for_many_investigations(self, reader_client):
+        reader_client.search.return_value = [1, 2]
+
+        for _ in range(2):
+            assert ReaderQueryHandler.get_allowed_investigation_ids("user's", [1, 2, 3]) == {1, 2}
+
+        # One query covering all of the investigations
+        reader_client.search.assert_called_once()
+        query = reader_client.search.call_args.args[0]
+        assert "WHERE i.id IN (1, 2, 3) AND (iuu.name = 'user''s' OR su.name = 'user''s')" in query
+
+
+def create_field(name, rel_type, entity_type):
+    field = MagicMock(relType=rel_type, type=entity_type)
+    field.name = name
+    return field
+
+
+class TestReaderQueryHandlerInFilters:
+    @pytest.fixture(autouse=True)
+    def reader_client(self):
+        test_cache = PermissionCache(maxsize=100, ttl=60)
+        reader_client = MagicMock()
+        entity_fields = {
+            "Investigation": [create_field("name", "ATTRIBUTE", "String")],
+            "Dataset": [create_field("investigation", "ONE", "Investigation")],
+            "Datafile": [create_field("dataset", "ONE", "Dataset")],
+            "DatafileParameter": [create_field("datafile", "ONE", "Datafile")],
+            "DatafileFormat": [create_field("datafiles", "MANY", "Datafile")],
+        }
+        reader_client.getEntityInfo.side_effect = lambda entity_type: MagicMock(fields=entity_fields[entity_type])
+        with patch("datagateway_api.datagateway_api.icat.reader_query_handler.permission_cache", test_cache):
+            with patch(
+                "datagateway_api.datagateway_api.icat.reader_query_handler.get_icat_max_entities",
+                return_value=3,
+            ):
+                with patch(
+                    "datagateway_api.datagateway_api.icat.reader_query_handler.session_metadata_cache",
+                ) as session_metadata_cache:
+                    session_metadata_cache.get_or_fetch.return_value.username = "user"
+                    with patch_reader_client_pool(reader_client):
+                        with patch.dict(ReaderQueryHandler.parent_chains, clear=True):
+                            yield reader_client
+
+    @pytest.mark.parametrize(
+        "value, operation, expected_ids",
+        [
+            pytest.param(4, "eq", [4], id="eq"),
+            pytest.param([4, 5, 4], "in", [4, 5], id="in"),
+            pytest.param([4, 5], "inq", [4, 5], id="inq"),
+            pytest.param("(4, 5)", "in", [4, 5], id="applied in filter"),
+            pytest.param([], "in", None, id="no ids"),
+            pytest.param([1, 2, 3, 4], "in", None, id="more ids than max entities"),
+            pytest.param(["a"], "in", None, id="invalid id"),
+        ],
+    )
+    def test_eligibility(self, value, operation, expected_ids):
+        query_filter = PythonICATWhereFilter("dataset.id", [], operation)
+        query_filter.value = value
+        test_handler = ReaderQueryHandler("Datafile", [query_filter])
+
+        assert test_handler.is_query_eligible_for_reader_performance() == (expected_ids is not None)
+        if expected_ids is not None:
+            assert test_handler.where_filter_entity_ids == expected_ids
+
+    @pytest.mark.parametrize(
+        "search_results, expected_authorised",
+        [
+            pytest.param([[[1, 10], [2, 10], [3, 11]]], True, id="all investigations allowed"),
+            pytest.param(
+                [[[1, 10], [2, 10]], [[3, 11, None], [3, 11, FUTURE], [3, 11, PAST]]],
+                True,
+                id="open dataset",
+            ),
+            pytest.param(
+                [[[1, 10], [2, 10]], [[3, 11, FUTURE]]],
+                False,
+                id="dataset to be published",
+            ),
+            pytest.param([[[1, 10], [2, 10]], [[3, 11, None]]], False, id="dataset not visible"),
+            pytest.param([[[1, 10], [2, 10]], []], False, id="missing dataset"),
+        ],
+    )
+    def test_datafiles_in_many_datasets(self, reader_client, search_results, expected_authorised):
+        reader_client.search.side_effect = search_results
+        test_handler = ReaderQueryHandler("Datafile", [PythonICATWhereFilter("dataset.id", [1, 2, 3], "in")])
+
+        for _ in range(2):
+            assert test_handler.is_user_authorised_to_see_entity_id(MagicMock()) == expected_authorised
+
+        # One query for the datasets the user is associated with, plus one for the rest.
+        # The second check is answered by the cache
+        assert reader_client.search.call_count == len(search_results)
+
+    def test_verdict_queries_populate_caches(self, reader_client):
+        reader_client.search.side_effect = [[[1, 10]], [[2, 11, PAST], [3, 12, None]]]
+
+        assert ReaderQueryHandler.get_visible_dataset_ids("user", [1, 2, 3]) == {1, 2}
+
+        assert ReaderQueryHandler.get_investigation_id(2) == 11
+        assert ReaderQueryHandler.is_user_allowed("user", 10) is True
+        assert ReaderQueryHandler.is_user_allowed("user", 11) is False
+        assert ReaderQueryHandler.is_dataset_open(2) is True
+        assert ReaderQueryHandler.is_dataset_open(3) is False
+        assert reader_client.search.call_count == 2
+        # Only the datasets not found by the first query are looked up again, and the
+        # second query doesn't join the investigation's users
+        second_query = reader_client.search.call_args_list[1].args[0]
+        assert second_query.endswith("WHERE d.id IN (2, 3)")
+        assert "iuu" not in second_query
+
+    def test_datasets_in_many_investigations(self, reader_client):
+        reader_client.search.return_value = [1, 2]
+        test_handler = ReaderQueryHandler("Dataset", [PythonICATWhereFilter("investigation.id", [1, 2, 3], "in")])
+
+        assert test_handler.is_user_authorised_to_see_entity_id(MagicMock()) is False
+
+    @pytest.mark.parametrize(
+        "entity_filter_fields, parent_relations, expected_parent_chain",
+        [
+            pytest.param(
+                {"DatafileParameter": "datafile.dataset.id"},
+                {},
+                ([], "Dataset"),
+                id="field resolving to a dataset",
+            ),
+            pytest.param(
+                {"DatafileParameter": "datafile.id"},
+                {"Datafile": "dataset"},
+                ([("Datafile", "dataset")], "Dataset"),
+                id="parent resolved by parent relations",
+            ),
+            pytest.param({"DatafileParameter": "datafile.id"}, {}, None, id="parent relation not configured"),
+            pytest.param({"DatafileParameter": "datafile.name"}, {}, None, id="field not an id"),
+            pytest.param({"DatafileParameter": "unknown.id"}, {}, None, id="unknown relation"),
+            pytest.param({"DatafileFormat": "datafiles.id"}, {}, None, id="many relation"),
+        ],
+    )
+    def test_configured_entity_types(self, entity_filter_fields, parent_relations, expected_parent_chain):
+        entity_type, field = next(iter(entity_filter_fields.items()))
+        reader_config = MagicMock(entity_filter_fields=entity_filter_fields, parent_relations=parent_relations)
+        with patch("datagateway_api.datagateway_api.icat.reader_query_handler.Config") as config:
+            config.config.datagateway_api.use_reader_for_performance = reader_config
+            test_handler = ReaderQueryHandler(entity_type, [PythonICATWhereFilter(field, 1, "eq")])
+
+        assert test_handler.is_query_eligible_for_reader_performance() == (expected_parent_chain is not None)
+        assert ReaderQueryHandler.parent_chains[(entity_type, field)] == expected_parent_chain
+
+    def test_parents_resolved_up_to_dataset(self, reader_client):
+        reader_client.search.side_effect = [
+            [[1, 10], [2, 11]],
+            [[10, 20], [11, 20]],
+        ]
+        reader_config = MagicMock(
+            entity_filter_fields={"DatafileParameter": "datafile.id"},
+            parent_relations={"Datafile": "dataset"},
+        )
+        with patch("datagateway_api.datagateway_api.icat.reader_query_handler.Config") as config:
+            config.config.datagateway_api.use_reader_for_performance = reader_config
+            test_handler = ReaderQueryHandler(
+                "DatafileParameter",
+                [PythonICATWhereFilter("datafile.id", [1, 2], "in")],
+            )
+
+        assert test_handler.is_user_authorised_to_see_entity_id(MagicMock()) is True
+        assert reader_client.search.call_count == 2
+        assert reader_client.search.call_args_list[0].args[0] == (
+            "SELECT o.id, o.dataset.id FROM Datafile o WHERE o.id IN (1, 2)"
+        )
+        assert reader_client.search.call_args_list[1].args[0].startswith("SELECT DISTINCT d.id, i.id")
@@ -43,3 +43,14 @@ class TestQueriesRecords:
 
         with pytest.raises(expected_exception):
             raise_exception()
+
+    def test_generator_error_raised(self):
+        @queries_records
+        def raise_exception():
+            yield 1
+            raise ValueError()
+
+        test_generator = raise_exception()
+        assert next(test_generator) == 1
+        with pytest.raises(BadRequestError):
+            next(test_generator)
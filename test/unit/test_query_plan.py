@@ -0,0 +1,135 @@
+from unittest.mock import patch
+
+import pytest
+
+from datagateway_api.datagateway_api.icat.filters import (
+    PythonICATCursorFilter,
+    PythonICATDistinctFieldFilter,
+    PythonICATIncludeFilter,
+    PythonICATLimitFilter,
+    PythonICATOrderFilter,
+    PythonICATSkipFilter,
+    PythonICATWhereFilter,
+)
+from datagateway_api.datagateway_api.icat.query_plan import QueryPlanCache
+
+
+@pytest.fixture(autouse=True)
+def max_entities():
+    with patch("datagateway_api.datagateway_api.icat.query_plan.get_icat_max_entities", return_value=100):
+        with patch("datagateway_api.datagateway_api.icat.filters.get_icat_max_entities", return_value=100):
+            yield
+
+
+def create_filters(name="Test Investigation", title="%data%", skip=5, limit=10):
+    return [
+        PythonICATWhereFilter("name", name, "eq"),
+        PythonICATWhereFilter("title", title, "ilike"),
+        PythonICATWhereFilter("datasets.name", "Dataset", "like"),
+        PythonICATOrderFilter("startDate", "desc"),
+        PythonICATIncludeFilter("datasets"),
+        PythonICATSkipFilter(skip),
+        PythonICATLimitFilter(limit),
+    ]
+
+
+class TestQueryPlanCache:
+    @pytest.mark.parametrize(
+        "create_test_filters, aggregate",
+        [
+            pytest.param(create_filters, None, id="where, order, include, skip and limit"),
+            pytest.param(lambda: [], None, id="no filters"),
+            pytest.param(lambda: [PythonICATSkipFilter(5)], None, id="skip without limit"),
+            pytest.param(
+                lambda: [PythonICATWhereFilter("name", "a", "eq"), PythonICATWhereFilter("name", "b", "neq")],
+                None,
+                id="multiple conditions on one attribute",
+            ),
+            pytest.param(
+                lambda: [PythonICATWhereFilter("id", [1, 2], "in"), PythonICATWhereFilter("doi", True, "isnull")],
+                "COUNT",
+                id="count query",
+            ),
+            pytest.param(
+                lambda: [PythonICATDistinctFieldFilter(["name", "title"]), PythonICATLimitFilter(3)],
+                "COUNT",
+                id="distinct count query",
+            ),
+        ],
+    )
+    def test_plan_matches_built_query(self, offline_client, create_test_filters, aggregate):
+        test_cache = QueryPlanCache(maxsize=5)
+        expected_query = QueryPlanCache.build_query(offline_client, "Investigation", create_test_filters(), aggregate)
+
+        # The first query compiles the plan, the second is bound from the cached plan
+        for _ in range(2):
+            test_query = test_cache.get_query(offline_client, "Investigation", create_test_filters(), aggregate)
+
+            assert str(test_query.query) == str(expected_query.query)
+            assert test_query.query.manual_count == expected_query.query.manual_count
+            assert test_query.query.open_ended_limit == expected_query.query.open_ended_limit
+
+        assert test_cache.get_stats()["misses"] == 1
+        assert test_cache.get_stats()["hits"] == 1
+
+    def test_plan_reused_with_different_values(self, offline_client):
+        test_cache = QueryPlanCache(maxsize=5)
+        test_cache.get_query(offline_client, "Investigation", create_filters())
+
+        test_query = test_cache.get_query(
+            offline_client,
+            "Investigation",
+            create_filters(name="It's 100% a test", title="other", skip=20, limit=50),
+        )
+
+        expected_query = QueryPlanCache.build_query(
+            offline_client,
+            "Investigation",
+            create_filters(name="It's 100% a test", title="other", skip=20, limit=50),
+        )
+        assert str(test_query.query) == str(expected_query.query)
+        assert test_cache.get_stats()["hits"] == 1
+
+    def test_plan_not_shared_between_structures(self, offline_client):
+        test_cache = QueryPlanCache(maxsize=5)
+
+        test_cache.get_query(offline_client, "Investigation", [PythonICATWhereFilter("name", "a", "eq")])
+        test_cache.get_query(offline_client, "Investigation", [PythonICATWhereFilter("name", "a", "ilike")])
+        test_cache.get_query(offline_client, "Investigation", [PythonICATOrderFilter("name", "asc")])
+        test_cache.get_query(offline_client, "Dataset", [PythonICATWhereFilter("name", "a", "eq")])
+
+        assert test_cache.get_stats()["misses"] == 4
+        assert test_cache.get_stats()["hits"] == 0
+
+    def test_bound_query_independent_of_plan(self, offline_client):
+        test_cache = QueryPlanCache(maxsize=5)
+        first_query = test_cache.get_query(offline_client, "Investigation", create_filters(name="First"))
+
+        test_cache.get_query(offline_client, "Investigation", create_filters(name="Second"))
+
+        assert "o.name = 'First'" in str(first_query.query)
+
+    @pytest.mark.parametrize(
+        "test_filters, maxsize",
+        [
+            pytest.param([PythonICATCursorFilter("")], 5, id="cursor filter"),
+            pytest.param([PythonICATDistinctFieldFilter([{"name": 1}])], 5, id="invalid distinct field"),
+            pytest.param([], 0, id="cache disabled"),
+        ],
+    )
+    def test_uncacheable_query(self, offline_client, test_filters, maxsize):
+        test_cache = QueryPlanCache(maxsize=maxsize)
+
+        with patch.object(QueryPlanCache, "build_query") as build_query:
+            test_query = test_cache.get_query(offline_client, "Investigation", test_filters)
+
+        assert test_query == build_query.return_value
+        assert test_cache.get_stats()["misses"] == 0
+
+    def test_maxsize(self, offline_client):
+        test_cache = QueryPlanCache(maxsize=2)
+
+        for field in ["name", "title", "startDate"]:
+            test_cache.get_query(offline_client, "Investigation", [PythonICATOrderFilter(field, "asc")])
+
+        assert test_cache.get_stats()["size"] == 2
@@ -0,0 +1,131 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from unittest.mock import MagicMock, patch
+
+from icat.exception import ICATSessionError
+import pytest
+
+from datagateway_api.common.exceptions import PythonICATError, ServiceUnavailableError
+from datagateway_api.datagateway_api.icat.filters import PythonICATWhereFilter
+from datagateway_api.datagateway_api.icat.helpers import get_data_with_filters
+from datagateway_api.datagateway_api.icat.reader_client_pool import ReaderClientPool
+
+
+@pytest.fixture()
+def icat_client():
+    session_ids = iter(f"session{i}" for i in range(100))
+    with patch("datagateway_api.datagateway_api.icat.reader_client_pool.ICATClient") as icat_client_mock:
+        icat_client_mock.side_effect = lambda client_use: MagicMock(
+            login=MagicMock(side_effect=lambda **kwargs: next(session_ids)),
+        )
+        yield icat_client_mock
+
+
+class TestReaderClientPool:
+    def test_clients_checked_out_concurrently(self, icat_client):
+        test_pool = ReaderClientPool(size=4, refresh_interval=0, checkout_timeout=1)
+        barrier = threading.Barrier(4)
+
+        def query(reader_client):
+            # Only passes once four queries are running at the same time
+            barrier.wait(timeout=1)
+            return reader_client.sessionId
+
+        with ThreadPoolExecutor(4) as executor:
+            session_ids = list(executor.map(lambda _: test_pool.run(query), range(4)))
+
+        assert session_ids == ["session0"] * 4
+        assert test_pool.total_logins == 1
+        # One client for logging in and one for each query
+        assert icat_client.call_count == 5
+
+    def test_clients_reused(self, icat_client):
+        test_pool = ReaderClientPool(size=4, refresh_interval=0, checkout_timeout=1)
+
+        for _ in range(3):
+            with test_pool.checkout():
+                pass
+
+        assert icat_client.call_count == 2
+        assert test_pool.get_stats()["idle_clients"] == 1
+
+    def test_checkout_timeout(self, icat_client):
+        test_pool = ReaderClientPool(size=1, refresh_interval=0, checkout_timeout=0.01)
+
+        with test_pool.checkout():
+            with pytest.raises(ServiceUnavailableError):
+                with test_pool.checkout():
+                    pass
+
+    def test_single_flight_login(self, icat_client):
+        test_pool = ReaderClientPool(size=8, refresh_interval=0, checkout_timeout=1)
+        test_pool.login(expired_session_id=None)
+        barrier = threading.Barrier(8)
+
+        def query(reader_client):
+            if reader_client.sessionId == "session0":
+                # Every thread finds the session has expired before any logs in again
+                barrier.wait(timeout=1)
+                raise ICATSessionError("Session expired")
+            return reader_client.sessionId
+
+        with ThreadPoolExecutor(8) as executor:
+            session_ids = list(executor.map(lambda _: test_pool.run(query), range(8)))
+
+        assert session_ids == ["session1"] * 8
+        assert test_pool.total_logins == 2
+
+    def test_refresh(self, icat_client):
+        test_pool = ReaderClientPool(size=1, refresh_interval=0, checkout_timeout=1)
+        test_pool.login(expired_session_id=None)
+
+        test_pool.refresh()
+
+        test_pool._login_client.refresh.assert_called_once()
+        assert test_pool.session_id == "session0"
+
+    def test_refresh_of_expired_session(self, icat_client):
+        test_pool = ReaderClientPool(size=1, refresh_interval=0, checkout_timeout=1)
+        test_pool.login(expired_session_id=None)
+        test_pool._login_client.refresh.side_effect = ICATSessionError("Session expired")
+
+        test_pool.refresh()
+
+        assert test_pool.session_id == "session1"
+
+    def test_invalid_credentials(self, icat_client):
+        icat_client.side_effect = lambda client_use: MagicMock(login=MagicMock(side_effect=ICATSessionError("Bad")))
+        test_pool = ReaderClientPool(size=1, refresh_interval=0, checkout_timeout=1)
+
+        with pytest.raises(PythonICATError, match="Internal error with reader account configuration"):
+            with test_pool.checkout():
+                pass
+
+        # The client is returned to the pool despite the failed login
+        assert test_pool.get_stats()["idle_clients"] == 1
+
+    def test_query_retried_with_unchanged_filters(self, icat_client):
+        test_pool = ReaderClientPool(size=1, refresh_interval=0, checkout_timeout=1)
+        test_filters = [PythonICATWhereFilter("name", "a", "ilike")]
+        attempted_conditions = []
+
+        def execute_entity_query(client, entity_type, filters, aggregate=None):
+            # Building a query changes an ilike filter's field
+            attempted_conditions.append(filters[0].create_filter())
+            if len(attempted_conditions) == 1:
+                raise ICATSessionError("Session expired")
+            return []
+
+        helpers = "datagateway_api.datagateway_api.icat.helpers"
+        with patch(f"{helpers}.is_use_reader_for_performance_enabled", return_value=True):
+            with patch(f"{helpers}.ReaderQueryHandler") as reader_query_handler:
+                reader_query_handler.return_value.is_query_eligible_for_reader_performance.return_value = True
+                reader_query_handler.return_value.is_user_authorised_to_see_entity_id.return_value = True
+                with patch(f"{helpers}.reader_client_pool", test_pool):
+                    with patch(f"{helpers}.execute_entity_query", side_effect=execute_entity_query):
+                        assert get_data_with_filters(MagicMock(), "Investigation", test_filters) == []
+
+        assert attempted_conditions[0] == attempted_conditions[1]
+        assert list(attempted_conditions[0]) == ["UPPER(name)"]
+        assert test_filters[0].field == "name"
+        assert test_pool.total_logins == 2
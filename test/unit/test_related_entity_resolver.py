@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from datagateway_api.common.exceptions import BadRequestError
+from datagateway_api.datagateway_api.icat.helpers import (
+    build_related_entities,
+    RelatedEntityResolver,
+)
+
+
+def create_field(name, rel_type, entity_type=None):
+    field = MagicMock(relType=rel_type, type=entity_type)
+    field.name = name
+    return field
+
+
+@pytest.fixture()
+def client():
+    client = MagicMock()
+    entity_fields = {
+        "Datafile": [
+            create_field("name", "ATTRIBUTE", "String"),
+            create_field("dataset", "ONE", "Dataset"),
+            create_field("datafileFormat", "ONE", "DatafileFormat"),
+            create_field("parameters", "MANY", "DatafileParameter"),
+        ],
+        "DatafileParameter": [
+            create_field("stringValue", "ATTRIBUTE", "String"),
+            create_field("datafile", "ONE", "Datafile"),
+            create_field("type", "ONE", "ParameterType"),
+        ],
+    }
+    client.getEntityInfo.side_effect = lambda entity_type: MagicMock(fields=entity_fields[entity_type])
+    client.new.side_effect = lambda entity_type, **kwargs: MagicMock(**kwargs)
+    return client
+
+
+@pytest.fixture()
+def get_entities_by_ids():
+    with patch(
+        "datagateway_api.datagateway_api.icat.helpers.get_entities_by_ids",
+        side_effect=lambda client, entity_type, ids, return_json_formattable_data: {
+            id_: f"{entity_type} {id_}" for id_ in ids if id_ < 100
+        },
+    ) as get_entities_by_ids_mock:
+        yield get_entities_by_ids_mock
+
+
+class TestRelatedEntityResolver:
+    def test_related_entities_fetched_once_per_type(self, client, get_entities_by_ids):
+        data = [
+            {"name": f"file{i}", "dataset": 1, "datafileFormat": 2, "parameters": [{"stringValue": "a", "type": 3}]}
+            for i in range(50)
+        ]
+
+        datafiles = build_related_entities(client, "Datafile", data)
+
+        assert get_entities_by_ids.call_count == 3
+        assert {call.args[1]: call.args[2] for call in get_entities_by_ids.call_args_list} == {
+            "Dataset": [1] * 50,
+            "DatafileFormat": [2] * 50,
+            "ParameterType": [3] * 50,
+        }
+        client.get.assert_not_called()
+        # Entity info is only searched once per entity type
+        assert client.getEntityInfo.call_count == 2
+        assert datafiles[0].dataset == "Dataset 1"
+        assert datafiles[49].datafileFormat == "DatafileFormat 2"
+        assert datafiles[49].parameters[0].type == "ParameterType 3"
+
+    def test_nested_entities_resolved_by_caller(self, client, get_entities_by_ids):
+        resolver = RelatedEntityResolver(client)
+
+        datafiles = build_related_entities(client, "Datafile", [{"dataset": 1}], resolver=resolver)
+        get_entities_by_ids.assert_not_called()
+        resolver.resolve()
+
+        assert datafiles[0].dataset == "Dataset 1"
+
+    def test_parent_relationship_skipped(self, client, get_entities_by_ids):
+        data = [{"stringValue": "a", "datafile": 1}]
+
+        build_related_entities(client, "DatafileParameter", data, parent_entity_type="Datafile")
+
+        get_entities_by_ids.assert_not_called()
+        assert data == [{"stringValue": "a"}]
+
+    @pytest.mark.parametrize(
+        "related_id",
+        [pytest.param(100, id="missing entity"), pytest.param("abc", id="invalid id")],
+    )
+    def test_invalid_related_entity(self, client, get_entities_by_ids, related_id):
+        with pytest.raises(BadRequestError):
+            build_related_entities(client, "Datafile", [{"dataset": related_id}])
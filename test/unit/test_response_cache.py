@@ -0,0 +1,270 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from datagateway_api.common.count_cache import CountCache
+from datagateway_api.datagateway_api.icat.filters import (
+    PythonICATCursorFilter,
+    PythonICATIncludeFilter,
+    PythonICATLimitFilter,
+    PythonICATOrderFilter,
+    PythonICATWhereFilter,
+)
+from datagateway_api.datagateway_api.icat.response_cache import (
+    caches_count,
+    get_dependencies,
+    invalidates_cached_responses,
+    ResponseCache,
+)
+from test.unit.test_count_cache import wait_for_refreshes
+
+
+@pytest.fixture()
+def username():
+    with patch("datagateway_api.datagateway_api.icat.response_cache.session_metadata_cache") as session_cache:
+        session_cache.get_or_fetch.return_value.username = "Test User"
+        yield session_cache.get_or_fetch.return_value
+
+
+def create_filters():
+    return [PythonICATWhereFilter("title", "Test", "ilike"), PythonICATLimitFilter(10)]
+
+
+def execute_query(filters):
+    # Applying filters can modify them, as `PythonICATWhereFilter.create_filter()` does
+    for query_filter in filters:
+        if isinstance(query_filter, PythonICATWhereFilter):
+            query_filter.create_filter()
+    return [{"id": 1, "title": "Test Investigation"}]
+
+
+@pytest.mark.usefixtures("username")
+class TestResponseCache:
+    def test_cached_response_reused(self, offline_client):
+        test_cache = ResponseCache(max_bytes=1000, ttl=60)
+        execute = MagicMock(side_effect=execute_query)
+
+        for _ in range(3):
+            filters = create_filters()
+            result = test_cache.get_or_execute(
+                offline_client,
+                "get_with_filters",
+                "Investigation",
+                filters,
+                lambda filters=filters: execute(filters),
+            )
+
+        assert result == [{"id": 1, "title": "Test Investigation"}]
+        execute.assert_called_once()
+        assert test_cache.get_stats()["hits"] == 2
+        assert test_cache.get_stats()["misses"] == 1
+
+    def test_cached_response_copied(self, offline_client):
+        test_cache = ResponseCache(max_bytes=1000, ttl=60)
+
+        for _ in range(2):
+            result = test_cache.get_or_execute(
+                offline_client,
+                "get_with_filters",
+                "Investigation",
+                [],
+                lambda: [{"id": 1, "title": "Test Investigation"}],
+            )
+            result[0]["title"] = "Modified"
+            result.append({"id": 2})
+
+        result = test_cache.get_or_execute(offline_client, "get_with_filters", "Investigation", [], lambda: [])
+        assert result == [{"id": 1, "title": "Test Investigation"}]
+
+    def test_responses_cached_per_user(self, offline_client, username):
+        test_cache = ResponseCache(max_bytes=1000, ttl=60)
+        execute = MagicMock(return_value=1)
+
+        for test_username in ["User A", "User B", "User A"]:
+            username.username = test_username
+            test_cache.get_or_execute(offline_client, "count_with_filters", "Investigation", [], execute)
+
+        assert execute.call_count == 2
+
+    def test_operations_cached_separately(self, offline_client):
+        test_cache = ResponseCache(max_bytes=1000, ttl=60)
+
+        test_cache.get_or_execute(offline_client, "count_with_filters", "Investigation", [], lambda: 1)
+        result = test_cache.get_or_execute(offline_client, "get_with_filters", "Investigation", [], lambda: [])
+
+        assert result == []
+
+    @pytest.mark.parametrize(
+        "written_entity_type, expected_remaining_entries",
+        [
+            pytest.param("Dataset", 1, id="related entity type"),
+            pytest.param("Investigation", 0, id="parent entity type"),
+            pytest.param("Rule", 0, id="authorisation entity type"),
+            pytest.param("InvestigationUser", 0, id="investigation user"),
+            pytest.param("DataPublication", 0, id="data publication"),
+        ],
+    )
+    def test_invalidate(self, offline_client, written_entity_type, expected_remaining_entries):
+        test_cache = ResponseCache(max_bytes=1000, ttl=60)
+        test_cache.get_or_execute(offline_client, "count_with_filters", "Investigation", [], lambda: 1)
+        test_cache.get_or_execute(
+            offline_client,
+            "count_with_filters",
+            "Investigation",
+            [PythonICATIncludeFilter("datasets")],
+            lambda: 1,
+        )
+
+        test_cache.invalidate(offline_client, written_entity_type)
+
+        assert test_cache.get_stats()["entries"] == expected_remaining_entries
+
+    def test_child_entity_type_invalidated_by_parent(self, offline_client):
+        test_cache = ResponseCache(max_bytes=1000, ttl=60)
+        test_cache.get_or_execute(offline_client, "count_with_filters", "Dataset", [], lambda: 1)
+
+        # Deleting an investigation deletes its datasets
+        test_cache.invalidate(offline_client, "Investigation")
+
+        assert test_cache.get_stats()["entries"] == 0
+
+    def test_cursor_request_not_cached(self, offline_client):
+        test_cache = ResponseCache(max_bytes=1000, ttl=60)
+        execute = MagicMock(return_value=[])
+
+        for _ in range(2):
+            test_cache.get_or_execute(
+                offline_client,
+                "get_with_filters",
+                "Investigation",
+                [PythonICATCursorFilter("")],
+                execute,
+            )
+
+        assert execute.call_count == 2
+        assert test_cache.get_stats()["misses"] == 0
+
+    def test_large_response_not_cached(self, offline_client):
+        test_cache = ResponseCache(max_bytes=10, ttl=60)
+
+        test_cache.get_or_execute(offline_client, "get_with_filters", "Investigation", [], lambda: ["a" * 20])
+
+        assert test_cache.get_stats()["entries"] == 0
+
+    def test_max_bytes(self, offline_client):
+        test_cache = ResponseCache(max_bytes=20, ttl=60)
+
+        for id_ in range(3):
+            test_cache.get_or_execute(offline_client, "get_with_id", "Investigation", id_, lambda: {"id": 1})
+
+        assert test_cache.get_stats()["size"] <= 20
+        assert test_cache.get_stats()["entries"] == 2
+
+
+class TestGetDependencies:
+    @pytest.mark.parametrize(
+        "test_query, expected_dependencies",
+        [
+            pytest.param([], {"Investigation"}, id="no filters"),
+            pytest.param(5, {"Investigation"}, id="get by id"),
+            pytest.param(
+                [PythonICATIncludeFilter("datasets")],
+                {"Investigation", "Dataset"},
+                id="include filter",
+            ),
+            pytest.param(
+                [PythonICATWhereFilter("datasets.investigation.name", "Test", "eq")],
+                {"Investigation", "Dataset"},
+                id="related where filter",
+            ),
+            pytest.param(
+                [PythonICATWhereFilter("unknown.name", "Test", "eq")],
+                {"Investigation", "*"},
+                id="unknown field",
+            ),
+        ],
+    )
+    def test_get_dependencies(self, offline_client, test_query, expected_dependencies):
+        assert get_dependencies(offline_client, "Investigation", test_query) == expected_dependencies
+
+
+@pytest.mark.usefixtures("username")
+class TestCachesCount:
+    @pytest.fixture()
+    def test_count_cache(self):
+        test_cache = CountCache("test", maxsize=10, soft_ttl=0, hard_ttl=60)
+        with patch("datagateway_api.datagateway_api.icat.response_cache.count_cache", test_cache):
+            yield test_cache
+
+    def test_stale_count_refreshed_with_new_client(self, offline_client, test_count_cache):
+        count_method = MagicMock(side_effect=[5, 10])
+        cached_count_method = caches_count(count_method)
+        refresh_client = MagicMock()
+
+        with patch("datagateway_api.datagateway_api.icat.response_cache.count_refresh_lease_manager") as lease_manager:
+            lease_manager.lease.return_value.__enter__.return_value = refresh_client
+            for _ in range(2):
+                result = cached_count_method(
+                    "self",
+                    "session",
+                    "Investigation",
+                    create_filters()[:1],
+                    client=offline_client,
+                )
+            wait_for_refreshes(test_count_cache)
+
+        assert result == 5
+        assert count_method.call_args.kwargs["client"] == refresh_client
+        # Applying filters modifies them, so the refresh is given a copy of them
+        assert count_method.call_args.args[3] is not count_method.call_args_list[0].args[3]
+        lease_manager.lease.assert_called_once_with(None, "session")
+
+    def test_count_with_order_filter_not_cached(self, offline_client, test_count_cache):
+        count_method = MagicMock(return_value=5)
+        cached_count_method = caches_count(count_method)
+
+        for _ in range(2):
+            cached_count_method(
+                "self",
+                "session",
+                "Investigation",
+                [PythonICATOrderFilter("name", "asc")],
+                client=offline_client,
+            )
+
+        assert count_method.call_count == 2
+        assert test_count_cache.get_stats()["misses"] == 0
+
+
+class TestInvalidatesCachedResponses:
+    def test_failed_write_invalidates(self):
+        @invalidates_cached_responses
+        def failing_write(client, entity_type, data):
+            raise ValueError("Write failed")
+
+        with patch("datagateway_api.datagateway_api.icat.response_cache.response_cache") as test_cache:
+            with pytest.raises(ValueError):
+                failing_write("client", "Investigation", {})
+
+        test_cache.invalidate.assert_called_once_with("client", "Investigation")
+
+    def test_write_invalidates_counts(self, offline_client):
+        @invalidates_cached_responses
+        def write(client, entity_type, data):
+            pass
+
+        with patch("datagateway_api.datagateway_api.icat.response_cache.count_cache") as test_cache:
+            write(offline_client, "Investigation", {})
+
+        test_cache.invalidate.assert_called_once_with({"Investigation", "Dataset", "*"})
+
+    def test_authorisation_write_clears_counts(self, offline_client):
+        @invalidates_cached_responses
+        def write(client, entity_type, data):
+            pass
+
+        with patch("datagateway_api.datagateway_api.icat.response_cache.count_cache") as test_cache:
+            write(offline_client, "InvestigationUser", {})
+
+        test_cache.clear.assert_called_once()
+        test_cache.invalidate.assert_not_called()
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from dateutil.tz import tzlocal
+import pytest
+
+from datagateway_api.datagateway_api.icat.session_cache import SessionMetadata, SessionMetadataCache
+
+
+@pytest.fixture()
+def mock_client():
+    client = MagicMock()
+    client.sessionId = "Test Session ID"
+    client.getRemainingMinutes.return_value = 60
+    client.getUserName.return_value = "Test User"
+    return client
+
+
+class TestSessionMetadataCache:
+    def test_get_or_fetch_populates_cache(self, mock_client):
+        test_cache = SessionMetadataCache(maxsize=5, ttl=60)
+
+        metadata = test_cache.get_or_fetch(mock_client)
+
+        assert metadata.username == "Test User"
+        assert 59 < metadata.get_remaining_minutes() <= 60
+        assert test_cache.get("Test Session ID") == metadata
+
+    def test_cached_metadata_reused(self, mock_client):
+        test_cache = SessionMetadataCache(maxsize=5, ttl=60)
+
+        for _ in range(3):
+            test_cache.get_or_fetch(mock_client)
+
+        mock_client.getRemainingMinutes.assert_called_once()
+        mock_client.getUserName.assert_called_once()
+
+    def test_expired_session_not_cached(self, mock_client):
+        test_cache = SessionMetadataCache(maxsize=5, ttl=60)
+        mock_client.getRemainingMinutes.return_value = -1
+
+        metadata = test_cache.get_or_fetch(mock_client)
+
+        assert metadata.is_expired()
+        mock_client.getUserName.assert_not_called()
+        assert test_cache.get("Test Session ID") is None
+
+    def test_expired_entry_dropped(self):
+        test_cache = SessionMetadataCache(maxsize=5, ttl=60)
+        test_cache._cache["Test Session ID"] = SessionMetadata(
+            "Test User",
+            datetime.now(tzlocal()) - timedelta(minutes=1),
+        )
+
+        assert test_cache.get("Test Session ID") is None
+        assert "Test Session ID" not in test_cache._cache
+
+    def test_invalidate(self, mock_client):
+        test_cache = SessionMetadataCache(maxsize=5, ttl=60)
+        test_cache.get_or_fetch(mock_client)
+
+        test_cache.invalidate("Test Session ID")
+        test_cache.get_or_fetch(mock_client)
+
+        assert mock_client.getRemainingMinutes.call_count == 2
+
+    def test_invalidate_missing_session(self):
+        test_cache = SessionMetadataCache(maxsize=5, ttl=60)
+
+        test_cache.invalidate("Unknown Session ID")
+
+    def test_maxsize(self, mock_client):
+        test_cache = SessionMetadataCache(maxsize=2, ttl=60)
+
+        for session_number in range(3):
+            mock_client.sessionId = f"Session {session_number}"
+            test_cache.get_or_fetch(mock_client)
+
+        assert len(test_cache._cache) == 2
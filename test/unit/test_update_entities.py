@@ -0,0 +1,75 @@
+from unittest.mock import MagicMock, patch
+
+from icat.exception import ICATValidationError
+import pytest
+
+from datagateway_api.common.exceptions import MissingRecordError, PythonICATError
+from datagateway_api.datagateway_api.icat.helpers import update_entities, update_entity_by_id
+
+
+@pytest.fixture()
+def icat_entities():
+    entities = {id_: MagicMock(id=id_, title=f"Title {id_}") for id_ in [1, 2, 3]}
+
+    def get_entities_by_ids(client, entity_type, ids, return_json_formattable_data=True, **kwargs):
+        if return_json_formattable_data:
+            return {id_: {"id": id_, "title": entities[id_].title} for id_ in ids if id_ in entities}
+        return {id_: entities[id_] for id_ in ids if id_ in entities}
+
+    with patch(
+        "datagateway_api.datagateway_api.icat.helpers.get_entities_by_ids",
+        side_effect=get_entities_by_ids,
+    ) as get_entities_by_ids_mock:
+        yield entities, get_entities_by_ids_mock
+
+
+class TestUpdateEntities:
+    def test_entities_fetched_and_read_back_at_once(self, icat_entities):
+        entities, get_entities_by_ids = icat_entities
+
+        updated_data = update_entities(
+            "client",
+            "Investigation",
+            [{"id": 3, "title": "New title 3"}, {"id": 1, "title": "New title 1"}],
+        )
+
+        assert updated_data == [{"id": 3, "title": "New title 3"}, {"id": 1, "title": "New title 1"}]
+        assert get_entities_by_ids.call_count == 2
+        assert get_entities_by_ids.call_args_list[0].kwargs == {"return_related_entities": True}
+        entities[1].update.assert_called_once()
+        entities[3].update.assert_called_once()
+
+    def test_missing_entity(self, icat_entities):
+        entities, _ = icat_entities
+
+        with pytest.raises(MissingRecordError):
+            update_entities("client", "Investigation", [{"id": 1, "title": "New title"}, {"id": 4, "title": "Test"}])
+
+        entities[1].update.assert_not_called()
+
+    def test_failed_update_restores_backup(self, icat_entities):
+        entities, _ = icat_entities
+        backups = {id_: entity.copy.return_value for id_, entity in entities.items()}
+        entities[2].update.side_effect = ICATValidationError("Invalid update")
+
+        with pytest.raises(PythonICATError):
+            update_entities("client", "Investigation", [{"id": 1, "title": "A"}, {"id": 2, "title": "B"}])
+
+        backups[1].update.assert_called_once()
+        backups[2].update.assert_called_once()
+
+
+class TestUpdateEntityById:
+    def test_entity_fetched_updated_and_read_back(self):
+        icat_entity = MagicMock(id=1, title="Title")
+
+        with patch(
+            "datagateway_api.datagateway_api.icat.helpers.get_entity_by_id",
+            side_effect=[icat_entity, {"id": 1, "title": "New title"}],
+        ) as get_entity_by_id:
+            updated_data = update_entity_by_id("client", "Investigation", 1, {"title": "New title"})
+
+        assert updated_data == {"id": 1, "title": "New title"}
+        assert get_entity_by_id.call_args_list[0].kwargs == {"return_related_entities": True}
+        assert get_entity_by_id.call_args_list[1].args == ("client", "Investigation", 1, True)
+        icat_entity.update.assert_called_once()